@@ -13,6 +13,7 @@ conscious design decision, leaving the door open for keyword arguments
 to modify the meaning of the API call itself.
 """
 
+import bisect
 import collections
 import collections.abc
 import concurrent.futures
@@ -41,9 +42,11 @@ from . import events
 from . import exceptions
 from . import futures
 from . import protocols
+from . import resolvercache
 from . import sslproto
 from . import staggered
 from . import tasks
+from . import timerwheel
 from . import transports
 from . import trsock
 from .log import logger
@@ -70,6 +73,11 @@ MAXIMUM_SELECT_TIMEOUT = 24 * 3600
 # *reuse_address* parameter
 _unset = object()
 
+# Upper bounds, in seconds, of the buckets of the callback duration
+# histograms reported by loop.get_stats().  Histograms have one more
+# bucket counting the callbacks slower than the last bound.
+_CALLBACK_DURATION_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
 
 def _format_handle(handle):
     cb = handle._callback
@@ -80,6 +88,20 @@ def _format_handle(handle):
         return str(handle)
 
 
+def _callback_qualname(callback):
+    # Name under which a callback is reported by loop.get_stats().
+    owner = getattr(callback, '__self__', None)
+    if isinstance(owner, tasks.Task):
+        # Report the steps of a task under the name of its coroutine.
+        callback = owner.get_coro()
+    while isinstance(callback, functools.partial):
+        callback = callback.func
+    name = getattr(callback, '__qualname__', None)
+    if not isinstance(name, str):
+        name = type(callback).__qualname__
+    return name
+
+
 def _format_pipe(fd):
     if fd == subprocess.PIPE:
         return '<pipe>'
@@ -381,6 +403,34 @@ class Server(events.AbstractServer):
         await waiter
 
 
+class _LoopStats:
+    """Counters collected by the event loop when stats are enabled."""
+
+    __slots__ = ('iterations', 'select_time', 'callback_time', 'callbacks',
+                 'ready_queue_depth', 'ready_queue_max_depth', 'histograms')
+
+    def __init__(self):
+        self.iterations = 0
+        self.select_time = 0.0
+        self.callback_time = 0.0
+        self.callbacks = 0
+        self.ready_queue_depth = 0
+        self.ready_queue_max_depth = 0
+        # Maps callback names to lists of bucket counts.
+        self.histograms = {}
+
+    def add_callback(self, callback, duration):
+        self.callbacks += 1
+        self.callback_time += duration
+        name = _callback_qualname(callback)
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = [0] * (len(_CALLBACK_DURATION_BUCKETS) + 1)
+            self.histograms[name] = histogram
+        index = bisect.bisect_left(_CALLBACK_DURATION_BUCKETS, duration)
+        histogram[index] += 1
+
+
 class BaseEventLoop(events.AbstractEventLoop):
 
     def __init__(self):
@@ -389,6 +439,9 @@ class BaseEventLoop(events.AbstractEventLoop):
         self._stopping = False
         self._ready = collections.deque()
         self._scheduled = []
+        self._timer_wheel = None
+        self._stats = None
+        self._resolver_cache = None
         self._default_executor = None
         self._internal_fds = 0
         # Identifier of the thread running the event loop, or None if the
@@ -666,6 +719,8 @@ class BaseEventLoop(events.AbstractEventLoop):
         self._closed = True
         self._ready.clear()
         self._scheduled.clear()
+        if self._timer_wheel is not None:
+            self._timer_wheel.clear()
         self._executor_shutdown_called = True
         executor = self._default_executor
         if executor is not None:
@@ -729,10 +784,87 @@ class BaseEventLoop(events.AbstractEventLoop):
         timer = events.TimerHandle(when, callback, args, self, context)
         if timer._source_traceback:
             del timer._source_traceback[-1]
-        heapq.heappush(self._scheduled, timer)
+        if self._timer_wheel is not None:
+            self._timer_wheel.add(timer)
+        else:
+            heapq.heappush(self._scheduled, timer)
         timer._scheduled = True
         return timer
 
+    def set_timer_wheel(self, resolution):
+        """Schedule timed callbacks with a hierarchical timing wheel.
+
+        By default, call_later() and call_at() callbacks are kept in a
+        heap.  With a timing wheel, scheduling and cancelling a callback
+        takes constant time, which helps applications with a very large
+        number of timers that are frequently cancelled, such as idle
+        timeouts.  The price is precision: a callback is called up to
+        *resolution* seconds after its scheduled time.
+
+        If *resolution* is None, go back to the heap.  Callbacks that
+        are already scheduled are moved to the new scheduler.
+        """
+        self._check_closed()
+        if resolution is not None:
+            wheel = timerwheel.TimerWheel(resolution, self.time())
+        else:
+            wheel = None
+
+        if self._timer_wheel is not None:
+            handles = self._timer_wheel.handles()
+        else:
+            handles = [handle for handle in self._scheduled
+                       if not handle._cancelled]
+            for handle in self._scheduled:
+                handle._scheduled = False
+        self._scheduled = []
+        self._timer_cancelled_count = 0
+        self._timer_wheel = wheel
+
+        if wheel is not None:
+            for handle in handles:
+                wheel.add(handle)
+                handle._scheduled = True
+        else:
+            for handle in handles:
+                handle._scheduled = True
+            heapq.heapify(handles)
+            self._scheduled = handles
+
+    def set_resolver_cache(self, ttl, *, negative_ttl=0, max_entries=1024):
+        """Cache the name resolutions of the connection methods.
+
+        By default, create_connection(), create_datagram_endpoint() and
+        sock_connect() call getaddrinfo() in the default executor every
+        time they are given a host name.  With a cache, a successful
+        resolution is reused for *ttl* seconds and a failed one for
+        *negative_ttl* seconds, and concurrent resolutions of the same
+        name share a single call.  At most *max_entries* results are
+        kept.
+
+        If *ttl* is None, disable the cache.  The current cache is
+        dropped in any case.
+        """
+        if ttl is None:
+            self._resolver_cache = None
+        else:
+            self._resolver_cache = resolvercache.ResolverCache(
+                ttl, negative_ttl, max_entries)
+
+    def get_resolver_cache_stats(self):
+        """Return a dict of statistics of the resolver cache, or None if
+        the cache is disabled."""
+        if self._resolver_cache is None:
+            return None
+        return self._resolver_cache.stats()
+
+    def get_timer_wheel(self):
+        """Return the resolution of the timing wheel, or None if timed
+        callbacks are kept in a heap."""
+        if self._timer_wheel is None:
+            return None
+        return self._timer_wheel.resolution
+
     def call_soon(self, callback, *args, context=None):
         """Arrange for a callback to be called as soon as possible.
 
@@ -1392,6 +1524,9 @@ class BaseEventLoop(events.AbstractEventLoop):
         if info is not None:
             # "host" is already a resolved IP.
             return [info]
+        elif self._resolver_cache is not None:
+            return await self._resolver_cache.resolve(
+                loop, host, port, family, type, proto, flags)
         else:
             return await loop.getaddrinfo(host, port, family=family, type=type,
                                           proto=proto, flags=flags)
@@ -1810,7 +1945,11 @@ class BaseEventLoop(events.AbstractEventLoop):
     def _timer_handle_cancelled(self, handle):
         """Notification that a TimerHandle has been cancelled."""
         if handle._scheduled:
-            self._timer_cancelled_count += 1
+            if self._timer_wheel is not None:
+                self._timer_wheel.remove(handle)
+                handle._scheduled = False
+            else:
+                self._timer_cancelled_count += 1
 
     def _run_once(self):
         """Run one full iteration of the event loop.
@@ -1820,6 +1959,9 @@ class BaseEventLoop(events.AbstractEventLoop):
         'call_later' callbacks.
         """
 
+        # When the timing wheel is used, _scheduled stays empty: cancelled
+        # timers are removed from the wheel right away.
+        timer_wheel = self._timer_wheel
         sched_count = len(self._scheduled)
         if (sched_count > _MIN_SCHEDULED_TIMER_HANDLES and
             self._timer_cancelled_count / sched_count >
@@ -1846,16 +1988,29 @@ class BaseEventLoop(events.AbstractEventLoop):
         timeout = None
         if self._ready or self._stopping:
             timeout = 0
+        elif timer_wheel is not None:
+            when = timer_wheel.next_expiry()
+            if when is not None:
+                timeout = min(max(0, when - self.time()),
+                              MAXIMUM_SELECT_TIMEOUT)
         elif self._scheduled:
             # Compute the desired timeout.
             when = self._scheduled[0]._when
             timeout = min(max(0, when - self.time()), MAXIMUM_SELECT_TIMEOUT)
 
-        event_list = self._selector.select(timeout)
+        stats = self._stats
+        if stats is not None:
+            t0 = time.perf_counter()
+            event_list = self._selector.select(timeout)
+            stats.select_time += time.perf_counter() - t0
+        else:
+            event_list = self._selector.select(timeout)
         self._process_events(event_list)
 
         # Handle 'later' callbacks that are ready.
         end_time = self.time() + self._clock_resolution
+        if timer_wheel is not None:
+            timer_wheel.expire(end_time, self._ready)
         while self._scheduled:
             handle = self._scheduled[0]
             if handle._when >= end_time:
@@ -1871,6 +2026,13 @@ class BaseEventLoop(events.AbstractEventLoop):
         # they will be run the next time (after another I/O poll).
         # Use an idiom that is thread-safe without using locks.
         ntodo = len(self._ready)
+        if stats is not None:
+            stats.iterations += 1
+            stats.ready_queue_depth = ntodo
+            if ntodo > stats.ready_queue_max_depth:
+                stats.ready_queue_max_depth = ntodo
+            self._run_ready_with_stats(ntodo, stats)
+            return
         for i in range(ntodo):
             handle = self._ready.popleft()
             if handle._cancelled:
@@ -1890,6 +2052,29 @@ class BaseEventLoop(events.AbstractEventLoop):
                 handle._run()
         handle = None  # Needed to break cycles when an exception occurs.
 
+    def _run_ready_with_stats(self, ntodo, stats):
+        # Same as the end of _run_once(), but every callback is timed.
+        perf_counter = time.perf_counter
+        for i in range(ntodo):
+            handle = self._ready.popleft()
+            if handle._cancelled:
+                continue
+            # Handle._run() may drop the callback if the handle is
+            # cancelled by the callback itself.
+            callback = handle._callback
+            try:
+                self._current_handle = handle
+                t0 = perf_counter()
+                handle._run()
+                dt = perf_counter() - t0
+            finally:
+                self._current_handle = None
+            stats.add_callback(callback, dt)
+            if self._debug and dt >= self.slow_callback_duration:
+                logger.warning('Executing %s took %.3f seconds',
+                               _format_handle(handle), dt)
+        handle = callback = None  # Needed to break cycles.
+
     def _set_coroutine_origin_tracking(self, enabled):
         if bool(enabled) == bool(self._coroutine_origin_tracking_enabled):
             return
@@ -1905,6 +2090,45 @@ class BaseEventLoop(events.AbstractEventLoop):
 
         self._coroutine_origin_tracking_enabled = enabled
 
+    def set_stats_enabled(self, enabled):
+        """Enable or disable the collection of event loop statistics.
+
+        Enabling statistics resets the counters returned by get_stats().
+        """
+        if enabled:
+            self._stats = _LoopStats()
+        else:
+            self._stats = None
+
+    def get_stats(self):
+        """Return a snapshot of the event loop statistics as a dict.
+
+        Return None if statistics are not enabled.  Counters are
+        cumulative since statistics were enabled.
+        """
+        stats = self._stats
+        if stats is None:
+            return None
+        if self._timer_wheel is not None:
+            timers = len(self._timer_wheel)
+        else:
+            timers = len(self._scheduled) - self._timer_cancelled_count
+        return {
+            'iterations': stats.iterations,
+            'select_time': stats.select_time,
+            'callbacks': stats.callbacks,
+            'callback_time': stats.callback_time,
+            'ready_queue_depth': stats.ready_queue_depth,
+            'ready_queue_max_depth': stats.ready_queue_max_depth,
+            'timers': timers,
+            'cancelled_timers': self._timer_cancelled_count,
+            'callback_duration_buckets': _CALLBACK_DURATION_BUCKETS,
+            'callback_durations': {
+                name: list(histogram)
+                for name, histogram in stats.histograms.items()
+            },
+        }
+
     def get_debug(self):
         return self._debug
 
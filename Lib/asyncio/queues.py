@@ -70,6 +70,56 @@ class Queue:
                 waiter.set_result(None)
                 break
 
+    def _wakeup_many(self, waiters, count):
+        # Wake up the next count waiters (if any) that aren't cancelled.
+        while count > 0 and waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
+    async def _wait_not_full(self):
+        # Wait until a free slot may be available.
+        putter = self._loop.create_future()
+        self._putters.append(putter)
+        try:
+            await putter
+        except:
+            putter.cancel()  # Just in case putter is not done yet.
+            try:
+                # Clean self._putters from canceled putters.
+                self._putters.remove(putter)
+            except ValueError:
+                # The putter could be removed from self._putters by a
+                # previous get_nowait call.
+                pass
+            if not self.full() and not putter.cancelled():
+                # We were woken up by get_nowait(), but can't take
+                # the call.  Wake up the next in line.
+                self._wakeup_next(self._putters)
+            raise
+
+    async def _wait_not_empty(self):
+        # Wait until an item may be available.
+        getter = self._loop.create_future()
+        self._getters.append(getter)
+        try:
+            await getter
+        except:
+            getter.cancel()  # Just in case getter is not done yet.
+            try:
+                # Clean self._getters from canceled getters.
+                self._getters.remove(getter)
+            except ValueError:
+                # The getter could be removed from self._getters by a
+                # previous put_nowait call.
+                pass
+            if not self.empty() and not getter.cancelled():
+                # We were woken up by put_nowait(), but can't take
+                # the call.  Wake up the next in line.
+                self._wakeup_next(self._getters)
+            raise
+
     def __repr__(self):
         return f'<{type(self).__name__} at {id(self):#x} {self._format()}>'
 
@@ -122,24 +172,7 @@ class Queue:
         slot is available before adding item.
         """
         while self.full():
-            putter = self._loop.create_future()
-            self._putters.append(putter)
-            try:
-                await putter
-            except:
-                putter.cancel()  # Just in case putter is not done yet.
-                try:
-                    # Clean self._putters from canceled putters.
-                    self._putters.remove(putter)
-                except ValueError:
-                    # The putter could be removed from self._putters by a
-                    # previous get_nowait call.
-                    pass
-                if not self.full() and not putter.cancelled():
-                    # We were woken up by get_nowait(), but can't take
-                    # the call.  Wake up the next in line.
-                    self._wakeup_next(self._putters)
-                raise
+            await self._wait_not_full()
         return self.put_nowait(item)
 
     def put_nowait(self, item):
@@ -160,24 +193,7 @@ class Queue:
         If queue is empty, wait until an item is available.
         """
         while self.empty():
-            getter = self._loop.create_future()
-            self._getters.append(getter)
-            try:
-                await getter
-            except:
-                getter.cancel()  # Just in case getter is not done yet.
-                try:
-                    # Clean self._getters from canceled getters.
-                    self._getters.remove(getter)
-                except ValueError:
-                    # The getter could be removed from self._getters by a
-                    # previous put_nowait call.
-                    pass
-                if not self.empty() and not getter.cancelled():
-                    # We were woken up by put_nowait(), but can't take
-                    # the call.  Wake up the next in line.
-                    self._wakeup_next(self._getters)
-                raise
+            await self._wait_not_empty()
         return self.get_nowait()
 
     def get_nowait(self):
@@ -191,6 +207,81 @@ class Queue:
         self._wakeup_next(self._putters)
         return item
 
+    async def put_many(self, items):
+        """Put all the items of an iterable into the queue.
+
+        Items are added in order, as many at a time as there are free
+        slots, waiting for free slots while the queue is full.  If the
+        call is cancelled, the items already added stay in the queue.
+        """
+        items = list(items)
+        start = 0
+        while start < len(items):
+            while self.full():
+                await self._wait_not_full()
+            start = self._put_batch(items, start)
+
+    def put_many_nowait(self, items):
+        """Put all the items of an iterable into the queue without blocking.
+
+        If there are not enough free slots for all the items, raise
+        QueueFull and do not add any item.
+        """
+        items = list(items)
+        if (items and self._maxsize > 0
+                and self.qsize() + len(items) - 1 >= self._maxsize):
+            raise QueueFull
+        self._put_batch(items, 0)
+
+    def _put_batch(self, items, start):
+        # Add items from items[start:] until the queue is full, wake up
+        # one getter per added item and return the index of the first
+        # item left out.
+        put = self._put
+        full = self.full
+        end = len(items)
+        index = start
+        while index < end and not full():
+            put(items[index])
+            index += 1
+        count = index - start
+        if count:
+            self._unfinished_tasks += count
+            self._finished.clear()
+            self._wakeup_many(self._getters, count)
+        return index
+
+    async def get_many(self, max_items=None):
+        """Remove and return a list of items from the queue.
+
+        If queue is empty, wait until an item is available, then return
+        the available items without waiting for more, up to max_items
+        items if max_items is not None.
+        """
+        if max_items is not None and max_items < 1:
+            raise ValueError('max_items must be at least 1')
+        while self.empty():
+            await self._wait_not_empty()
+        return self.get_many_nowait(max_items)
+
+    def get_many_nowait(self, max_items=None):
+        """Remove and return a list of the items immediately available.
+
+        Return up to max_items items if max_items is not None.  If no item
+        is available, raise QueueEmpty.
+        """
+        if max_items is not None and max_items < 1:
+            raise ValueError('max_items must be at least 1')
+        if self.empty():
+            raise QueueEmpty
+        count = self.qsize()
+        if max_items is not None and max_items < count:
+            count = max_items
+        get = self._get
+        items = [get() for _ in range(count)]
+        self._wakeup_many(self._putters, count)
+        return items
+
     def task_done(self):
         """Indicate that a formerly enqueued task is complete.
 
@@ -0,0 +1,110 @@
+"""Cache of name resolutions shared by the connection methods of a loop."""
+
+__all__ = ()
+
+import collections
+import functools
+
+from . import tasks
+
+
+class ResolverCache:
+    """Cache of getaddrinfo() results, bounded by time and size.
+
+    Successful resolutions are kept for *ttl* seconds.  Failed
+    resolutions (OSError, such as socket.gaierror) are kept for
+    *negative_ttl* seconds; they are not cached if *negative_ttl* is 0.
+    At most *max_entries* results are kept, the least recently used
+    results being dropped first.
+
+    Concurrent resolutions of the same address share a single call to
+    getaddrinfo().
+    """
+
+    def __init__(self, ttl, negative_ttl=0, max_entries=1024):
+        if ttl <= 0:
+            raise ValueError('ttl must be a positive number')
+        if negative_ttl < 0:
+            raise ValueError('negative_ttl must be a positive number or 0')
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        # Maps keys to (expiration time, infos, exception) tuples, in
+        # least recently used order.
+        self._entries = collections.OrderedDict()
+        # Maps keys to the futures of the resolutions in progress.
+        self._pending = {}
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            'ttl': self._ttl,
+            'negative_ttl': self._negative_ttl,
+            'max_entries': self._max_entries,
+            'entries': len(self._entries),
+            'hits': self._hits,
+            'negative_hits': self._negative_hits,
+            'misses': self._misses,
+            'coalesced': self._coalesced,
+            'evictions': self._evictions,
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    async def resolve(self, loop, host, port, family, type, proto, flags):
+        """Return the result of loop.getaddrinfo() for these arguments,
+        from the cache if possible."""
+        key = (host, port, family, type, proto, flags)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, infos, exc = entry
+            if loop.time() < expires:
+                self._entries.move_to_end(key)
+                if exc is not None:
+                    self._negative_hits += 1
+                    raise exc.with_traceback(None)
+                self._hits += 1
+                return list(infos)
+            del self._entries[key]
+
+        fut = self._pending.get(key)
+        if fut is not None:
+            self._coalesced += 1
+        else:
+            self._misses += 1
+            fut = tasks.ensure_future(
+                loop.getaddrinfo(host, port, family=family, type=type,
+                                 proto=proto, flags=flags),
+                loop=loop)
+            self._pending[key] = fut
+            fut.add_done_callback(functools.partial(self._store, key, loop))
+        # The resolution goes on and fills the cache if the caller is
+        # cancelled: other callers may be waiting for it.
+        return list(await tasks.shield(fut))
+
+    def _store(self, key, loop, fut):
+        del self._pending[key]
+        if fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is None:
+            entry = (loop.time() + self._ttl, fut.result(), None)
+        elif isinstance(exc, OSError) and self._negative_ttl:
+            entry = (loop.time() + self._negative_ttl, None, exc)
+        else:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
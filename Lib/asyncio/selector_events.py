@@ -9,6 +9,8 @@ __all__ = 'BaseSelectorEventLoop',
 import collections
 import errno
 import functools
+import itertools
+import os
 import selectors
 import socket
 import warnings
@@ -45,6 +47,33 @@ def _check_ssl_socket(sock):
         raise TypeError("Socket cannot be of type SSLSocket")
 
 
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
+if _HAS_SENDMSG:
+    try:
+        SC_IOV_MAX = os.sysconf('SC_IOV_MAX')
+    except (AttributeError, OSError, ValueError):
+        SC_IOV_MAX = -1
+    if SC_IOV_MAX <= 0:
+        # Fall back to send() if the platform doesn't report the
+        # maximum number of buffers accepted by sendmsg().
+        _HAS_SENDMSG = False
+
+
+def _detach_data(data):
+    """Return data in a form that can be kept in a write buffer.
+
+    bytes objects (and plain memoryviews of them) are immutable and are
+    kept by reference.  Other buffers may be modified by the caller once
+    write() returns, so their content is copied.
+    """
+    if isinstance(data, bytes):
+        return data
+    if (isinstance(data, memoryview) and isinstance(data.obj, bytes) and
+            data.ndim == 1 and data.itemsize == 1 and data.contiguous):
+        return data
+    return bytes(data)
+
+
 class BaseSelectorEventLoop(base_events.BaseEventLoop):
     """Selector event loop.
 
@@ -60,11 +89,37 @@ class BaseSelectorEventLoop(base_events.BaseEventLoop):
         self._selector = selector
         self._make_self_pipe()
         self._transports = weakref.WeakValueDictionary()
+        self._edge_triggered = False
+
+    def set_edge_triggered(self, enabled):
+        """Enable or disable the edge-triggered mode of socket transports.
+
+        In this mode, the socket of a new stream transport is registered
+        once for both reading and writing, in edge-triggered mode, and
+        keeps that registration until it is closed.  Flow control and
+        write buffering then don't make any system call to modify it.
+
+        The mode requires a selectors.EpollSelector.  It applies to the
+        transports created after the call.
+        """
+        if enabled and not isinstance(self._selector,
+                                      getattr(selectors, 'EpollSelector', ())):
+            raise RuntimeError(
+                'edge-triggered mode requires selectors.EpollSelector, '
+                f'not {type(self._selector).__name__}')
+        self._edge_triggered = bool(enabled)
+
+    def get_edge_triggered(self):
+        """Return True if socket transports are edge-triggered."""
+        return self._edge_triggered
 
     def _make_socket_transport(self, sock, protocol, waiter=None, *,
                                extra=None, server=None):
-        return _SelectorSocketTransport(self, sock, protocol, waiter,
-                                        extra, server)
+        if self._edge_triggered:
+            transport_class = _SelectorEdgeTriggeredSocketTransport
+        else:
+            transport_class = _SelectorSocketTransport
+        return transport_class(self, sock, protocol, waiter, extra, server)
 
     def _make_ssl_transport(
             self, rawsock, protocol, sslcontext, waiter=None,
@@ -75,8 +130,8 @@ class BaseSelectorEventLoop(base_events.BaseEventLoop):
                 self, protocol, sslcontext, waiter,
                 server_side, server_hostname,
                 ssl_handshake_timeout=ssl_handshake_timeout)
-        _SelectorSocketTransport(self, rawsock, ssl_protocol,
-                                 extra=extra, server=server)
+        self._make_socket_transport(rawsock, ssl_protocol,
+                                    extra=extra, server=server)
         return ssl_protocol._app_transport
 
     def _make_datagram_transport(self, sock, protocol,
@@ -326,6 +381,32 @@ class BaseSelectorEventLoop(base_events.BaseEventLoop):
             else:
                 return False
 
+    def _add_edge_triggered(self, fd, reader, writer):
+        # Register fd in edge-triggered mode for writing, and for reading
+        # if reader is not None, replacing its current registration.
+        self._check_closed()
+        mask = selectors.EVENT_WRITE
+        if reader is not None:
+            reader = events.Handle(reader, (), self, None)
+            mask |= selectors.EVENT_READ
+        writer = events.Handle(writer, (), self, None)
+        self._unregister_fd(fd)
+        self._selector.register(fd, mask, (reader, writer),
+                                edge_triggered=True)
+
+    def _unregister_fd(self, fd):
+        # Remove both the reader and the writer callbacks of fd with a
+        # single call to the selector.
+        if self.is_closed():
+            return
+        try:
+            key = self._selector.unregister(fd)
+        except KeyError:
+            return
+        for handle in key.data:
+            if handle is not None:
+                handle.cancel()
+
     def add_reader(self, fd, callback, *args):
         """Add a reader callback."""
         self._ensure_fd_no_transport(fd)
@@ -749,6 +830,10 @@ class _SelectorSocketTransport(_SelectorTransport):
     _start_tls_compatible = True
     _sendfile_compatible = constants._SendfileMode.TRY_NATIVE
 
+    # The write buffer is a deque of buffers which are sent with a single
+    # sendmsg() call, so that data doesn't have to be joined first.
+    _buffer_factory = collections.deque
+
     def __init__(self, loop, sock, protocol, waiter=None,
                  extra=None, server=None):
 
@@ -757,6 +842,12 @@ class _SelectorSocketTransport(_SelectorTransport):
         self._eof = False
         self._paused = False
         self._empty_waiter = None
+        # Number of bytes in the write buffer.
+        self._buffer_size = 0
+        if _HAS_SENDMSG:
+            self._write_ready = self._write_sendmsg
+        else:
+            self._write_ready = self._write_send
 
         # Disable the Nagle algorithm -- small writes will be
         # sent without waiting for the TCP ACK.  This generally
@@ -838,6 +929,9 @@ class _SelectorSocketTransport(_SelectorTransport):
         except BaseException as exc:
             self._fatal_error(
                 exc, 'Fatal error: protocol.buffer_updated() call failed.')
+            return
+        # Return True if the buffer was filled: more data may be ready.
+        return nbytes == len(buf)
 
     def _read_ready__data_received(self):
         if self._conn_lost:
@@ -863,6 +957,9 @@ class _SelectorSocketTransport(_SelectorTransport):
         except BaseException as exc:
             self._fatal_error(
                 exc, 'Fatal error: protocol.data_received() call failed.')
+            return
+        # Return True if the buffer was filled: more data may be ready.
+        return len(data) == self.max_size
 
     def _read_ready__on_eof(self):
         if self._loop.get_debug():
@@ -914,45 +1011,150 @@ class _SelectorSocketTransport(_SelectorTransport):
                 self._fatal_error(exc, 'Fatal write error on socket transport')
                 return
             else:
-                data = data[n:]
+                data = memoryview(data).cast('B')[n:]
                 if not data:
                     return
             # Not all was written; register write handler.
-            self._loop._add_writer(self._sock_fd, self._write_ready)
+            self._start_write_polling()
 
         # Add it to the buffer.
-        self._buffer.extend(data)
+        data = _detach_data(data)
+        self._buffer.append(data)
+        self._buffer_size += len(data)
         self._maybe_pause_protocol()
 
-    def _write_ready(self):
+    def writelines(self, list_of_data):
+        if not _HAS_SENDMSG:
+            super().writelines(list_of_data)
+            return
+        if self._eof:
+            raise RuntimeError('Cannot call writelines() after write_eof()')
+        if self._empty_waiter is not None:
+            raise RuntimeError('unable to writelines; sendfile is in progress')
+
+        data_list = []
+        for data in list_of_data:
+            if not isinstance(data, (bytes, bytearray, memoryview)):
+                raise TypeError(f'data argument must be a bytes-like object, '
+                                f'not {type(data).__name__!r}')
+            if data:
+                data_list.append(memoryview(data).cast('B'))
+        if not data_list:
+            return
+
+        if self._conn_lost:
+            if self._conn_lost >= constants.LOG_THRESHOLD_FOR_CONNLOST_WRITES:
+                logger.warning('socket.send() raised exception.')
+            self._conn_lost += 1
+            return
+
+        size = sum(map(len, data_list))
+        if self._buffer:
+            self._buffer.extend(map(_detach_data, data_list))
+            self._buffer_size += size
+            self._maybe_pause_protocol()
+            return
+
+        # Optimization: try to send all buffers now with a single call,
+        # without joining them first.
+        self._buffer.extend(data_list)
+        self._buffer_size += size
+        self._write_ready()
+        if self._buffer:
+            # Not all was written: keep only what the caller can't modify
+            # and register write handler.
+            buffer = self._buffer
+            self._buffer = self._buffer_factory(map(_detach_data, buffer))
+            self._start_write_polling()
+            self._maybe_pause_protocol()
+
+    def _write_sendmsg(self):
+        # Return True if data was sent.
         assert self._buffer, 'Data should not be empty'
 
         if self._conn_lost:
             return
         try:
-            n = self._sock.send(self._buffer)
+            n = self._sock.sendmsg(itertools.islice(self._buffer, SC_IOV_MAX))
         except (BlockingIOError, InterruptedError):
             pass
         except (SystemExit, KeyboardInterrupt):
             raise
         except BaseException as exc:
-            self._loop._remove_writer(self._sock_fd)
-            self._buffer.clear()
-            self._fatal_error(exc, 'Fatal write error on socket transport')
-            if self._empty_waiter is not None:
-                self._empty_waiter.set_exception(exc)
+            self._write_error(exc)
         else:
-            if n:
-                del self._buffer[:n]
-            self._maybe_resume_protocol()  # May append to buffer.
-            if not self._buffer:
-                self._loop._remove_writer(self._sock_fd)
-                if self._empty_waiter is not None:
-                    self._empty_waiter.set_result(None)
-                if self._closing:
-                    self._call_connection_lost(None)
-                elif self._eof:
-                    self._sock.shutdown(socket.SHUT_WR)
+            self._adjust_leftover_buffer(n)
+            self._write_done()
+            return True
+
+    def _write_send(self):
+        # Return True if data was sent.
+        assert self._buffer, 'Data should not be empty'
+
+        if self._conn_lost:
+            return
+        buffer = self._buffer
+        if len(buffer) > 1:
+            # send() takes a single buffer: join pending data so that
+            # it is sent with as few calls as possible.
+            data = b''.join(buffer)
+            buffer.clear()
+            buffer.append(data)
+        try:
+            n = self._sock.send(buffer[0])
+        except (BlockingIOError, InterruptedError):
+            pass
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._write_error(exc)
+        else:
+            self._adjust_leftover_buffer(n)
+            self._write_done()
+            return True
+
+    def _start_write_polling(self):
+        self._loop._add_writer(self._sock_fd, self._write_ready)
+
+    def _stop_write_polling(self):
+        self._loop._remove_writer(self._sock_fd)
+
+    def _adjust_leftover_buffer(self, nbytes):
+        self._buffer_size -= nbytes
+        buffer = self._buffer
+        while nbytes:
+            data = buffer.popleft()
+            size = len(data)
+            if size > nbytes:
+                buffer.appendleft(memoryview(data)[nbytes:])
+                break
+            nbytes -= size
+
+    def _write_error(self, exc):
+        self._loop._remove_writer(self._sock_fd)
+        self._buffer.clear()
+        self._buffer_size = 0
+        self._fatal_error(exc, 'Fatal write error on socket transport')
+        if self._empty_waiter is not None:
+            self._empty_waiter.set_exception(exc)
+
+    def _write_done(self):
+        self._maybe_resume_protocol()  # May append to buffer.
+        if not self._buffer:
+            self._stop_write_polling()
+            if self._empty_waiter is not None:
+                self._empty_waiter.set_result(None)
+            if self._closing:
+                self._call_connection_lost(None)
+            elif self._eof:
+                self._sock.shutdown(socket.SHUT_WR)
+
+    def _force_close(self, exc):
+        super()._force_close(exc)
+        self._buffer_size = 0
+
+    def get_write_buffer_size(self):
+        return self._buffer_size
 
     def write_eof(self):
         if self._closing or self._eof:
@@ -982,6 +1184,104 @@ class _SelectorSocketTransport(_SelectorTransport):
         self._empty_waiter = None
 
 
+class _SelectorEdgeTriggeredSocketTransport(_SelectorSocketTransport):
+
+    # The socket is registered once for both reading and writing in
+    # edge-triggered mode (see BaseSelectorEventLoop.set_edge_triggered())
+    # and stays registered until the transport is closed: pausing reading
+    # and buffering data don't modify the registration.
+    #
+    # The selector only reports that the socket became ready, so the
+    # socket is read until recv() fails with EAGAIN or returns an end of
+    # file, and a read event received while reading is paused is kept for
+    # resume_reading().  Likewise, buffered data is sent until send() fails
+    # with EAGAIN or the buffer is empty: a single sendmsg() call doesn't
+    # send more than SC_IOV_MAX buffers.
+
+    def __init__(self, loop, sock, protocol, waiter=None,
+                 extra=None, server=None):
+        super().__init__(loop, sock, protocol, waiter, extra, server)
+        self._read_pending = False
+        self._write_buffered = self._write_ready
+        self._write_ready = self._write_ready_edge
+
+    def _add_reader(self, fd, callback, *args):
+        # Called once, when the transport starts reading.
+        if self._conn_lost or (self._closing and not self._buffer):
+            return
+        reader = None if self._closing else callback
+        self._loop._add_edge_triggered(fd, reader, self._write_ready)
+
+    def pause_reading(self):
+        if self._closing or self._paused:
+            return
+        self._paused = True
+        if self._loop.get_debug():
+            logger.debug("%r pauses reading", self)
+
+    def resume_reading(self):
+        if self._closing or not self._paused:
+            return
+        self._paused = False
+        if self._read_pending:
+            self._read_pending = False
+            self._loop.call_soon(self._read_ready)
+        if self._loop.get_debug():
+            logger.debug("%r resumes reading", self)
+
+    def _read_ready(self):
+        while not self._closing:
+            if self._paused:
+                self._read_pending = True
+                return
+            filled = self._read_ready_cb()
+            if filled is None:
+                # Nothing left to read.
+                return
+            if filled:
+                # Let other callbacks run before reading more.
+                self._loop.call_soon(self._read_ready)
+                return
+
+    def _write_ready_edge(self):
+        # The socket became writable: the buffer may be empty.
+        while self._buffer and self._write_buffered():
+            pass
+
+    def _start_write_polling(self):
+        pass
+
+    def _stop_write_polling(self):
+        pass
+
+    def close(self):
+        if not self._closing and not self._buffer:
+            self._loop._unregister_fd(self._sock_fd)
+        super().close()
+
+    def _force_close(self, exc):
+        if not self._conn_lost:
+            self._loop._unregister_fd(self._sock_fd)
+        super()._force_close(exc)
+
+    def _call_connection_lost(self, exc):
+        # The socket stays registered for writing until the buffer is
+        # flushed.
+        self._loop._unregister_fd(self._sock_fd)
+        super()._call_connection_lost(exc)
+
+    def _reset_empty_waiter(self):
+        super()._reset_empty_waiter()
+        if self._conn_lost:
+            return
+        # sock_sendfile() replaced the writer callback.
+        reading = _test_selector_event(self._loop._selector, self._sock_fd,
+                                       selectors.EVENT_READ)
+        self._loop._add_edge_triggered(
+            self._sock_fd, self._read_ready if reading else None,
+            self._write_ready)
+
+
 class _SelectorDatagramTransport(_SelectorTransport):
 
     _buffer_factory = collections.deque
@@ -33,6 +33,21 @@ _WRAPPED = "WRAPPED"
 _SHUTDOWN = "SHUTDOWN"
 
 
+class _AppProtocolError(Exception):
+    """Exception raised by the application protocol while _SSLPipe passes
+    it plaintext data.
+
+    The original exception is the *exc* attribute, and the record level
+    data produced before the failure, which must still be sent to the
+    remote SSL, is the *ssldata* attribute.
+    """
+
+    def __init__(self, exc):
+        super().__init__(exc)
+        self.exc = exc
+        self.ssldata = []
+
+
 class _SSLPipe(object):
     """An SSL "Pipe".
 
@@ -51,7 +66,7 @@ class _SSLPipe(object):
     do_handshake(). To shutdown SSL again, call unwrap().
     """
 
-    max_size = 256 * 1024   # Buffer size passed to read()
+    max_size = 64 * 1024   # Size of the buffer plaintext is read into
 
     def __init__(self, context, server_side, server_hostname=None):
         """
@@ -71,6 +86,8 @@ class _SSLPipe(object):
         self._incoming = ssl.MemoryBIO()
         self._outgoing = ssl.MemoryBIO()
         self._sslobj = None
+        # Buffer plaintext data is read into, allocated on first use.
+        self._appbuf = None
         self._need_ssldata = False
         self._handshake_cb = None
         self._shutdown_cb = None
@@ -154,12 +171,12 @@ class _SSLPipe(object):
         ssldata, appdata = self.feed_ssldata(b'')
         assert appdata == [] or appdata == [b'']
 
-    def feed_ssldata(self, data, only_handshake=False):
+    def feed_ssldata(self, data, only_handshake=False, app_protocol=None):
         """Feed SSL record level data into the pipe.
 
-        The data must be a bytes instance. It is OK to send an empty bytes
+        The data must be a bytes-like object. It is OK to send an empty bytes
         instance. This can be used to get ssldata for a handshake initiated by
-        this endpoint.
+        this endpoint.  The data is copied: the caller can reuse its buffer.
 
         Return a (ssldata, appdata) tuple. The ssldata element is a list of
         buffers containing SSL data that needs to be sent to the remote SSL.
@@ -168,11 +185,16 @@ class _SSLPipe(object):
         needs to be forwarded to the application. The appdata list may contain
         an empty buffer indicating an SSL "close_notify" alert. This alert must
         be acknowledged by calling shutdown().
+
+        If *app_protocol* is a BufferedProtocol, the plaintext data of the
+        wrapped connection is decrypted directly into the buffers returned
+        by its get_buffer() method instead of being returned in appdata.
+        Exceptions raised by the protocol are raised as _AppProtocolError.
         """
         if self._state == _UNWRAPPED:
             # If unwrapped, pass plaintext data straight through.
             if data:
-                appdata = [data]
+                appdata = [bytes(data)]
             else:
                 appdata = []
             return ([], appdata)
@@ -196,11 +218,10 @@ class _SSLPipe(object):
 
             if self._state == _WRAPPED:
                 # Main state: read data from SSL until close_notify
-                while True:
-                    chunk = self._sslobj.read(self.max_size)
-                    appdata.append(chunk)
-                    if not chunk:  # close_notify
-                        break
+                if app_protocol is not None:
+                    self._read_appdata_into(app_protocol, appdata)
+                else:
+                    self._read_appdata(appdata)
 
             elif self._state == _SHUTDOWN:
                 # Call shutdown() until it doesn't raise anymore.
@@ -222,6 +243,13 @@ class _SSLPipe(object):
                     self._handshake_cb(exc)
                 raise
             self._need_ssldata = (exc_errno == ssl.SSL_ERROR_WANT_READ)
+        except _AppProtocolError as exc:
+            # Records produced by this call, such as a renegotiation
+            # reply, still need to be sent.
+            if self._outgoing.pending:
+                ssldata.append(self._outgoing.read())
+            exc.ssldata = ssldata
+            raise
 
         # Check for record level data that needs to be sent back.
         # Happens for the initial handshake and renegotiations.
@@ -229,6 +257,57 @@ class _SSLPipe(object):
             ssldata.append(self._outgoing.read())
         return (ssldata, appdata)
 
+    def _read_appdata(self, appdata):
+        # Decrypt into a preallocated buffer rather than letting read()
+        # allocate a max_size bytes object per record.  The records read in
+        # a row are joined in a single chunk, up to the size of the buffer.
+        if self._appbuf is None:
+            self._appbuf = memoryview(bytearray(self.max_size))
+        view = self._appbuf
+        size = len(view)
+        pos = 0
+        try:
+            while True:
+                nbytes = self._sslobj.read(size - pos, view[pos:])
+                if not nbytes:  # close_notify
+                    if pos:
+                        appdata.append(bytes(view[:pos]))
+                        pos = 0
+                    appdata.append(b'')
+                    return
+                pos += nbytes
+                if pos == size:
+                    appdata.append(bytes(view))
+                    pos = 0
+        finally:
+            # read() raises SSLWantReadError when all the records have
+            # been decrypted.
+            if pos:
+                appdata.append(bytes(view[:pos]))
+
+    def _read_appdata_into(self, protocol, appdata):
+        # Decrypt straight into the buffers of a BufferedProtocol.
+        while True:
+            try:
+                buf = protocol.get_buffer(-1)
+                buf_len = len(buf)
+                if not buf_len:
+                    raise RuntimeError('get_buffer() returned an empty buffer')
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException as exc:
+                raise _AppProtocolError(exc) from None
+            nbytes = self._sslobj.read(buf_len, buf)
+            if not nbytes:  # close_notify
+                appdata.append(b'')
+                return
+            try:
+                protocol.buffer_updated(nbytes)
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException as exc:
+                raise _AppProtocolError(exc) from None
+
     def feed_appdata(self, data, offset=0):
         """Feed plaintext data into the pipe.
 
@@ -401,13 +480,15 @@ class _SSLProtocolTransport(transports._FlowControlMixin,
         self._closed = True
 
 
-class SSLProtocol(protocols.Protocol):
+class SSLProtocol(protocols.BufferedProtocol):
     """SSL protocol.
 
     Implementation of SSL on top of a socket using incoming and outgoing
     buffers which are ssl.MemoryBIO objects.
     """
 
+    max_size = 256 * 1024   # Size of the buffer record data is read into
+
     def __init__(self, loop, app_protocol, sslcontext, waiter,
                  server_side=False, server_hostname=None,
                  call_connection_made=True,
@@ -446,6 +527,9 @@ class SSLProtocol(protocols.Protocol):
         self._app_transport = _SSLProtocolTransport(self._loop, self)
         # _SSLPipe instance (None until the connection is made)
         self._sslpipe = None
+        # Buffer the transport reads record level data into, allocated
+        # on first use.
+        self._ssl_buffer = None
         self._session_established = False
         self._in_handshake = False
         self._in_shutdown = False
@@ -516,17 +600,42 @@ class SSLProtocol(protocols.Protocol):
         """
         self._app_protocol.resume_writing()
 
+    def get_buffer(self, n):
+        """Return the buffer the transport reads SSL data into.
+
+        The same buffer is reused for every read: feeding the data to the
+        SSL pipe copies it.
+        """
+        if self._ssl_buffer is None:
+            self._ssl_buffer = memoryview(bytearray(self.max_size))
+        return self._ssl_buffer
+
+    def buffer_updated(self, nbytes):
+        """Called when the transport has read SSL data into the buffer."""
+        self.data_received(self._ssl_buffer[:nbytes])
+
     def data_received(self, data):
         """Called when some SSL data is received.
 
-        The argument is a bytes object.
+        The argument is a bytes-like object.
         """
         if self._sslpipe is None:
             # transport closing, sslpipe is destroyed
             return
 
+        if self._app_protocol_is_buffer and self._session_established:
+            app_protocol = self._app_protocol
+        else:
+            app_protocol = None
         try:
-            ssldata, appdata = self._sslpipe.feed_ssldata(data)
+            ssldata, appdata = self._sslpipe.feed_ssldata(
+                data, app_protocol=app_protocol)
+        except _AppProtocolError as e:
+            for chunk in e.ssldata:
+                self._transport.write(chunk)
+            self._fatal_error(
+                e.exc, 'application protocol failed to receive SSL data')
+            return
         except (SystemExit, KeyboardInterrupt):
             raise
         except BaseException as e:
@@ -668,6 +777,9 @@ class SSLProtocol(protocols.Protocol):
         if self._transport is None or self._sslpipe is None:
             return
 
+        # Records produced for the whole backlog are passed to the
+        # transport in one call.
+        records = []
         try:
             for i in range(len(self._write_backlog)):
                 data, offset = self._write_backlog[0]
@@ -678,11 +790,14 @@ class SSLProtocol(protocols.Protocol):
                         self._on_handshake_complete)
                     offset = 1
                 else:
+                    # Flush the records before the shutdown: _finalize()
+                    # may close the transport.
+                    self._write_records(records)
+                    records = []
                     ssldata = self._sslpipe.shutdown(self._finalize)
                     offset = 1
 
-                for chunk in ssldata:
-                    self._transport.write(chunk)
+                records.extend(ssldata)
 
                 if offset < len(data):
                     self._write_backlog[0] = (data, offset)
@@ -697,6 +812,7 @@ class SSLProtocol(protocols.Protocol):
                 # delete it and reduce the outstanding buffer size.
                 del self._write_backlog[0]
                 self._write_buffer_size -= len(data)
+            self._write_records(records)
         except (SystemExit, KeyboardInterrupt):
             raise
         except BaseException as exc:
@@ -706,6 +822,14 @@ class SSLProtocol(protocols.Protocol):
             else:
                 self._fatal_error(exc, 'Fatal error on SSL transport')
 
+    def _write_records(self, records):
+        if self._transport is None or not records:
+            return
+        if len(records) == 1:
+            self._transport.write(records[0])
+        else:
+            self._transport.writelines(records)
+
     def _fatal_error(self, exc, message='Fatal error on transport'):
         if isinstance(exc, OSError):
             if self._loop.get_debug():
@@ -1,7 +1,9 @@
 __all__ = (
     'StreamReader', 'StreamWriter', 'StreamReaderProtocol',
+    'BufferedStreamReader', 'BufferedStreamReaderProtocol',
     'open_connection', 'start_server')
 
+import collections
 import socket
 import sys
 import warnings
@@ -307,6 +309,38 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
             closed.exception()
 
 
+class BufferedStreamReaderProtocol(StreamReaderProtocol,
+                                   protocols.BufferedProtocol):
+    """Helper class to adapt between BufferedProtocol and StreamReader.
+
+    Transports that support BufferedProtocol receive data directly into
+    the buffer of a BufferedStreamReader, avoiding the intermediate
+    bytes object created for every data_received() call.
+    """
+
+    def __init__(self, stream_reader, client_connected_cb=None, loop=None):
+        super().__init__(stream_reader, client_connected_cb, loop=loop)
+        if (stream_reader is not None and
+                not isinstance(stream_reader, BufferedStreamReader)):
+            raise TypeError(
+                f'BufferedStreamReader expected, got {stream_reader!r}')
+        # Receive buffer used after the stream reader was garbage collected.
+        self._discard_buffer = None
+
+    def get_buffer(self, sizehint):
+        reader = self._stream_reader
+        if reader is not None:
+            return reader._get_buffer(sizehint)
+        if self._discard_buffer is None:
+            self._discard_buffer = bytearray(_DEFAULT_LIMIT)
+        return self._discard_buffer
+
+    def buffer_updated(self, nbytes):
+        reader = self._stream_reader
+        if reader is not None:
+            reader._buffer_updated(nbytes)
+
+
 class StreamWriter:
     """Wraps a Transport.
 
@@ -476,7 +510,9 @@ class StreamReader:
 
         self._buffer.extend(data)
         self._wakeup_waiter()
+        self._maybe_pause_transport()
 
+    def _maybe_pause_transport(self):
         if (self._transport is not None and
                 not self._paused and
                 len(self._buffer) > 2 * self._limit):
@@ -490,6 +526,16 @@ class StreamReader:
             else:
                 self._paused = True
 
+    def _consume(self, n):
+        """Remove the first n bytes from the buffer and return them."""
+        if n >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:n])
+            del self._buffer[:n]
+        return data
+
     async def _wait_for_data(self, func_name):
         """Wait until feed_data() or feed_eof() is called.
 
@@ -542,7 +588,7 @@ class StreamReader:
             return e.partial
         except exceptions.LimitOverrunError as e:
             if self._buffer.startswith(sep, e.consumed):
-                del self._buffer[:e.consumed + seplen]
+                self._consume(e.consumed + seplen)
             else:
                 self._buffer.clear()
             self._maybe_resume_transport()
@@ -624,8 +670,7 @@ class StreamReader:
             # adds data which makes separator be found. That's why we check for
             # EOF *ater* inspecting the buffer.
             if self._eof:
-                chunk = bytes(self._buffer)
-                self._buffer.clear()
+                chunk = self._consume(len(self._buffer))
                 raise exceptions.IncompleteReadError(chunk, None)
 
             # _wait_for_data() will resume reading if stream was paused.
@@ -635,10 +680,9 @@ class StreamReader:
             raise exceptions.LimitOverrunError(
                 'Separator is found, but chunk is longer than limit', isep)
 
-        chunk = self._buffer[:isep + seplen]
-        del self._buffer[:isep + seplen]
+        chunk = self._consume(isep + seplen)
         self._maybe_resume_transport()
-        return bytes(chunk)
+        return chunk
 
     async def read(self, n=-1):
         """Read up to `n` bytes from the stream.
@@ -684,8 +728,7 @@ class StreamReader:
             await self._wait_for_data('read')
 
         # This will work right even if buffer is less than n bytes
-        data = bytes(self._buffer[:n])
-        del self._buffer[:n]
+        data = self._consume(n)
 
         self._maybe_resume_transport()
         return data
@@ -716,18 +759,12 @@ class StreamReader:
 
         while len(self._buffer) < n:
             if self._eof:
-                incomplete = bytes(self._buffer)
-                self._buffer.clear()
+                incomplete = self._consume(len(self._buffer))
                 raise exceptions.IncompleteReadError(incomplete, n)
 
             await self._wait_for_data('readexactly')
 
-        if len(self._buffer) == n:
-            data = bytes(self._buffer)
-            self._buffer.clear()
-        else:
-            data = bytes(self._buffer[:n])
-            del self._buffer[:n]
+        data = self._consume(n)
         self._maybe_resume_transport()
         return data
 
@@ -739,3 +776,165 @@ class StreamReader:
         if val == b'':
             raise StopAsyncIteration
         return val
+
+
+class _ChunkBuffer:
+    """Receive buffer made of a sequence of preallocated chunks.
+
+    Data is received directly into the free space of the last chunk and
+    consumed from the first one.  Consumed bytes are dropped by moving
+    an offset, so the remaining data is never moved to the front of the
+    buffer, and reads that fit in a single chunk are returned as
+    memoryview slices of that chunk without copying.
+
+    Chunks are never reused: a memoryview returned by take() stays
+    valid after more data is received.
+    """
+
+    def __init__(self, chunk_size):
+        self._chunk_size = chunk_size
+        # Deque of (chunk, start, end) tuples describing buffered data.
+        self._segments = collections.deque()
+        self._size = 0
+        self._tail = bytearray()
+        self._tail_end = 0
+
+    def __len__(self):
+        return self._size
+
+    def get_buffer(self, sizehint):
+        free = len(self._tail) - self._tail_end
+        if not free or sizehint > free:
+            self._tail = bytearray(max(sizehint, self._chunk_size))
+            self._tail_end = 0
+        return memoryview(self._tail)[self._tail_end:]
+
+    def buffer_updated(self, nbytes):
+        tail = self._tail
+        start = self._tail_end
+        end = start + nbytes
+        self._tail_end = end
+        self._size += nbytes
+        segments = self._segments
+        if segments:
+            chunk, seg_start, seg_end = segments[-1]
+            if chunk is tail and seg_end == start:
+                segments[-1] = (chunk, seg_start, end)
+                return
+        segments.append((tail, start, end))
+
+    def extend(self, data):
+        protocols._feed_data_to_buffered_proto(self, data)
+
+    def clear(self):
+        self._segments.clear()
+        self._size = 0
+
+    def _peek(self, offset, n):
+        """Return a copy of up to n bytes starting at offset."""
+        parts = []
+        pos = 0
+        for chunk, start, end in self._segments:
+            seg_len = end - start
+            if pos + seg_len > offset:
+                begin = start + max(offset - pos, 0)
+                stop = min(end, begin + n)
+                parts.append(chunk[begin:stop])
+                n -= stop - begin
+                if not n:
+                    break
+            pos += seg_len
+        return b''.join(parts)
+
+    def startswith(self, prefix, offset=0):
+        return self._peek(offset, len(prefix)) == prefix
+
+    def find(self, sub, offset=0):
+        sublen = len(sub)
+        pos = 0
+        for chunk, start, end in self._segments:
+            seg_len = end - start
+            if pos + seg_len > offset:
+                begin = start + max(offset - pos, 0)
+                index = chunk.find(sub, begin, end)
+                if index != -1:
+                    return pos + index - start
+                if sublen > 1:
+                    # Look for a separator spanning the segment boundary.
+                    window_start = max(offset, pos + seg_len - sublen + 1)
+                    window = self._peek(window_start,
+                                        pos + seg_len - window_start +
+                                        sublen - 1)
+                    index = window.find(sub)
+                    if index != -1:
+                        return window_start + index
+            pos += seg_len
+        return -1
+
+    def take(self, n):
+        """Remove the first n bytes and return them as a read-only memoryview.
+
+        The result is a slice of a receive chunk if the data is contiguous,
+        otherwise the data is joined into a new bytes object.
+        """
+        n = min(n, self._size)
+        segments = self._segments
+        chunk, start, end = segments[0]
+        if end - start >= n:
+            if end - start == n:
+                segments.popleft()
+            else:
+                segments[0] = (chunk, start + n, end)
+            self._size -= n
+            return memoryview(chunk).toreadonly()[start:start + n]
+
+        parts = []
+        remaining = n
+        while remaining:
+            chunk, start, end = segments[0]
+            stop = min(end, start + remaining)
+            parts.append(memoryview(chunk)[start:stop])
+            if stop == end:
+                segments.popleft()
+            else:
+                segments[0] = (chunk, stop, end)
+            remaining -= stop - start
+        self._size -= n
+        return memoryview(b''.join(parts))
+
+
+class BufferedStreamReader(StreamReader):
+    """StreamReader that returns received data without copying it.
+
+    Used together with BufferedStreamReaderProtocol, data is received
+    directly into preallocated chunks.  read(), readexactly(),
+    readuntil() and readline() return read-only memoryview objects
+    which are slices of those chunks whenever the requested data is
+    contiguous; consumed data is released without compacting the
+    buffer.
+
+    A returned memoryview keeps its whole chunk alive, so callers that
+    hold on to data for long should copy it with bytes().
+    """
+
+    def __init__(self, limit=_DEFAULT_LIMIT, loop=None):
+        super().__init__(limit=limit, loop=loop)
+        # Chunks are large enough to hold a full buffer before the
+        # transport is paused.
+        self._buffer = _ChunkBuffer(2 * self._limit)
+
+    def _get_buffer(self, sizehint):
+        assert not self._eof, 'get_buffer after feed_eof'
+        return self._buffer.get_buffer(sizehint)
+
+    def _buffer_updated(self, nbytes):
+        if not nbytes:
+            return
+        self._buffer.buffer_updated(nbytes)
+        self._wakeup_waiter()
+        self._maybe_pause_transport()
+
+    def _consume(self, n):
+        if not n or not self._buffer:
+            return memoryview(b'')
+        return self._buffer.take(n)
@@ -0,0 +1,122 @@
+"""High-level support for working with threads in asyncio"""
+
+__all__ = ('to_thread', 'ThreadLane')
+
+import concurrent.futures
+import contextvars
+import functools
+
+from . import events
+
+
+async def to_thread(func, /, *args, **kwargs):
+    """Asynchronously run function *func* in a separate thread.
+
+    Any *args and **kwargs supplied for this function are directly passed
+    to *func*. Also, the current :class:`contextvars.Context` is propagated,
+    allowing context variables from the main thread to be accessed in the
+    separate thread.
+
+    The function is run in the default executor of the event loop.
+
+    Return a coroutine that can be awaited to get the eventual result of
+    *func*.
+    """
+    loop = events.get_running_loop()
+    ctx = contextvars.copy_context()
+    func_call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(None, func_call)
+
+
+class ThreadLane:
+    """A named pool of threads running blocking functions for coroutines.
+
+    At most *max_workers* functions submitted to the lane run at the same
+    time; the other calls wait for a free thread.  Using one lane per kind
+    of blocking work (disk, DNS, ...) bounds the number of threads each
+    kind can occupy.
+
+    A lane can be shared by several event loops: the result of a call is
+    delivered to the event loop of the coroutine which awaits it.
+    """
+
+    def __init__(self, name, max_workers=None):
+        self._name = name
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix=f'asyncio-{name}')
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} {self._name!r} '
+                f'max_workers={self.max_workers}>')
+
+    @property
+    def name(self):
+        """Name of the lane, used to name its threads."""
+        return self._name
+
+    @property
+    def max_workers(self):
+        """Maximum number of functions run at the same time."""
+        return self._executor._max_workers
+
+    async def run(self, func, /, *args, **kwargs):
+        """Run function *func* in a thread of the lane.
+
+        Like to_thread(), *args* and *kwargs* are passed to *func*, which
+        runs in a copy of the current :class:`contextvars.Context`.
+
+        If the call is cancelled before *func* starts, *func* is not
+        called.  If it is cancelled while *func* runs, the result of
+        *func* is discarded.
+        """
+        loop = events.get_running_loop()
+        future = loop.create_future()
+        ctx = contextvars.copy_context()
+        self._executor.submit(_run_in_lane, loop, future,
+                              ctx, func, args, kwargs)
+        return await future
+
+    def shutdown(self, wait=True):
+        """Release the threads of the lane.
+
+        Calls already submitted are completed.  If *wait* is true, wait
+        until they are done.  Calls submitted after shutdown() raise
+        RuntimeError.
+        """
+        self._executor.shutdown(wait=wait)
+
+
+def _run_in_lane(loop, future, ctx, func, args, kwargs):
+    # Run in a thread of the lane.  The result is handed to the event
+    # loop with a single call_soon_threadsafe(), without the
+    # concurrent.futures.Future that run_in_executor() chains to the
+    # asyncio future.
+    if future.cancelled():
+        return
+    try:
+        result = ctx.run(func, *args, **kwargs)
+    except BaseException as exc:
+        result = None
+        exception = exc
+    else:
+        exception = None
+    try:
+        loop.call_soon_threadsafe(_set_lane_result, future, result, exception)
+    except RuntimeError:
+        # The event loop was closed while func was running: nobody is
+        # waiting for the result anymore.
+        pass
+
+
+def _set_lane_result(future, result, exception):
+    if future.cancelled():
+        return
+    if exception is None:
+        future.set_result(result)
+    elif isinstance(exception, StopIteration):
+        # StopIteration cannot be raised into a coroutine.
+        new_exc = RuntimeError('function raised StopIteration')
+        new_exc.__cause__ = exception
+        future.set_exception(new_exc)
+    else:
+        future.set_exception(exception)
@@ -0,0 +1,177 @@
+"""Hierarchical timing wheel used by the event loop to schedule timers."""
+
+__all__ = ()
+
+import math
+
+
+_SLOT_BITS = 8
+_SLOTS = 1 << _SLOT_BITS
+_SLOT_MASK = _SLOTS - 1
+_LEVELS = 4
+
+# Timers further away than this number of ticks are stored in the last
+# level and placed again each time their slot is cascaded.
+_MAX_DELTA = (1 << (_SLOT_BITS * _LEVELS)) - 1
+
+
+def _when(handle):
+    return handle._when
+
+
+class TimerWheel:
+    """Hierarchical timing wheel holding TimerHandle objects.
+
+    Time is divided in ticks of *resolution* seconds.  The first level
+    has one slot per tick for the next 256 ticks, and every following
+    level has slots 256 times as large.  When the wheel reaches the end
+    of a slot of a level, the timers of the next slot of the level above
+    are distributed again in the lower levels.
+
+    Adding and removing a timer takes constant time, whatever the number
+    of scheduled timers.  A timer expires on the first tick starting at
+    or after its deadline: callbacks can be delayed by up to one tick,
+    but are never called early.
+    """
+
+    def __init__(self, resolution, now):
+        if resolution <= 0:
+            raise ValueError('resolution must be a positive number')
+        self._resolution = resolution
+        self._levels = [[{} for _ in range(_SLOTS)] for _ in range(_LEVELS)]
+        # Number of handles in each level.
+        self._counts = [0] * _LEVELS
+        # Maps the id of every scheduled handle to its level and slot.
+        self._slot_of = {}
+        # Next tick to process: timers of the previous ticks have expired.
+        self._current = math.floor(now / resolution)
+
+    @property
+    def resolution(self):
+        return self._resolution
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def handles(self):
+        """Return a list of the scheduled handles."""
+        return [handle
+                for level in self._levels
+                for slot in level
+                for handle in slot.values()]
+
+    def clear(self):
+        for level in self._levels:
+            for slot in level:
+                slot.clear()
+        self._slot_of.clear()
+        self._counts = [0] * _LEVELS
+
+    def add(self, handle):
+        """Schedule a TimerHandle according to its when() time."""
+        current = self._current
+        ticks = handle._when / self._resolution
+        if ticks - current < _MAX_DELTA:
+            tick = math.ceil(ticks)
+            if tick < current:
+                tick = current
+        else:
+            tick = current + _MAX_DELTA
+        delta = tick - current
+        if delta < _SLOTS:
+            level = 0
+            index = tick & _SLOT_MASK
+        else:
+            level = (delta.bit_length() - 1) // _SLOT_BITS
+            index = (tick >> (_SLOT_BITS * level)) & _SLOT_MASK
+        slot = self._levels[level][index]
+        key = id(handle)
+        slot[key] = handle
+        self._slot_of[key] = (level, slot)
+        self._counts[level] += 1
+
+    def remove(self, handle):
+        """Unschedule a TimerHandle; do nothing if it is not scheduled."""
+        key = id(handle)
+        location = self._slot_of.pop(key, None)
+        if location is not None:
+            level, slot = location
+            del slot[key]
+            self._counts[level] -= 1
+
+    def _next_cascade(self, current):
+        """Return the first tick at or after *current* at which a
+        non-empty level is cascaded."""
+        counts = self._counts
+        level = 1
+        while level < _LEVELS - 1 and not counts[level]:
+            level += 1
+        shift = _SLOT_BITS * level
+        return ((current + (1 << shift) - 1) >> shift) << shift
+
+    def next_expiry(self):
+        """Return the time at which the wheel has to be advanced next.
+
+        Return None if no timer is scheduled.
+        """
+        if not self._slot_of:
+            return None
+        current = self._current
+        if not self._counts[0]:
+            return self._next_cascade(current) * self._resolution
+        # Timers cascaded at the end of the block can expire before the
+        # timers of the first level which belong to the next block.
+        end = current | _SLOT_MASK
+        level0 = self._levels[0]
+        for tick in range(current, end + 1):
+            if level0[tick & _SLOT_MASK]:
+                return tick * self._resolution
+        return (end + 1) * self._resolution
+
+    def expire(self, now, ready):
+        """Append the handles expired at time *now* to *ready*.
+
+        Handles are appended in the order of their deadlines and are
+        unscheduled.
+        """
+        now_tick = math.floor(now / self._resolution)
+        level0 = self._levels[0]
+        counts = self._counts
+        slot_of = self._slot_of
+        current = self._current
+        while current <= now_tick and slot_of:
+            index = current & _SLOT_MASK
+            if not counts[0] and index:
+                # Skip the ticks before the next cascade.
+                current = min(self._next_cascade(current), now_tick + 1)
+                self._current = current
+                continue
+            if not index:
+                self._cascade(current)
+            slot = level0[index]
+            if slot:
+                handles = sorted(slot.values(), key=_when)
+                slot.clear()
+                for handle in handles:
+                    del slot_of[id(handle)]
+                    handle._scheduled = False
+                counts[0] -= len(handles)
+                ready.extend(handles)
+            current += 1
+            self._current = current
+        if not slot_of and current <= now_tick:
+            # The wheel is empty: jump straight to the current time.
+            self._current = now_tick + 1
+
+    def _cascade(self, current):
+        for level in range(1, _LEVELS):
+            index = (current >> (_SLOT_BITS * level)) & _SLOT_MASK
+            slot = self._levels[level][index]
+            if slot:
+                handles = list(slot.values())
+                slot.clear()
+                self._counts[level] -= len(handles)
+                for handle in handles:
+                    self.add(handle)
+            if index:
+                break
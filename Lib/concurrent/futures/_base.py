@@ -4,6 +4,7 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import collections
+import itertools
 import logging
 import threading
 import time
@@ -561,7 +562,8 @@ class Executor(object):
         """
         raise NotImplementedError()
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None,
+            ordered=True):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -573,6 +575,12 @@ class Executor(object):
                 before being passed to a child process. This argument is only
                 used by ProcessPoolExecutor; it is ignored by
                 ThreadPoolExecutor.
+            buffersize: The maximum number of calls submitted and not yet
+                yielded by the iterator. The iterables are consumed as the
+                results are yielded. If None, then all the calls are
+                submitted up front.
+            ordered: If False, then the results are yielded as the calls
+                complete instead of in the order of the iterables.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -583,23 +591,79 @@ class Executor(object):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
+        if buffersize is not None:
+            if not isinstance(buffersize, int):
+                raise TypeError("buffersize must be an integer or None")
+            elif buffersize < 1:
+                raise ValueError("buffersize must be None or >= 1.")
+
         if timeout is not None:
             end_time = timeout + time.monotonic()
 
-        fs = [self.submit(fn, *args) for args in zip(*iterables)]
+        if ordered:
+            fs = collections.deque()
+            add = fs.append
+        else:
+            fs = set()
+            add = fs.add
+            # Futures in completion order.
+            completed = collections.deque()
+            completed_count = threading.Semaphore(0)
+
+            def on_done(future):
+                completed.append(future)
+                completed_count.release()
+
+        def submit(executor, args):
+            future = executor.submit(fn, *args)
+            add(future)
+            if not ordered:
+                future.add_done_callback(on_done)
+
+        args_iter = zip(*iterables)
+        # The iterator keeps the executor alive until the iterables are
+        # exhausted, so that the remaining calls can be submitted.
+        executor = self
+        if buffersize is None:
+            for args in args_iter:
+                submit(self, args)
+            executor = None
+        else:
+            for args in itertools.islice(args_iter, buffersize):
+                submit(self, args)
+
+        def pop_future():
+            nonlocal executor
+            if ordered:
+                future = fs.popleft()
+            else:
+                if not completed_count.acquire(
+                        timeout=None if timeout is None
+                        else max(end_time - time.monotonic(), 0)):
+                    raise TimeoutError()
+                future = completed.popleft()
+                fs.remove(future)
+            # Replace the call with the next one, if any (the iterables are
+            # exhausted if buffersize is None).
+            if executor is not None:
+                args = next(args_iter, None)
+                if args is None:
+                    executor = None
+                else:
+                    submit(executor, args)
+            return future
 
         # Yield must be hidden in closure so that the futures are submitted
         # before the first iterator value is required.
         def result_iterator():
             try:
-                # reverse to keep finishing order
-                fs.reverse()
                 while fs:
                     # Careful not to keep a reference to the popped future
+                    # or to its result
                     if timeout is None:
-                        yield fs.pop().result()
+                        yield pop_future().result()
                     else:
-                        yield fs.pop().result(end_time - time.monotonic())
+                        yield pop_future().result(end_time - time.monotonic())
             finally:
                 for future in fs:
                     future.cancel()
@@ -45,8 +45,11 @@ Process #1..n:
 
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
+import array
 import atexit
+import io
 import os
+import pickle
 from concurrent.futures import _base
 import queue
 import multiprocessing as mp
@@ -57,7 +60,12 @@ import weakref
 from functools import partial
 import itertools
 import sys
+import time
 import traceback
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
 
 
 _threads_wakeups = weakref.WeakKeyDictionary()
@@ -106,6 +114,14 @@ threading._register_atexit(_python_exit)
 # (Futures in the call queue cannot be cancelled).
 EXTRA_QUEUED_CALLS = 1
 
+# map(chunksize=None) adapts the size of the chunks so that each chunk takes
+# about ADAPTIVE_CHUNK_TIME seconds to process, within the limits of
+# MAX_ADAPTIVE_CHUNKSIZE.  Longer chunks reduce the share of time spent
+# sending the calls and the results, shorter chunks balance the work better
+# between the processes.
+ADAPTIVE_CHUNK_TIME = 0.05
+MAX_ADAPTIVE_CHUNKSIZE = 65536
+
 
 # On Windows, WaitForMultipleObjects is used to wait for processes to finish.
 # It can wait on, at most, 63 objects. There is an overhead of two objects:
@@ -142,10 +158,11 @@ class _WorkItem(object):
         self.kwargs = kwargs
 
 class _ResultItem(object):
-    def __init__(self, work_id, exception=None, result=None):
+    def __init__(self, work_id, exception=None, result=None, exit_pid=None):
         self.work_id = work_id
         self.exception = exception
         self.result = result
+        self.exit_pid = exit_pid
 
 class _CallItem(object):
     def __init__(self, work_id, fn, args, kwargs):
@@ -177,6 +194,143 @@ class _SafeQueue(Queue):
             super()._on_queue_feeder_error(e, obj)
 
 
+def _rebuild_array(typecode, buf):
+    a = array.array(typecode)
+    a.frombytes(buf)
+    return a
+
+
+class _OutOfBandBuffer(object):
+    """Marks a bytes or bytearray object to pickle as an out-of-band
+    buffer."""
+    def __init__(self, data):
+        self.data = data
+
+
+def _mark_buffers(obj, threshold, depth=2):
+    """Return obj with its bytes and bytearray objects of at least
+    threshold bytes marked as _OutOfBandBuffer, down to depth levels of
+    lists and tuples: the results of a chunk of map() are a list, and those
+    of a chunk of map(chunksize=None) an (elapsed, list) tuple.
+    """
+    if type(obj) in (bytes, bytearray):
+        if len(obj) >= threshold:
+            return _OutOfBandBuffer(obj)
+    elif type(obj) in (list, tuple) and depth:
+        return type(obj)([_mark_buffers(item, threshold, depth - 1)
+                          for item in obj])
+    return obj
+
+
+class _ResultPickler(pickle.Pickler):
+    """Pickler of results sending large buffers out-of-band.
+
+    Buffers of at least *threshold* bytes are collected in the *buffers*
+    list, as (PickleBuffer, copy) pairs: copy is true for the buffers of
+    objects which may keep a reference to the buffer when they are
+    unpickled.
+    """
+    def __init__(self, file, threshold, buffers):
+        super().__init__(file, protocol=5,
+                         buffer_callback=self._buffer_callback)
+        self._threshold = threshold
+        self._buffers = buffers
+        # Buffers of the objects which are reduced here, and copied into
+        # new objects when unpickled, by id.
+        self._copied_buffers = {}
+
+    def _copied_buffer(self, obj):
+        buf = pickle.PickleBuffer(obj)
+        self._copied_buffers[id(buf)] = buf
+        return buf
+
+    def reducer_override(self, obj):
+        # bytes, bytearray and array.array don't provide out-of-band
+        # buffers by themselves.
+        if type(obj) is _OutOfBandBuffer:
+            return type(obj.data), (self._copied_buffer(obj.data),)
+        if (type(obj) is array.array
+                and len(obj) * obj.itemsize >= self._threshold):
+            return _rebuild_array, (obj.typecode, self._copied_buffer(obj))
+        return NotImplemented
+
+    def _buffer_callback(self, buf):
+        if buf.raw().nbytes < self._threshold:
+            return True
+        self._buffers.append((buf, id(buf) not in self._copied_buffers))
+        return False
+
+
+class _SharedMemoryResult(object):
+    """A result pickled with its large buffers in shared memory.
+
+    Only the pickle data and the names of the shared memory blocks are
+    sent to the executor, which copies the buffers out of the blocks and
+    destroys them in load().
+    """
+    def __init__(self, obj, threshold):
+        # The pickler doesn't call reducer_override() for bytes and
+        # bytearray objects: mark them, alone or in the top-level lists and
+        # tuples (such as the results of a chunk of map()).
+        obj = _mark_buffers(obj, threshold)
+        buffers = []
+        f = io.BytesIO()
+        _ResultPickler(f, threshold, buffers).dump(obj)
+        self.data = f.getvalue()
+        # List of (name, size, copy) tuples.
+        self.blocks = []
+        try:
+            for buf, copy in buffers:
+                with buf.raw() as raw:
+                    shm = shared_memory.SharedMemory(create=True,
+                                                     size=raw.nbytes)
+                    try:
+                        shm.buf[:raw.nbytes] = raw
+                        self.blocks.append((shm.name, raw.nbytes, copy))
+                    except:
+                        shm.unlink()
+                        raise
+                    finally:
+                        shm.close()
+        except:
+            self.unlink()
+            raise
+
+    def unlink(self):
+        blocks, self.blocks = self.blocks, []
+        for name, _, _ in blocks:
+            try:
+                shm = shared_memory.SharedMemory(name)
+            except FileNotFoundError:
+                continue
+            shm.close()
+            shm.unlink()
+
+    def load(self):
+        shms = []
+        buffers = []
+        try:
+            for name, size, copy in self.blocks:
+                shm = shared_memory.SharedMemory(name)
+                shms.append(shm)
+                buf = shm.buf[:size]
+                if copy:
+                    # The object may keep a reference to its buffer.
+                    buf = bytearray(buf)
+                buffers.append(buf)
+            return pickle.loads(self.data, buffers=buffers)
+        finally:
+            for buf in buffers:
+                if isinstance(buf, memoryview):
+                    buf.release()
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+            # Destroy the blocks which could not be opened.
+            del self.blocks[:len(shms)]
+            self.unlink()
+
+
 def _get_chunks(*iterables, chunksize):
     """ Iterates over zip()ed iterables in chunks. """
     it = zip(*iterables)
@@ -199,17 +353,68 @@ def _process_chunk(fn, chunk):
     return [fn(*args) for args in chunk]
 
 
-def _sendback_result(result_queue, work_id, result=None, exception=None):
+def _process_timed_chunk(fn, chunk):
+    """ Processes a chunk of an iterable passed to map with chunksize=None.
+
+    Returns a (elapsed, results) tuple, where elapsed is the time taken by
+    the calls, in seconds.
+
+    This function is run in a separate process.
+
+    """
+    start = time.perf_counter()
+    results = [fn(*args) for args in chunk]
+    return time.perf_counter() - start, results
+
+
+class _AdaptiveChunks(object):
+    """ Iterates over zip()ed iterables in chunks of adaptive size.
+
+    The size of the chunks starts at 1 and is updated from the time taken by
+    the calls of the processed chunks, at most doubling at each update.
+    """
+    def __init__(self, *iterables):
+        self._it = zip(*iterables)
+        self.chunksize = 1
+        # Estimated time of a call, in seconds.
+        self._call_time = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = tuple(itertools.islice(self._it, self.chunksize))
+        if not chunk:
+            raise StopIteration
+        return chunk
+
+    def update(self, calls, elapsed):
+        call_time = elapsed / calls
+        if self._call_time is not None:
+            call_time = (self._call_time + call_time) / 2
+        self._call_time = call_time
+        chunksize = min(2 * self.chunksize, MAX_ADAPTIVE_CHUNKSIZE)
+        if call_time > 0:
+            chunksize = min(chunksize, int(ADAPTIVE_CHUNK_TIME / call_time))
+        self.chunksize = max(chunksize, 1)
+
+
+def _sendback_result(result_queue, work_id, result=None, exception=None,
+                     exit_pid=None, shared_memory_threshold=None):
     """Safely send back the given result or exception"""
     try:
+        if shared_memory_threshold is not None and exception is None:
+            result = _SharedMemoryResult(result, shared_memory_threshold)
         result_queue.put(_ResultItem(work_id, result=result,
-                                     exception=exception))
+                                     exception=exception, exit_pid=exit_pid))
     except BaseException as e:
         exc = _ExceptionWithTraceback(e, e.__traceback__)
-        result_queue.put(_ResultItem(work_id, exception=exc))
+        result_queue.put(_ResultItem(work_id, exception=exc,
+                                     exit_pid=exit_pid))
 
 
-def _process_worker(call_queue, result_queue, initializer, initargs):
+def _process_worker(call_queue, result_queue, initializer, initargs,
+                    max_tasks=None, shared_memory_threshold=None):
     """Evaluates calls from call_queue and places the results in result_queue.
 
     This worker is run in a separate process.
@@ -221,6 +426,11 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
             to by the worker.
         initializer: A callable initializer, or None
         initargs: A tuple of args for the initializer
+        max_tasks: The maximum number of calls evaluated before the worker
+            exits, or None for no limit.
+        shared_memory_threshold: The minimum size of the buffers of the
+            results sent through shared memory, or None to send the
+            results through result_queue only.
     """
     if initializer is not None:
         try:
@@ -230,25 +440,41 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
             # The parent will notice that the process stopped and
             # mark the pool broken
             return
+    num_tasks = 0
+    exit_pid = None
     while True:
         call_item = call_queue.get(block=True)
         if call_item is None:
             # Wake up queue management thread
             result_queue.put(os.getpid())
             return
+
+        if max_tasks is not None:
+            num_tasks += 1
+            if num_tasks >= max_tasks:
+                # The result tells the management thread to replace this
+                # worker.
+                exit_pid = os.getpid()
+
         try:
             r = call_item.fn(*call_item.args, **call_item.kwargs)
         except BaseException as e:
             exc = _ExceptionWithTraceback(e, e.__traceback__)
-            _sendback_result(result_queue, call_item.work_id, exception=exc)
+            _sendback_result(result_queue, call_item.work_id, exception=exc,
+                             exit_pid=exit_pid)
         else:
-            _sendback_result(result_queue, call_item.work_id, result=r)
+            _sendback_result(result_queue, call_item.work_id, result=r,
+                             exit_pid=exit_pid,
+                             shared_memory_threshold=shared_memory_threshold)
             del r
 
         # Liberate the resource as soon as possible, to avoid holding onto
         # open files or shared memory that is not needed anymore
         del call_item
 
+        if exit_pid is not None:
+            return
+
 
 class _ExecutorManagerThread(threading.Thread):
     """Manages the communication between this process and the worker processes.
@@ -299,6 +525,14 @@ class _ExecutorManagerThread(threading.Thread):
         #     {5: <_WorkItem...>, 6: <_WorkItem...>, ...}
         self.pending_work_items = executor._pending_work_items
 
+        # The parameters used to start worker processes, to replace the
+        # workers which exit after max_tasks_per_child calls.
+        self.mp_context = executor._mp_context
+        self.initializer = executor._initializer
+        self.initargs = executor._initargs
+        self.max_tasks_per_child = executor._max_tasks_per_child
+        self.shared_memory_threshold = executor._shared_memory_threshold
+
         super().__init__()
 
     def run(self):
@@ -321,6 +555,10 @@ class _ExecutorManagerThread(threading.Thread):
             if self.is_shutting_down():
                 self.flag_executor_shutting_down()
 
+                # Drop the work items of the futures cancelled since the last
+                # call: they will never get a result.
+                self.add_call_item_to_queue()
+
                 # Since no new work items can be added, it is safe to shutdown
                 # this thread if there are no pending work items.
                 if not self.pending_work_items:
@@ -392,6 +630,14 @@ class _ExecutorManagerThread(threading.Thread):
                 self.join_executor_internals()
                 return
         else:
+            if isinstance(result_item.result, _SharedMemoryResult):
+                # Load the result even if its future is gone, to destroy
+                # its shared memory blocks.
+                try:
+                    result_item.result = result_item.result.load()
+                except BaseException as e:
+                    result_item.exception = e
+                    result_item.result = None
             # Received a _ResultItem so mark the future as completed.
             work_item = self.pending_work_items.pop(result_item.work_id, None)
             # work_item can be None if another process terminated (see above)
@@ -400,6 +646,26 @@ class _ExecutorManagerThread(threading.Thread):
                     work_item.future.set_exception(result_item.exception)
                 else:
                     work_item.future.set_result(result_item.result)
+            if result_item.exit_pid is not None:
+                self.replace_exited_worker(result_item.exit_pid)
+
+    def replace_exited_worker(self, pid):
+        # The worker exited after max_tasks_per_child calls: start a new
+        # one, unless the executor is shutting down and has no work left.
+        p = self.processes.pop(pid)
+        p.join()
+        if self.is_shutting_down() and not self.pending_work_items:
+            return
+        p = self.mp_context.Process(
+            target=_process_worker,
+            args=(self.call_queue,
+                  self.result_queue,
+                  self.initializer,
+                  self.initargs,
+                  self.max_tasks_per_child,
+                  self.shared_memory_threshold))
+        p.start()
+        self.processes[p.pid] = p
 
     def is_shutting_down(self):
         # Check whether we should start shutting down the executor.
@@ -545,6 +811,19 @@ def _chain_from_iterable_of_lists(iterable):
             yield element.pop()
 
 
+def _chain_from_timed_chunks(iterable, chunks):
+    """
+    Like _chain_from_iterable_of_lists() for the (elapsed, results) tuples
+    of _process_timed_chunk(), updating the _AdaptiveChunks *chunks*.
+    """
+    for elapsed, element in iterable:
+        chunks.update(len(element), elapsed)
+        element.reverse()
+        while element:
+            yield element.pop()
+        del element
+
+
 class BrokenProcessPool(_base.BrokenExecutor):
     """
     Raised when a process in a ProcessPoolExecutor terminated abruptly
@@ -554,7 +833,8 @@ class BrokenProcessPool(_base.BrokenExecutor):
 
 class ProcessPoolExecutor(_base.Executor):
     def __init__(self, max_workers=None, mp_context=None,
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *, max_tasks_per_child=None,
+                 shared_memory_threshold=None):
         """Initializes a new ProcessPoolExecutor instance.
 
         Args:
@@ -565,6 +845,17 @@ class ProcessPoolExecutor(_base.Executor):
                 object should provide SimpleQueue, Queue and Process.
             initializer: A callable used to initialize worker processes.
             initargs: A tuple of arguments to pass to the initializer.
+            max_tasks_per_child: The maximum number of tasks a worker process
+                can complete before it will exit and be replaced with a fresh
+                worker process. The default of None means worker process will
+                live as long as the executor. Requires a non-'fork' mp_context
+                start method. When given, we default to using 'spawn' if no
+                mp_context is supplied.
+            shared_memory_threshold: If not None, the buffers of at least
+                this many bytes in the results (bytes, bytearray and
+                array.array objects, and PickleBuffer objects) are sent to
+                the executor through shared memory rather than pickled
+                through a pipe. POSIX only.
         """
         _check_system_limits()
 
@@ -584,7 +875,10 @@ class ProcessPoolExecutor(_base.Executor):
             self._max_workers = max_workers
 
         if mp_context is None:
-            mp_context = mp.get_context()
+            if max_tasks_per_child is not None:
+                mp_context = mp.get_context("spawn")
+            else:
+                mp_context = mp.get_context()
         self._mp_context = mp_context
 
         if initializer is not None and not callable(initializer):
@@ -592,6 +886,36 @@ class ProcessPoolExecutor(_base.Executor):
         self._initializer = initializer
         self._initargs = initargs
 
+        if max_tasks_per_child is not None:
+            if not isinstance(max_tasks_per_child, int):
+                raise TypeError("max_tasks_per_child must be an integer")
+            elif max_tasks_per_child <= 0:
+                raise ValueError("max_tasks_per_child must be >= 1")
+            if self._mp_context.get_start_method(allow_none=False) == "fork":
+                # Workers are replaced from the management thread, and
+                # forking a multithreaded process is unsafe.
+                raise ValueError("max_tasks_per_child is incompatible with"
+                                 " the 'fork' multiprocessing start method;"
+                                 " supply a different mp_context.")
+        self._max_tasks_per_child = max_tasks_per_child
+
+        if shared_memory_threshold is not None:
+            if not isinstance(shared_memory_threshold, int):
+                raise TypeError("shared_memory_threshold must be an integer")
+            elif shared_memory_threshold <= 0:
+                raise ValueError("shared_memory_threshold must be >= 1")
+            if shared_memory is None or not shared_memory._USE_POSIX:
+                # A named shared memory block of Windows is destroyed when
+                # the worker closes it, before the executor can open it.
+                raise ValueError("shared_memory_threshold requires POSIX "
+                                 "shared memory")
+            # The shared memory blocks created by the workers are
+            # unregistered by the executor: they must share its resource
+            # tracker, even if they are forked.
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+        self._shared_memory_threshold = shared_memory_threshold
+
         # Management thread
         self._executor_manager_thread = None
 
@@ -646,7 +970,9 @@ class ProcessPoolExecutor(_base.Executor):
                 args=(self._call_queue,
                       self._result_queue,
                       self._initializer,
-                      self._initargs))
+                      self._initargs,
+                      self._max_tasks_per_child,
+                      self._shared_memory_threshold))
             p.start()
             self._processes[p.pid] = p
 
@@ -673,7 +999,8 @@ class ProcessPoolExecutor(_base.Executor):
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None,
+            ordered=True):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -684,6 +1011,15 @@ class ProcessPoolExecutor(_base.Executor):
             chunksize: If greater than one, the iterables will be chopped into
                 chunks of size chunksize and submitted to the process pool.
                 If set to one, the items in the list will be sent one at a time.
+                If None, the size of the chunks is adapted to the time taken
+                by the calls, and buffersize defaults to twice the number of
+                processes.
+            buffersize: The maximum number of chunks submitted and not yet
+                yielded by the iterator. The iterables are consumed as the
+                results are yielded. If None, then all the chunks are
+                submitted up front.
+            ordered: If False, then the results of the chunks are yielded as
+                the chunks complete instead of in the order of the iterables.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -694,12 +1030,21 @@ class ProcessPoolExecutor(_base.Executor):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
-        if chunksize < 1:
+        if chunksize is None:
+            chunks = _AdaptiveChunks(*iterables)
+            if buffersize is None:
+                buffersize = 2 * self._max_workers
+            results = super().map(partial(_process_timed_chunk, fn), chunks,
+                                  timeout=timeout, buffersize=buffersize,
+                                  ordered=ordered)
+            return _chain_from_timed_chunks(results, chunks)
+        elif chunksize < 1:
             raise ValueError("chunksize must be >= 1.")
 
         results = super().map(partial(_process_chunk, fn),
                               _get_chunks(*iterables, chunksize=chunksize),
-                              timeout=timeout)
+                              timeout=timeout, buffersize=buffersize,
+                              ordered=ordered)
         return _chain_from_iterable_of_lists(results)
 
     def shutdown(self, wait=True, *, cancel_futures=False):
@@ -6,6 +6,7 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import atexit
+import collections
 from concurrent.futures import _base
 import itertools
 import queue
@@ -61,7 +62,136 @@ class _WorkItem(object):
     __class_getitem__ = classmethod(types.GenericAlias)
 
 
-def _worker(executor_reference, work_queue, initializer, initargs):
+class _WorkStealingQueue(object):
+    """The work queues of a ThreadPoolExecutor in work stealing mode.
+
+    Each worker thread owns a deque.  The work items submitted by a worker
+    thread are appended to its deque, and the worker runs them last in,
+    first out.  The work items submitted by other threads are appended to
+    a shared deque.  A worker with an empty deque takes the oldest work
+    item of the shared deque, or steals the oldest work item of the deque
+    of another worker.
+
+    Idle workers wait on their own lock; submit() wakes up the most
+    recently idle worker only, so that the other workers can time out.
+    put(None) wakes up all the idle workers.
+    """
+
+    def __init__(self):
+        self._shared = collections.deque()
+        # Deques of the workers.  The list is replaced rather than modified,
+        # under _lock, so that the workers can iterate over it without
+        # locking.
+        self._deques = []
+        self._lock = threading.Lock()
+        # Locks of the idle workers, in the order they became idle.
+        self._idle = collections.deque()
+        self._local = threading.local()
+
+    def put(self, work_item):
+        if work_item is None:
+            while self._idle:
+                self.wakeup()
+            return
+        deque = getattr(self._local, 'deque', None)
+        if deque is None:
+            deque = self._shared
+        deque.append(work_item)
+
+    def get_nowait(self):
+        for deque in [self._shared] + self._deques:
+            try:
+                return deque.popleft()
+            except IndexError:
+                pass
+        raise queue.Empty
+
+    def wakeup(self):
+        """Wake up an idle worker, return False if there is none."""
+        try:
+            lock = self._idle.pop()
+        except IndexError:
+            return False
+        lock.release()
+        return True
+
+    def register(self):
+        """Create the deque of the calling worker thread."""
+        deque = collections.deque()
+        self._local.deque = deque
+        with self._lock:
+            self._deques = self._deques + [deque]
+        return deque
+
+    def unregister(self, deque):
+        with self._lock:
+            self._deques = [d for d in self._deques if d is not deque]
+        self._local.deque = None
+        # Hand over the work items left, if any.
+        self._shared.extend(deque)
+
+    def get(self, deque):
+        """Return the next work item for the worker owning the deque, or
+        None if there is none."""
+        try:
+            return deque.pop()
+        except IndexError:
+            pass
+        try:
+            return self._shared.popleft()
+        except IndexError:
+            pass
+        for other in self._deques:
+            if other is not deque:
+                try:
+                    return other.popleft()
+                except IndexError:
+                    pass
+        return None
+
+    def add_idle(self, lock):
+        self._idle.append(lock)
+
+    def remove_idle(self, lock):
+        """Remove a lock from the idle workers, return False if it was
+        woken up meanwhile."""
+        try:
+            self._idle.remove(lock)
+        except ValueError:
+            # wakeup() popped the lock: consume its release.
+            lock.acquire()
+            return False
+        return True
+
+
+def _exiting(executor_reference):
+    executor = executor_reference()
+    # Exit if:
+    #   - The interpreter is shutting down OR
+    #   - The executor that owns the worker has been collected OR
+    #   - The executor that owns the worker has been shutdown.
+    if _shutdown or executor is None or executor._shutdown:
+        # Flag the executor as shutting down as early as possible if it
+        # is not gc-ed yet.
+        if executor is not None:
+            executor._shutdown = True
+        return True
+    return False
+
+
+def _retire(executor_reference):
+    # Forget the current thread, which exits after idle_timeout seconds.
+    t = threading.current_thread()
+    executor = executor_reference()
+    if executor is not None:
+        with executor._shutdown_lock:
+            executor._threads.discard(t)
+        del executor
+    with _global_shutdown_lock:
+        _threads_queues.pop(t, None)
+
+
+def _initialize(executor_reference, initializer, initargs):
     if initializer is not None:
         try:
             initializer(*initargs)
@@ -70,10 +200,66 @@ def _worker(executor_reference, work_queue, initializer, initargs):
             executor = executor_reference()
             if executor is not None:
                 executor._initializer_failed()
-            return
+            return False
+    return True
+
+
+def _work_stealing_worker(executor_reference, work_queue, initializer,
+                          initargs, idle_timeout):
+    if not _initialize(executor_reference, initializer, initargs):
+        return
+    deque = work_queue.register()
+    # Released by work_queue.wakeup() when the worker is idle.
+    lock = threading.Lock()
+    lock.acquire()
+    try:
+        while True:
+            work_item = work_queue.get(deque)
+            if work_item is None:
+                work_queue.add_idle(lock)
+                # Check again: the work items submitted and the shutdown
+                # requested before add_idle() did not wake up this worker.
+                work_item = work_queue.get(deque)
+                if work_item is None and not _exiting(executor_reference):
+                    if lock.acquire(timeout=idle_timeout or -1):
+                        continue
+                    if work_queue.remove_idle(lock):
+                        _retire(executor_reference)
+                        return
+                    continue
+                work_queue.remove_idle(lock)
+                if work_item is None:
+                    # Notice other workers
+                    work_queue.put(None)
+                    return
+            work_item.run()
+            # Delete references to object. See issue16284
+            del work_item
+    except BaseException:
+        _base.LOGGER.critical('Exception in worker', exc_info=True)
+    finally:
+        work_queue.unregister(deque)
+
+
+def _worker(executor_reference, work_queue, initializer, initargs,
+            idle_timeout=None):
+    if not _initialize(executor_reference, initializer, initargs):
+        return
     try:
         while True:
-            work_item = work_queue.get(block=True)
+            try:
+                work_item = work_queue.get(block=True, timeout=idle_timeout)
+            except queue.Empty:
+                # Only exit if the idle count can be decremented: otherwise
+                # a work item was just submitted for an idle worker.
+                executor = executor_reference()
+                if (executor is not None
+                        and executor._idle_semaphore.acquire(timeout=0)):
+                    del executor
+                    _retire(executor_reference)
+                    return
+                del executor
+                continue
             if work_item is not None:
                 work_item.run()
                 # Delete references to object. See issue16284
@@ -86,20 +272,10 @@ def _worker(executor_reference, work_queue, initializer, initargs):
                 del executor
                 continue
 
-            executor = executor_reference()
-            # Exit if:
-            #   - The interpreter is shutting down OR
-            #   - The executor that owns the worker has been collected OR
-            #   - The executor that owns the worker has been shutdown.
-            if _shutdown or executor is None or executor._shutdown:
-                # Flag the executor as shutting down as early as possible if it
-                # is not gc-ed yet.
-                if executor is not None:
-                    executor._shutdown = True
+            if _exiting(executor_reference):
                 # Notice other workers
                 work_queue.put(None)
                 return
-            del executor
     except BaseException:
         _base.LOGGER.critical('Exception in worker', exc_info=True)
 
@@ -116,7 +292,8 @@ class ThreadPoolExecutor(_base.Executor):
     _counter = itertools.count().__next__
 
     def __init__(self, max_workers=None, thread_name_prefix='',
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *, work_stealing=False,
+                 idle_timeout=None):
         """Initializes a new ThreadPoolExecutor instance.
 
         Args:
@@ -125,6 +302,12 @@ class ThreadPoolExecutor(_base.Executor):
             thread_name_prefix: An optional name prefix to give our threads.
             initializer: A callable used to initialize worker threads.
             initargs: A tuple of arguments to pass to the initializer.
+            work_stealing: If true, each worker thread has its own queue of
+                calls, which receives the calls submitted by the worker, and
+                idle workers steal calls from the queues of other workers.
+            idle_timeout: The number of seconds after which an idle worker
+                thread exits, or None to keep the worker threads until
+                shutdown.
         """
         if max_workers is None:
             # ThreadPoolExecutor is often used to:
@@ -141,8 +324,16 @@ class ThreadPoolExecutor(_base.Executor):
         if initializer is not None and not callable(initializer):
             raise TypeError("initializer must be a callable")
 
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("idle_timeout must be greater than 0")
+
         self._max_workers = max_workers
-        self._work_queue = queue.SimpleQueue()
+        self._work_stealing = work_stealing
+        self._idle_timeout = idle_timeout
+        if work_stealing:
+            self._work_queue = _WorkStealingQueue()
+        else:
+            self._work_queue = queue.SimpleQueue()
         self._idle_semaphore = threading.Semaphore(0)
         self._threads = set()
         self._broken = False
@@ -174,7 +365,10 @@ class ThreadPoolExecutor(_base.Executor):
 
     def _adjust_thread_count(self):
         # if idle threads are available, don't spin new threads
-        if self._idle_semaphore.acquire(timeout=0):
+        if self._work_stealing:
+            if self._work_queue.wakeup():
+                return
+        elif self._idle_semaphore.acquire(timeout=0):
             return
 
         # When the executor gets lost, the weakref callback will wake up
@@ -186,11 +380,14 @@ class ThreadPoolExecutor(_base.Executor):
         if num_threads < self._max_workers:
             thread_name = '%s_%d' % (self._thread_name_prefix or self,
                                      num_threads)
-            t = threading.Thread(name=thread_name, target=_worker,
+            t = threading.Thread(name=thread_name,
+                                 target=(_work_stealing_worker
+                                         if self._work_stealing else _worker),
                                  args=(weakref.ref(self, weakref_cb),
                                        self._work_queue,
                                        self._initializer,
-                                       self._initargs))
+                                       self._initargs,
+                                       self._idle_timeout))
             t.start()
             self._threads.add(t)
             _threads_queues[t] = self._work_queue
@@ -226,6 +423,9 @@ class ThreadPoolExecutor(_base.Executor):
             # _work_queue.get(block=True) from permanently blocking.
             self._work_queue.put(None)
         if wait:
-            for t in self._threads:
+            # Idle workers may exit and leave self._threads meanwhile.
+            with self._shutdown_lock:
+                threads = list(self._threads)
+            for t in threads:
                 t.join()
     shutdown.__doc__ = _base.Executor.shutdown.__doc__
@@ -98,12 +98,13 @@ Using json.tool from the shell to validate and pretty-print::
 __version__ = '2.0.9'
 __all__ = [
     'dump', 'dumps', 'load', 'loads',
+    'iterload', 'loadlines', 'dumplines',
     'JSONDecoder', 'JSONDecodeError', 'JSONEncoder',
 ]
 
 __author__ = 'Bob Ippolito <bob@redivi.com>'
 
-from .decoder import JSONDecoder, JSONDecodeError
+from .decoder import JSONDecoder, JSONDecodeError, _relocate_error
 from .encoder import JSONEncoder
 import codecs
 
@@ -166,18 +167,15 @@ def dump(obj, fp, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         check_circular and allow_nan and
         cls is None and indent is None and separators is None and
         default is None and not sort_keys and not kw):
-        iterable = _default_encoder.iterencode(obj)
+        encoder = _default_encoder
     else:
         if cls is None:
             cls = JSONEncoder
-        iterable = cls(skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+        encoder = cls(skipkeys=skipkeys, ensure_ascii=ensure_ascii,
             check_circular=check_circular, allow_nan=allow_nan, indent=indent,
             separators=separators,
-            default=default, sort_keys=sort_keys, **kw).iterencode(obj)
-    # could accelerate with writelines in some versions of Python, at
-    # a debuggability cost
-    for chunk in iterable:
-        fp.write(chunk)
+            default=default, sort_keys=sort_keys, **kw)
+    encoder._dump(obj, fp.write)
 
 
 def dumps(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
@@ -298,8 +296,9 @@ def load(fp, *, cls=None, object_hook=None, parse_float=None,
 
 def loads(s, *, cls=None, object_hook=None, parse_float=None,
         parse_int=None, parse_constant=None, object_pairs_hook=None, **kw):
-    """Deserialize ``s`` (a ``str``, ``bytes`` or ``bytearray`` instance
-    containing a JSON document) to a Python object.
+    """Deserialize ``s`` (a ``str`` instance or a bytes-like object such as
+    ``bytes``, ``bytearray``, ``memoryview`` or ``mmap``, containing a JSON
+    document) to a Python object.
 
     ``object_hook`` is an optional function that will be called with the
     result of any object literal decode (a ``dict``). The return value of
@@ -330,20 +329,37 @@ def loads(s, *, cls=None, object_hook=None, parse_float=None,
     To use a custom ``JSONDecoder`` subclass, specify it with the ``cls``
     kwarg; otherwise ``JSONDecoder`` is used.
     """
+    decoder = _make_decoder(cls, object_hook, parse_float, parse_int,
+                            parse_constant, object_pairs_hook, kw)
     if isinstance(s, str):
         if s.startswith('\ufeff'):
             raise JSONDecodeError("Unexpected UTF-8 BOM (decode using utf-8-sig)",
                                   s, 0)
-    else:
-        if not isinstance(s, (bytes, bytearray)):
-            raise TypeError(f'the JSON object must be str, bytes or bytearray, '
-                            f'not {s.__class__.__name__}')
-        s = s.decode(detect_encoding(s), 'surrogatepass')
-
+        return decoder.decode(s)
+
+    if not isinstance(s, (bytes, bytearray)):
+        try:
+            s = memoryview(s).cast('B')
+        except TypeError:
+            raise TypeError(f'the JSON object must be str or a bytes-like '
+                            f'object, not {s.__class__.__name__}') from None
+    encoding = detect_encoding(bytes(s[:4]))
+    # UTF-8 is decoded in place by JSONDecoder, other decoders only
+    # implement decode()
+    if isinstance(decoder, JSONDecoder):
+        if encoding == 'utf-8':
+            return decoder._decode_utf8(s)
+        if encoding == 'utf-8-sig':
+            return decoder._decode_utf8(memoryview(s)[3:])
+    return decoder.decode(str(s, encoding, 'surrogatepass'))
+
+
+def _make_decoder(cls, object_hook, parse_float, parse_int, parse_constant,
+                  object_pairs_hook, kw):
     if (cls is None and object_hook is None and
             parse_int is None and parse_float is None and
             parse_constant is None and object_pairs_hook is None and not kw):
-        return _default_decoder.decode(s)
+        return _default_decoder
     if cls is None:
         cls = JSONDecoder
     if object_hook is not None:
@@ -356,4 +372,99 @@ def loads(s, *, cls=None, object_hook=None, parse_float=None,
         kw['parse_int'] = parse_int
     if parse_constant is not None:
         kw['parse_constant'] = parse_constant
-    return cls(**kw).decode(s)
+    return cls(**kw)
+
+
+def _read_chunks(fp, size=65536):
+    # Yield the text read from fp by chunks of size characters or bytes
+    chunk = fp.read(size)
+    if isinstance(chunk, str):
+        if chunk.startswith('\ufeff'):
+            raise JSONDecodeError("Unexpected UTF-8 BOM (decode using utf-8-sig)",
+                                  chunk, 0)
+        while chunk:
+            yield chunk
+            chunk = fp.read(size)
+    else:
+        if not isinstance(chunk, (bytes, bytearray)):
+            raise TypeError(f'the JSON object must be str, bytes or bytearray, '
+                            f'not {chunk.__class__.__name__}')
+        decoder = codecs.getincrementaldecoder(detect_encoding(chunk))(
+            'surrogatepass')
+        while chunk:
+            yield decoder.decode(chunk)
+            chunk = fp.read(size)
+        yield decoder.decode(b'', True)
+
+
+def iterload(fp, *, path=(), cls=None, object_hook=None, parse_float=None,
+        parse_int=None, parse_constant=None, object_pairs_hook=None, **kw):
+    """Deserialize ``fp`` (a ``.read()``-supporting file-like object containing
+    a JSON document) incrementally and yield the elements of its top-level
+    array, or the ``(key, value)`` pairs of its top-level object.
+
+    ``path`` is a sequence of object keys and array indices leading to a
+    nested array or object whose items are yielded instead.  Nothing is
+    yielded if there is no array or object at ``path``.
+
+    The document is read by chunks and only the part holding the item
+    being decoded is kept in memory, so that a document larger than the
+    memory can be decoded.  The other arguments have the same meaning as
+    in ``load()``; ``object_hook`` and ``object_pairs_hook`` are not called
+    for the object whose pairs are yielded.
+    """
+    decoder = _make_decoder(cls, object_hook, parse_float, parse_int,
+                            parse_constant, object_pairs_hook, kw)
+    return decoder.iterdecode(_read_chunks(fp), path)
+
+
+def loadlines(fp, *, cls=None, object_hook=None, parse_float=None,
+        parse_int=None, parse_constant=None, object_pairs_hook=None, **kw):
+    """Deserialize ``fp`` (an iterable of lines, such as a file object,
+    containing newline-delimited JSON) and yield the Python object of each
+    line.  Blank lines are skipped.
+
+    The other arguments have the same meaning as in ``load()``.
+    """
+    decode = _make_decoder(cls, object_hook, parse_float, parse_int,
+                           parse_constant, object_pairs_hook, kw).decode
+    offset = 0
+    for lineno, line in enumerate(fp, 1):
+        if not isinstance(line, str):
+            line = line.decode(detect_encoding(line), 'surrogatepass')
+        if line and not line.isspace():
+            try:
+                yield decode(line)
+            except JSONDecodeError as err:
+                raise _relocate_error(err, offset + err.pos,
+                                      lineno + err.lineno - 1,
+                                      err.colno) from None
+        offset += len(line)
+
+
+def dumplines(iterable, fp, *, skipkeys=False, ensure_ascii=True,
+        check_circular=True, allow_nan=True, cls=None, separators=None,
+        default=None, sort_keys=False, **kw):
+    """Serialize each object of ``iterable`` as a line of newline-delimited
+    JSON to ``fp`` (a ``.write()``-supporting file-like object).
+
+    The arguments have the same meaning as in ``dump()``.  There is no
+    ``indent`` argument since each object must fit on a line.
+    """
+    # cached encoder
+    if (not skipkeys and ensure_ascii and
+        check_circular and allow_nan and
+        cls is None and separators is None and
+        default is None and not sort_keys and not kw):
+        encoder = _default_encoder
+    else:
+        if cls is None:
+            cls = JSONEncoder
+        encoder = cls(skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+            check_circular=check_circular, allow_nan=allow_nan, indent=None,
+            separators=separators,
+            default=default, sort_keys=sort_keys, **kw)
+    encode = encoder.encode
+    write = fp.write
+    for obj in iterable:
+        write(encode(obj) + '\n')
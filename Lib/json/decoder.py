@@ -43,6 +43,25 @@ class JSONDecodeError(ValueError):
         return self.__class__, (self.msg, self.doc, self.pos)
 
 
+def _utf8_error(msg, b, pos):
+    """Return a JSONDecodeError for the index pos of the UTF-8 document b,
+    reporting the position in the decoded document."""
+    return JSONDecodeError(msg, str(b, 'utf-8', 'replace'),
+                           len(str(b[:pos], 'utf-8', 'replace')))
+
+
+def _relocate_error(err, pos, lineno, colno):
+    """Make the JSONDecodeError err, raised for a part of a larger document,
+    report the position pos, at line lineno and column colno, of the
+    larger document."""
+    err.pos = pos
+    err.lineno = lineno
+    err.colno = colno
+    err.args = ('%s: line %d column %d (char %d)' %
+                (err.msg, lineno, colno, pos),)
+    return err
+
+
 _CONSTANTS = {
     '-Infinity': NegInf,
     'Infinity': PosInf,
@@ -131,6 +150,7 @@ scanstring = c_scanstring or py_scanstring
 
 WHITESPACE = re.compile(r'[ \t\n\r]*', FLAGS)
 WHITESPACE_STR = ' \t\n\r'
+WHITESPACE_BYTES = re.compile(rb'[ \t\n\r]*', FLAGS)
 
 
 def JSONObject(s_and_end, strict, scan_once, object_hook, object_pairs_hook,
@@ -283,7 +303,7 @@ class JSONDecoder(object):
 
     def __init__(self, *, object_hook=None, parse_float=None,
             parse_int=None, parse_constant=None, strict=True,
-            object_pairs_hook=None):
+            object_pairs_hook=None, key_cache_size=0):
         """``object_hook``, if specified, will be called with the result
         of every JSON object decoded and its return value will be used in
         place of the given ``dict``.  This can be used to provide custom
@@ -315,6 +335,11 @@ class JSONDecoder(object):
         characters will be allowed inside strings.  Control characters in
         this context are those with character codes in the 0-31 range,
         including ``'\\t'`` (tab), ``'\\n'``, ``'\\r'`` and ``'\\0'``.
+
+        If ``key_cache_size`` is greater than zero, the keys of the decoded
+        objects are shared across calls as long as at most
+        ``key_cache_size`` distinct keys have been seen.  This reduces the
+        memory used by the results of many documents with the same keys.
         """
         self.object_hook = object_hook
         self.parse_float = parse_float or float
@@ -325,6 +350,7 @@ class JSONDecoder(object):
         self.parse_object = JSONObject
         self.parse_array = JSONArray
         self.parse_string = scanstring
+        self.key_cache_size = key_cache_size
         self.memo = {}
         self.scan_once = scanner.make_scanner(self)
 
@@ -354,3 +380,170 @@ class JSONDecoder(object):
         except StopIteration as err:
             raise JSONDecodeError("Expecting value", s, err.value) from None
         return obj, end
+
+    def _decode_utf8(self, b, _w=WHITESPACE_BYTES.match):
+        """Return the Python representation of ``b`` (a bytes-like object
+        containing a UTF-8 JSON document).
+
+        The C scanner decodes ``b`` in place, only the strings are decoded
+        from UTF-8; otherwise ``b`` is decoded to ``str`` first.
+        """
+        if (not isinstance(self.scan_once, scanner.c_make_scanner or ()) or
+                type(self).decode is not JSONDecoder.decode or
+                type(self).raw_decode is not JSONDecoder.raw_decode):
+            return self.decode(str(b, 'utf-8', 'surrogatepass'))
+        try:
+            obj, end = self.scan_once(b, _w(b, 0).end())
+        except StopIteration as err:
+            raise _utf8_error("Expecting value", b, err.value) from None
+        end = _w(b, end).end()
+        if end != len(b):
+            raise _utf8_error("Extra data", b, end)
+        return obj
+
+    def iterdecode(self, chunks, path=(), _w=WHITESPACE.match):
+        """Decode a JSON document from ``chunks`` (an iterable of ``str``
+        instances which are the consecutive parts of the document) and
+        yield the elements of its top-level array, or the ``(key, value)``
+        pairs of its top-level object, as soon as they are decoded.
+
+        ``path`` is a sequence of object keys and array indices leading
+        to a nested array or object whose items are yielded instead.
+        Nothing is yielded if there is no array or object at ``path``.
+
+        Only the part of the document holding the item being decoded is
+        kept in memory, the items are decoded by ``scan_once()``.
+
+        """
+        chunks = iter(chunks)
+        scan_once = self.scan_once
+        strict = self.strict
+        s = ''
+        idx = 0
+        eof = False
+        # Number of characters and of lines dropped from the start of the
+        # document, and position of the start of the last dropped line.
+        offset = lines = linestart = 0
+
+        def read():
+            # Drop the characters before idx and read at least as many
+            # characters as are left, so that a value which does not fit in
+            # s is decoded again a logarithmic number of times.
+            nonlocal s, idx, eof, offset, lines, linestart
+            newlines = s.count('\n', 0, idx)
+            if newlines:
+                lines += newlines
+                linestart = offset + s.rfind('\n', 0, idx) + 1
+            offset += idx
+            parts = [s[idx:]]
+            size = max(len(parts[0]), 1)
+            while size > 0:
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    eof = True
+                    break
+                parts.append(chunk)
+                size -= len(chunk)
+            s = ''.join(parts)
+            idx = 0
+
+        def error(msg, pos):
+            err = JSONDecodeError(msg, s, pos)
+            newlines = s.count('\n', 0, pos)
+            if newlines:
+                colno = err.colno
+            else:
+                colno = offset + pos - linestart + 1
+            return _relocate_error(err, offset + pos, lines + newlines + 1,
+                                   colno)
+
+        def whitespace():
+            # Skip the whitespace at idx and return the next character, or
+            # '' at the end of the document.
+            nonlocal idx
+            while True:
+                idx = _w(s, idx).end()
+                if idx < len(s):
+                    return s[idx]
+                if eof:
+                    return ''
+                read()
+
+        def decode(key=False):
+            nonlocal idx
+            while True:
+                try:
+                    if key:
+                        value, end = scanstring(s, idx + 1, strict)
+                    else:
+                        value, end = scan_once(s, idx)
+                except StopIteration as err:
+                    msg, pos = "Expecting value", err.value
+                except JSONDecodeError as err:
+                    msg, pos = err.msg, err.pos
+                else:
+                    # A number may go on in the next chunk: its end is only
+                    # known once the 3 characters after it are read ("e+"
+                    # and a digit).
+                    if end + 3 <= len(s) or eof:
+                        idx = end
+                        return value
+                    read()
+                    continue
+                # A value cut by the end of s fails near its end (12 is
+                # the length of an escaped surrogate pair), or because its
+                # string is unterminated.
+                if eof or (pos + 12 < len(s) and
+                           not msg.startswith('Unterminated string')):
+                    raise error(msg, pos)
+                read()
+
+        def items(path):
+            # Decode the array or object at idx and yield its items, or
+            # the items of the array or object at path in it.
+            nonlocal idx
+            is_object = s[idx] == '{'
+            closing = '}' if is_object else ']'
+            idx += 1
+            c = whitespace()
+            if c == closing:
+                idx += 1
+                return
+            index = 0
+            while True:
+                if is_object:
+                    if c != '"':
+                        raise error("Expecting property name enclosed in "
+                                    "double quotes", idx)
+                    key = decode(key=True)
+                    if whitespace() != ':':
+                        raise error("Expecting ':' delimiter", idx)
+                    idx += 1
+                    c = whitespace()
+                else:
+                    key = index
+                    index += 1
+                if not path:
+                    value = decode()
+                    yield (key, value) if is_object else value
+                elif key == path[0] and c in ('[', '{'):
+                    yield from items(path[1:])
+                else:
+                    decode()
+                c = whitespace()
+                if c == closing:
+                    idx += 1
+                    return
+                if c != ',':
+                    raise error("Expecting ',' delimiter", idx)
+                idx += 1
+                c = whitespace()
+
+        read()
+        if whitespace() in ('[', '{'):
+            yield from items(tuple(path))
+        else:
+            decode()
+        if whitespace():
+            raise error("Extra data", idx)
@@ -24,6 +24,7 @@ def py_make_scanner(context):
     object_hook = context.object_hook
     object_pairs_hook = context.object_pairs_hook
     memo = context.memo
+    key_cache_size = getattr(context, 'key_cache_size', 0)
 
     def _scan_once(string, idx):
         try:
@@ -66,7 +67,8 @@ def py_make_scanner(context):
         try:
             return _scan_once(string, idx)
         finally:
-            memo.clear()
+            if len(memo) > key_cache_size:
+                memo.clear()
 
     return scan_once
 
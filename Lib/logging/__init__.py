@@ -77,6 +77,12 @@ logMultiprocessing = True
 #
 logProcesses = True
 
+#
+# If you want the threadName, processName and process attributes of
+# LogRecords to be computed only when they are used, set this to True
+#
+lazyRecords = False
+
 #---------------------------------------------------------------------------
 #   Level related stuff
 #---------------------------------------------------------------------------
@@ -185,6 +191,16 @@ _srcfile = os.path.normcase(addLevelName.__code__.co_filename)
 #if not hasattr(sys, '_getframe'):
 #    _srcfile = None
 
+#
+# Caches of os.path.normcase() of the filenames of code objects seen by
+# findCaller(), and of the filename and module name derived from the
+# pathnames of LogRecords. They are emptied when they reach _CACHE_SIZE
+# entries.
+#
+_normcaseCache = {}
+_pathnameCache = {}
+_CACHE_SIZE = 1000
+
 
 def _checkLevel(level):
     if isinstance(level, int):
@@ -263,6 +279,37 @@ else:
 #   The logging record
 #---------------------------------------------------------------------------
 
+# The attributes of LogRecords left out when lazyRecords is true
+_lazyAttributes = ('threadName', 'processName', 'process')
+
+def _processName():
+    """
+    Return the name of the current multiprocessing process.
+    """
+    mp = sys.modules.get('multiprocessing')
+    if mp is not None:
+        # Errors may occur if multiprocessing has not finished loading
+        # yet - e.g. if a custom import hook causes third-party code
+        # to run when multiprocessing calls import. See issue 8200
+        # for an example
+        try:
+            return mp.current_process().name
+        except Exception: #pragma: no cover
+            pass
+    return 'MainProcess'
+
+def _threadName(ident):
+    """
+    Return the name of the thread with the identifier ident, or None if it
+    has exited.
+    """
+    if ident == threading.get_ident():
+        return threading.current_thread().name
+    for thread in threading.enumerate():
+        if thread.ident == ident:
+            return thread.name
+    return None
+
 class LogRecord(object):
     """
     A LogRecord instance represents an event being logged.
@@ -309,11 +356,18 @@ class LogRecord(object):
         self.levelno = level
         self.pathname = pathname
         try:
-            self.filename = os.path.basename(pathname)
-            self.module = os.path.splitext(self.filename)[0]
-        except (TypeError, ValueError, AttributeError):
-            self.filename = pathname
-            self.module = "Unknown module"
+            self.filename, self.module = _pathnameCache[pathname]
+        except (KeyError, TypeError):
+            try:
+                self.filename = os.path.basename(pathname)
+                self.module = os.path.splitext(self.filename)[0]
+            except (TypeError, ValueError, AttributeError):
+                self.filename = pathname
+                self.module = "Unknown module"
+            else:
+                if len(_pathnameCache) >= _CACHE_SIZE:
+                    _pathnameCache.clear()
+                _pathnameCache[pathname] = self.filename, self.module
         self.exc_info = exc_info
         self.exc_text = None      # used to cache the traceback text
         self.stack_info = sinfo
@@ -322,31 +376,53 @@ class LogRecord(object):
         self.created = ct
         self.msecs = (ct - int(ct)) * 1000
         self.relativeCreated = (self.created - _startTime) * 1000
+        # With lazyRecords, threadName, processName and process are left
+        # out and computed by __getattr__() when they are first used.
         if logThreads:
             self.thread = threading.get_ident()
-            self.threadName = threading.current_thread().name
+            if not lazyRecords:
+                self.threadName = threading.current_thread().name
         else: # pragma: no cover
             self.thread = None
             self.threadName = None
         if not logMultiprocessing: # pragma: no cover
             self.processName = None
-        else:
-            self.processName = 'MainProcess'
-            mp = sys.modules.get('multiprocessing')
-            if mp is not None:
-                # Errors may occur if multiprocessing has not finished loading
-                # yet - e.g. if a custom import hook causes third-party code
-                # to run when multiprocessing calls import. See issue 8200
-                # for an example
-                try:
-                    self.processName = mp.current_process().name
-                except Exception: #pragma: no cover
-                    pass
+        elif not lazyRecords:
+            self.processName = _processName()
         if logProcesses and hasattr(os, 'getpid'):
-            self.process = os.getpid()
+            if not lazyRecords:
+                self.process = os.getpid()
         else:
             self.process = None
 
+    def __getattr__(self, name):
+        """
+        Compute an attribute left out because lazyRecords was true when the
+        record was created.
+        """
+        if name == 'threadName':
+            value = _threadName(self.thread)
+        elif name == 'processName':
+            value = _processName()
+        elif name == 'process':
+            value = os.getpid()
+        else:
+            raise AttributeError("%r object has no attribute %r" %
+                                 (type(self).__name__, name))
+        self.__dict__[name] = value
+        return value
+
+    def __getstate__(self):
+        """
+        Return the attribute dictionary of the record, used to copy or
+        pickle it, after computing the attributes left out by lazyRecords.
+        """
+        d = self.__dict__
+        for name in _lazyAttributes:
+            if name not in d:
+                getattr(self, name)
+        return d
+
     def __repr__(self):
         return '<LogRecord: %s, %s, %s, %s, "%s">'%(self.name, self.levelno,
             self.pathname, self.lineno, self.msg)
@@ -422,10 +498,18 @@ class PercentStyle(object):
         if not self.validation_pattern.search(self._fmt):
             raise ValueError("Invalid format '%s' for '%s' style" % (self._fmt, self.default_format[0]))
 
+    def usesField(self, name):
+        return self._fmt.find('%(' + name + ')') >= 0
+
     def _format(self, record):
         return self._fmt % record.__dict__
 
     def format(self, record):
+        # Compute the attributes left out by lazyRecords which are used
+        d = record.__dict__
+        for name in _lazyAttributes:
+            if name not in d and self.usesField(name):
+                getattr(record, name)
         try:
             return self._format(record)
         except KeyError as e:
@@ -440,6 +524,9 @@ class StrFormatStyle(PercentStyle):
     fmt_spec = re.compile(r'^(.?[<>=^])?[+ -]?#?0?(\d+|{\w+})?[,_]?(\.(\d+|{\w+}))?[bcdefgnosx%]?$', re.I)
     field_spec = re.compile(r'^(\d+|\w+)(\.\w+|\[[^]]+\])*$')
 
+    def usesField(self, name):
+        return self._fmt.find('{' + name) >= 0
+
     def _format(self, record):
         return self._fmt.format(**record.__dict__)
 
@@ -475,6 +562,10 @@ class StringTemplateStyle(PercentStyle):
         fmt = self._fmt
         return fmt.find('$asctime') >= 0 or fmt.find(self.asctime_format) >= 0
 
+    def usesField(self, name):
+        fmt = self._fmt
+        return fmt.find('$' + name) >= 0 or fmt.find('${' + name + '}') >= 0
+
     def validate(self):
         pattern = Template.pattern
         fields = set()
@@ -932,6 +1023,16 @@ class Handler(Filterer):
         raise NotImplementedError('emit must be implemented '
                                   'by Handler subclasses')
 
+    def emit_batch(self, records):
+        """
+        Emit a list of logging records.
+
+        This version calls emit() for each record. Subclasses may override
+        it to emit the records at once.
+        """
+        for record in records:
+            self.emit(record)
+
     def handle(self, record):
         """
         Conditionally emit the specified logging record.
@@ -950,6 +1051,26 @@ class Handler(Filterer):
                 self.release()
         return rv
 
+    def handle_batch(self, records):
+        """
+        Conditionally emit the specified list of logging records.
+
+        The records are filtered as by handle(), and those which pass are
+        emitted by a single call of emit_batch() made with the I/O thread
+        lock held. Returns the list of records passed for emission. If
+        handle() is overridden, it is called for each record instead.
+        """
+        if type(self).handle is not Handler.handle:
+            return [record for record in records if self.handle(record)]
+        records = [record for record in records if self.filter(record)]
+        if records:
+            self.acquire()
+            try:
+                self.emit_batch(records)
+            finally:
+                self.release()
+        return records
+
     def setFormatter(self, fmt):
         """
         Set the formatter for this handler.
@@ -1086,6 +1207,38 @@ class StreamHandler(Handler):
         except Exception:
             self.handleError(record)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        The records are formatted as by emit() and written to the stream by
+        a single write, followed by a single flush. If emit() is overridden,
+        it is called for each record instead.
+        """
+        if type(self).emit is not StreamHandler.emit:
+            Handler.emit_batch(self, records)
+        else:
+            self._write_batch(records)
+
+    def _write_batch(self, records):
+        msgs = []
+        for record in records:
+            try:
+                msgs.append(self.format(record) + self.terminator)
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(record)
+        if not msgs:
+            return
+        try:
+            self.stream.write(''.join(msgs))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(records[-1])
+
     def setStream(self, stream):
         """
         Sets the StreamHandler's stream to the specified value,
@@ -1182,6 +1335,21 @@ class FileHandler(StreamHandler):
             self.stream = self._open()
         StreamHandler.emit(self, record)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        If the stream was not opened because 'delay' was specified in the
+        constructor, open it before writing the records as by
+        StreamHandler.emit_batch().
+        """
+        if type(self).emit is not FileHandler.emit:
+            Handler.emit_batch(self, records)
+            return
+        if self.stream is None:
+            self.stream = self._open()
+        self._write_batch(records)
+
     def __repr__(self):
         level = getLevelName(self.level)
         return '<%s %s (%s)>' % (self.__class__.__name__, self.baseFilename, level)
@@ -1518,7 +1686,13 @@ class Logger(Filterer):
         rv = "(unknown file)", 0, "(unknown function)", None
         while hasattr(f, "f_code"):
             co = f.f_code
-            filename = os.path.normcase(co.co_filename)
+            try:
+                filename = _normcaseCache[co.co_filename]
+            except KeyError:
+                filename = os.path.normcase(co.co_filename)
+                if len(_normcaseCache) >= _CACHE_SIZE:
+                    _normcaseCache.clear()
+                _normcaseCache[co.co_filename] = filename
             if filename == _srcfile:
                 f = f.f_back
                 continue
@@ -1545,7 +1719,8 @@ class Logger(Filterer):
                              sinfo)
         if extra is not None:
             for key in extra:
-                if (key in ["message", "asctime"]) or (key in rv.__dict__):
+                if ((key in ["message", "asctime"]) or (key in rv.__dict__) or
+                    (key in _lazyAttributes)):
                     raise KeyError("Attempt to overwrite %r in LogRecord" % key)
                 rv.__dict__[key] = extra[key]
         return rv
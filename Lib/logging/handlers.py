@@ -606,7 +606,7 @@ class SocketHandler(logging.Handler):
         # See issue #14436: If msg or args are objects, they may not be
         # available on the receiving end. So we convert the msg % args
         # to a string, save it as msg and zap the args.
-        d = dict(record.__dict__)
+        d = dict(record.__getstate__())
         d['msg'] = record.getMessage()
         d['args'] = None
         d['exc_info'] = None
@@ -1171,7 +1171,7 @@ class HTTPHandler(logging.Handler):
         that is sent as the CGI data. Overwrite in your class.
         Contributed by Franz Glasner.
         """
-        return record.__dict__
+        return record.__getstate__()
 
     def getConnection(self, host, secure):
         """
@@ -1377,6 +1377,7 @@ class QueueHandler(logging.Handler):
         """
         logging.Handler.__init__(self)
         self.queue = queue
+        self.dropped = 0
 
     def enqueue(self, record):
         """
@@ -1425,6 +1426,10 @@ class QueueHandler(logging.Handler):
         """
         try:
             self.enqueue(self.prepare(record))
+        except queue.Full:
+            # The listener does not keep up: count the dropped records.
+            self.dropped += 1
+            self.handleError(record)
         except Exception:
             self.handleError(record)
 
@@ -1437,24 +1442,48 @@ class QueueListener(object):
     """
     _sentinel = None
 
-    def __init__(self, queue, *handlers, respect_handler_level=False):
+    def __init__(self, queue, *handlers, respect_handler_level=False,
+                 batch_size=1, batch_timeout=0.0):
         """
         Initialise an instance with the specified queue and
         handlers.
+
+        If batch_size is greater than 1, up to batch_size records are taken
+        from the queue at once, waiting up to batch_timeout seconds for
+        records to fill the batch, and passed together to the handlers.
         """
         self.queue = queue
         self.handlers = handlers
         self._thread = None
         self.respect_handler_level = respect_handler_level
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.handled = 0
+        self.batches = 0
+        self.max_queue_depth = 0
 
-    def dequeue(self, block):
+    def dequeue(self, block, timeout=None):
         """
         Dequeue a record and return it, optionally blocking.
 
         The base implementation uses get. You may want to override this method
         if you want to use timeouts or work with custom queue implementations.
+        The timeout is only passed when collecting a batch of records with
+        a batch_timeout.
         """
-        return self.queue.get(block)
+        if timeout is None:
+            return self.queue.get(block)
+        return self.queue.get(block, timeout)
+
+    def queue_depth(self):
+        """
+        Return the approximate number of records waiting in the queue, or
+        None if the queue cannot tell it.
+        """
+        try:
+            return self.queue.qsize()
+        except (AttributeError, NotImplementedError):
+            return None
 
     def start(self):
         """
@@ -1493,6 +1522,28 @@ class QueueListener(object):
             if process:
                 handler.handle(record)
 
+    def handle_batch(self, records):
+        """
+        Handle a list of records.
+
+        This prepares the records and passes them to the handle_batch()
+        method of each handler. If handle() is overridden, it is called
+        for each record instead.
+        """
+        if type(self).handle is not QueueListener.handle:
+            for record in records:
+                self.handle(record)
+            return
+        records = [self.prepare(record) for record in records]
+        for handler in self.handlers:
+            if not self.respect_handler_level:
+                handler.handle_batch(records)
+            else:
+                level = handler.level
+                selected = [r for r in records if r.levelno >= level]
+                if selected:
+                    handler.handle_batch(selected)
+
     def _monitor(self):
         """
         Monitor the queue for records, and ask the handler
@@ -1503,6 +1554,9 @@ class QueueListener(object):
         """
         q = self.queue
         has_task_done = hasattr(q, 'task_done')
+        if self.batch_size > 1:
+            self._monitor_batches(has_task_done)
+            return
         while True:
             try:
                 record = self.dequeue(True)
@@ -1511,11 +1565,57 @@ class QueueListener(object):
                         q.task_done()
                     break
                 self.handle(record)
+                self.handled += 1
                 if has_task_done:
                     q.task_done()
             except queue.Empty:
                 break
 
+    def _monitor_batches(self, has_task_done):
+        """
+        Monitor the queue for records, and ask the handlers to deal with
+        them in batches of up to batch_size records.
+        """
+        batch_size = self.batch_size
+        batch_timeout = self.batch_timeout
+        stopping = False
+        while not stopping:
+            try:
+                record = self.dequeue(True)
+            except queue.Empty:
+                break
+            records = []
+            deadline = None
+            while True:
+                if record is self._sentinel:
+                    stopping = True
+                    break
+                records.append(record)
+                if len(records) >= batch_size:
+                    break
+                try:
+                    if not batch_timeout:
+                        record = self.dequeue(False)
+                        continue
+                    if deadline is None:
+                        deadline = time.monotonic() + batch_timeout
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    record = self.dequeue(True, timeout)
+                except queue.Empty:
+                    break
+            depth = self.queue_depth()
+            if depth is not None and depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+            if records:
+                self.handle_batch(records)
+                self.handled += len(records)
+                self.batches += 1
+            if has_task_done:
+                for _ in range(len(records) + stopping):
+                    self.queue.task_done()
+
     def enqueue_sentinel(self):
         """
         This is used to enqueue the sentinel record.
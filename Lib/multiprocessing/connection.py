@@ -17,6 +17,7 @@ import struct
 import time
 import tempfile
 import itertools
+import pickle
 
 import _multiprocessing
 
@@ -41,6 +42,15 @@ except ImportError:
 BUFSIZE = 8192
 # A very generous timeout when it comes to local connections...
 CONNECTION_TIMEOUT = 20.
+# Minimum size of the buffers which send() sends out-of-band
+OUT_OF_BAND_THRESHOLD = 16384
+
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 16
 
 _mmap_counter = itertools.count()
 
@@ -112,12 +122,79 @@ def address_type(address):
     else:
         raise ValueError('address type of %r unrecognized' % address)
 
+#
+# Pickling of large buffers out-of-band
+#
+
+class _OutOfBandBuffer(object):
+    """Marks a bytes or bytearray object to pickle as an out-of-band
+    buffer."""
+    def __init__(self, data):
+        self.data = data
+
+
+def _mark_buffers(obj, marked, depth=3):
+    """Return obj with its bytes and bytearray objects of at least
+    OUT_OF_BAND_THRESHOLD bytes marked as _OutOfBandBuffer, down to depth
+    levels of lists and tuples (such as the tasks and results of a Pool).
+    The markers are shared through the marked dict, by id.
+    """
+    if type(obj) in (bytes, bytearray):
+        if len(obj) >= OUT_OF_BAND_THRESHOLD:
+            if id(obj) not in marked:
+                marked[id(obj)] = _OutOfBandBuffer(obj)
+            return marked[id(obj)]
+    elif type(obj) in (list, tuple) and depth:
+        items = [_mark_buffers(item, marked, depth - 1) for item in obj]
+        # Only copy the containers holding marked buffers
+        if any(new is not old for new, old in zip(items, obj)):
+            return type(obj)(items)
+    return obj
+
+
+def _rebuild_bytearray(buf):
+    # The out-of-band buffers are received in bytearray objects
+    if type(buf) is bytearray:
+        return buf
+    return bytearray(buf)
+
+
+def _rebuild_memoryview(buf, format, shape):
+    return memoryview(buf).cast('B').cast(format, shape)
+
+
+class _OutOfBandPickler(_ForkingPickler):
+    """Pickler wrapping large bytes, bytearray and memoryview objects
+    in out-of-band buffers."""
+
+    def reducer_override(self, obj):
+        # The pickler doesn't call reducer_override() for bytes and
+        # bytearray objects: _dumps() marks them as _OutOfBandBuffer.
+        if type(obj) is _OutOfBandBuffer:
+            if type(obj.data) is bytes:
+                return bytes, (pickle.PickleBuffer(obj.data),)
+            return _rebuild_bytearray, (pickle.PickleBuffer(obj.data),)
+        if (type(obj) is memoryview and obj.c_contiguous
+                and obj.nbytes >= OUT_OF_BAND_THRESHOLD):
+            try:
+                # Check that the received view can be cast back
+                obj.cast('B').cast(obj.format, obj.shape)
+            except (TypeError, ValueError):
+                return NotImplemented
+            return _rebuild_memoryview, (pickle.PickleBuffer(obj),
+                                         obj.format, obj.shape)
+        return NotImplemented
+
 #
 # Connection classes
 #
 
 class _ConnectionBase:
     _handle = None
+    # If true, send() pickles objects with protocol 5 and sends their large
+    # buffers out-of-band.  Only set by Pipe(), since the other end must
+    # be able to read such messages.
+    _out_of_band = False
 
     def __init__(self, handle, readable=True, writable=True):
         handle = handle.__index__()
@@ -208,7 +285,41 @@ class _ConnectionBase:
         """Send a (picklable) object"""
         self._check_closed()
         self._check_writable()
-        self._send_bytes(_ForkingPickler.dumps(obj))
+        self._send_pickled(*self._dumps(obj))
+
+    def _dumps(self, obj):
+        """
+        Pickle an object for _send_pickled().
+        Return the pickle data and the list of out-of-band buffers.
+        """
+        if not self._out_of_band:
+            return _ForkingPickler.dumps(obj), []
+        buffers = []
+        def buffer_callback(buf):
+            try:
+                m = buf.raw()
+            except BufferError:
+                # Non-contiguous buffers are serialized in-band.
+                return True
+            if m.nbytes < OUT_OF_BAND_THRESHOLD:
+                return True
+            buffers.append(m)
+            return False
+        obj = _mark_buffers(obj, {})
+        return _OutOfBandPickler.dumps(obj, 5, buffer_callback), buffers
+
+    @staticmethod
+    def _loads(data, buffers):
+        """Unpickle an object received by _recv_pickled()"""
+        if buffers:
+            return _ForkingPickler.loads(data, buffers=buffers)
+        return _ForkingPickler.loads(data)
+
+    def _send_pickled(self, data, buffers):
+        if buffers:
+            self._send_buffers(data, buffers)
+        else:
+            self._send_bytes(data)
 
     def recv_bytes(self, maxlength=None):
         """
@@ -238,22 +349,38 @@ class _ConnectionBase:
                 raise ValueError("negative offset")
             elif offset > bytesize:
                 raise ValueError("offset too large")
-            result = self._recv_bytes()
-            size = result.tell()
-            if bytesize < offset + size:
-                raise BufferTooShort(result.getvalue())
-            # Message can fit in dest
-            result.seek(0)
-            result.readinto(m[offset // itemsize :
-                              (offset + size) // itemsize])
+            with m.cast('B') as b:
+                size, message = self._recv_bytes_into(b[offset:bytesize])
+            if message is not None:
+                raise BufferTooShort(message)
             return size
 
+    def _recv_bytes_into(self, buf):
+        """
+        Receive a message into a byte memoryview if it fits.
+        Return its size, and the message if it does not fit.
+        """
+        result = self._recv_bytes()
+        size = result.tell()
+        if len(buf) < size:
+            return size, result.getvalue()
+        # Message can fit in dest
+        result.seek(0)
+        result.readinto(buf[:size])
+        return size, None
+
     def recv(self):
         """Receive a (picklable) object"""
         self._check_closed()
         self._check_readable()
-        buf = self._recv_bytes()
-        return _ForkingPickler.loads(buf.getbuffer())
+        return self._loads(*self._recv_pickled())
+
+    def _recv_pickled(self):
+        """
+        Receive a message sent by _send_pickled().
+        Return the pickle data and the list of out-of-band buffers.
+        """
+        return self._recv_bytes().getbuffer(), []
 
     def poll(self, timeout=0.0):
         """Whether there is any input available to be read"""
@@ -361,11 +488,21 @@ class Connection(_ConnectionBase):
             _close(self._handle)
         _write = _multiprocessing.send
         _read = _multiprocessing.recv
+        # Scatter/gather I/O is not available for sockets: only the first
+        # buffer is read or written.
+        def _readv(handle, buffers, read=_read):
+            chunk = read(handle, len(buffers[0]))
+            buffers[0][:len(chunk)] = chunk
+            return len(chunk)
+        def _writev(handle, buffers, write=_write):
+            return write(handle, buffers[0])
     else:
         def _close(self, _close=os.close):
             _close(self._handle)
         _write = os.write
         _read = os.read
+        _readv = os.readv
+        _writev = os.writev
 
     def _send(self, buf, write=_write):
         remaining = len(buf)
@@ -376,6 +513,40 @@ class Connection(_ConnectionBase):
                 break
             buf = buf[n:]
 
+    def _sendv(self, buffers, writev=_writev):
+        # Write a list of bytes-like objects with one system call, unless
+        # they are partially written.
+        buffers = list(buffers)
+        handle = self._handle
+        i = 0
+        while i < len(buffers):
+            n = writev(handle, buffers[i:i + _IOV_MAX])
+            while i < len(buffers) and n >= len(buffers[i]):
+                n -= len(buffers[i])
+                i += 1
+            if n:
+                buffers[i] = memoryview(buffers[i])[n:]
+
+    def _recv_into(self, buffers, readv=_readv):
+        # Fill a list of writable byte memoryviews.
+        buffers = [buf for buf in buffers if len(buf)]
+        handle = self._handle
+        received = 0
+        i = 0
+        while i < len(buffers):
+            n = readv(handle, buffers[i:i + _IOV_MAX])
+            if n == 0:
+                if received == 0:
+                    raise EOFError
+                else:
+                    raise OSError("got end of file during message")
+            received += n
+            while i < len(buffers) and n >= len(buffers[i]):
+                n -= len(buffers[i])
+                i += 1
+            if n:
+                buffers[i] = buffers[i][n:]
+
     def _recv(self, size, read=_read):
         buf = io.BytesIO()
         handle = self._handle
@@ -395,19 +566,16 @@ class Connection(_ConnectionBase):
     def _send_bytes(self, buf):
         n = len(buf)
         if n > 0x7fffffff:
-            pre_header = struct.pack("!i", -1)
-            header = struct.pack("!Q", n)
-            self._send(pre_header)
-            self._send(header)
-            self._send(buf)
+            header = struct.pack("!iQ", -1, n)
+            self._sendv([header, buf])
         else:
             # For wire compatibility with 3.7 and lower
             header = struct.pack("!i", n)
             if n > 16384:
                 # The payload is large so Nagle's algorithm won't be triggered
-                # and we'd better avoid the cost of concatenation.
-                self._send(header)
-                self._send(buf)
+                # and we'd better avoid the cost of concatenation: write the
+                # header and the payload with a single system call.
+                self._sendv([header, buf])
             else:
                 # Issue #20540: concatenate before sending, to avoid delays due
                 # to Nagle's algorithm on a TCP socket.
@@ -415,16 +583,58 @@ class Connection(_ConnectionBase):
                 # to avoid "broken pipe" errors if the other end closed the pipe.
                 self._send(header + buf)
 
-    def _recv_bytes(self, maxsize=None):
+    def _send_buffers(self, data, buffers):
+        # An out-of-band message: the pickle data and the buffers are
+        # written with a single system call, without concatenating them.
+        count = len(buffers)
+        header = struct.pack("!iQ%dQ" % (count + 1), -2, count, len(data),
+                             *[len(buf) for buf in buffers])
+        self._sendv([header, data] + buffers)
+
+    def _recv_header(self):
+        # Return the size of the next message and, for an out-of-band
+        # message, the sizes of its pickle data and buffers.
         buf = self._recv(4)
         size, = struct.unpack("!i", buf.getvalue())
         if size == -1:
             buf = self._recv(8)
             size, = struct.unpack("!Q", buf.getvalue())
+        elif size == -2:
+            buf = self._recv(8)
+            count, = struct.unpack("!Q", buf.getvalue())
+            buf = self._recv(8 * (count + 1))
+            sizes = struct.unpack("!%dQ" % (count + 1), buf.getvalue())
+            return sum(sizes), sizes
+        return size, None
+
+    def _recv_bytes(self, maxsize=None):
+        size, sizes = self._recv_header()
+        if sizes is not None:
+            # Sent by send(): it is not a bytes message.
+            return None
         if maxsize is not None and size > maxsize:
             return None
         return self._recv(size)
 
+    def _recv_bytes_into(self, buf):
+        size, sizes = self._recv_header()
+        if sizes is not None:
+            self._bad_message_length()
+        if len(buf) < size:
+            return size, self._recv(size).getvalue()
+        # Message can fit in dest: read it in place.
+        self._recv_into([buf[:size]])
+        return size, None
+
+    def _recv_pickled(self):
+        size, sizes = self._recv_header()
+        if sizes is None:
+            return self._recv(size).getbuffer(), []
+        # Read the pickle data and the buffers in place.
+        buffers = [bytearray(n) for n in sizes]
+        self._recv_into([memoryview(buf) for buf in buffers])
+        return buffers[0], buffers[1:]
+
     def _poll(self, timeout):
         r = wait([self], timeout)
         return bool(r)
@@ -533,6 +743,8 @@ if sys.platform != 'win32':
             c1 = Connection(fd1, writable=False)
             c2 = Connection(fd2, readable=False)
 
+        # Both ends are used by this version of Python.
+        c1._out_of_band = c2._out_of_band = True
         return c1, c2
 
 else:
@@ -971,8 +1183,11 @@ if sys.platform == 'win32':
 else:
     def reduce_connection(conn):
         df = reduction.DupFd(conn.fileno())
-        return rebuild_connection, (df, conn.readable, conn.writable)
-    def rebuild_connection(df, readable, writable):
+        return rebuild_connection, (df, conn.readable, conn.writable,
+                                    conn._out_of_band)
+    def rebuild_connection(df, readable, writable, out_of_band=False):
         fd = df.detach()
-        return Connection(fd, readable, writable)
+        conn = Connection(fd, readable, writable)
+        conn._out_of_band = out_of_band
+        return conn
     reduction.register(Connection, reduce_connection)
@@ -184,6 +184,13 @@ class BaseContext(object):
         from .forkserver import set_forkserver_preload
         set_forkserver_preload(module_names)
 
+    def set_forkserver_warm_pool(self, size):
+        '''Set the number of idle children the forkserver process keeps
+        forked, ready to run new processes.
+        '''
+        from .forkserver import set_forkserver_warm_pool
+        set_forkserver_warm_pool(size)
+
     def get_context(self, method=None):
         if method is None:
             return self
@@ -16,7 +16,7 @@ from . import spawn
 from . import util
 
 __all__ = ['ensure_running', 'get_inherited_fds', 'connect_to_new_process',
-           'set_forkserver_preload']
+           'set_forkserver_preload', 'set_forkserver_warm_pool']
 
 #
 #
@@ -38,6 +38,7 @@ class ForkServer(object):
         self._inherited_fds = None
         self._lock = threading.Lock()
         self._preload_modules = ['__main__']
+        self._warm_pool = 0
 
     def _stop(self):
         # Method used by unit tests to stop the server
@@ -65,6 +66,14 @@ class ForkServer(object):
             raise TypeError('module_names must be a list of strings')
         self._preload_modules = modules_names
 
+    def set_forkserver_warm_pool(self, size):
+        '''Set the number of idle children kept forked by the forkserver.'''
+        if not isinstance(size, int):
+            raise TypeError('size must be an integer')
+        if size < 0:
+            raise ValueError('size must be positive or zero')
+        self._warm_pool = size
+
     def get_inherited_fds(self):
         '''Return list of fds inherited from parent process.
 
@@ -127,11 +136,15 @@ class ForkServer(object):
                    'main(%d, %d, %r, **%r)')
 
             if self._preload_modules:
-                desired_keys = {'main_path', 'sys_path'}
                 data = spawn.get_preparation_data('ignore')
-                data = {x: y for x, y in data.items() if x in desired_keys}
+                main_path = data.get('init_main_from_path')
+                data = {'sys_path': data['sys_path']}
+                if main_path is not None:
+                    data['main_path'] = main_path
             else:
                 data = {}
+            if self._warm_pool:
+                data['warm_pool'] = self._warm_pool
 
             with socket.socket(socket.AF_UNIX) as listener:
                 address = connection.arbitrary_address('AF_UNIX')
@@ -164,13 +177,19 @@ class ForkServer(object):
 #
 #
 
-def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
+def main(listener_fd, alive_r, preload, main_path=None, sys_path=None,
+         warm_pool=0):
     '''Run forkserver.'''
     if preload:
         if '__main__' in preload and main_path is not None:
             process.current_process()._inheriting = True
             try:
                 spawn.import_main_path(main_path)
+            except Exception:
+                # Keep serving: the children import the main module
+                # themselves if it is not preloaded
+                sys.excepthook(*sys.exc_info())
+                sys.stderr.flush()
             finally:
                 del process.current_process()._inheriting
         for modname in preload:
@@ -203,6 +222,12 @@ def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
 
     # map child pids to client fds
     pid_to_fd = {}
+    # map the pids of the idle warm children to their sockets
+    warm = {}
+    # the warm pool is refilled while idle, and until the next request
+    # once forking a warm child failed
+    refill = True
+
 
     with socket.socket(socket.AF_UNIX, fileno=listener_fd) as listener, \
          selectors.DefaultSelector() as selector:
@@ -215,13 +240,39 @@ def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
         while True:
             try:
                 while True:
-                    rfds = [key.fileobj for (key, events) in selector.select()]
+                    # Fork the missing warm children one by one while idle,
+                    # so that they do not delay the requests
+                    if refill and len(warm) < warm_pool:
+                        timeout = 0
+                    else:
+                        timeout = None
+                    rfds = [key.fileobj
+                            for (key, events) in selector.select(timeout)]
                     if rfds:
                         break
+                    if refill and len(warm) < warm_pool:
+                        unused_fds = [alive_r, sig_r, sig_w]
+                        unused_fds.extend(pid_to_fd.values())
+                        try:
+                            pid, sock = _fork_warm(listener, selector,
+                                                   unused_fds,
+                                                   list(warm.values()),
+                                                   old_handlers)
+                        except OSError as e:
+                            # No request is waiting for it: retry after
+                            # the next one
+                            warnings.warn('forkserver: failed to fork a '
+                                          'warm child: %s' % e)
+                            refill = False
+                        else:
+                            warm[pid] = sock
 
                 if alive_r in rfds:
                     # EOF because no more client processes left
                     assert os.read(alive_r, 1) == b'', "Not at EOF?"
+                    # Let the idle warm children exit
+                    for sock in warm.values():
+                        sock.close()
                     raise SystemExit
 
                 if sig_r in rfds:
@@ -236,7 +287,11 @@ def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
                         if pid == 0:
                             break
                         child_w = pid_to_fd.pop(pid, None)
-                        if child_w is not None:
+                        sock = warm.pop(pid, None)
+                        if sock is not None:
+                            # An idle warm child died
+                            sock.close()
+                        elif child_w is not None:
                             returncode = os.waitstatus_to_exitcode(sts)
 
                             # Send exit code to client process
@@ -253,6 +308,7 @@ def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
 
                 if listener in rfds:
                     # Incoming fork request
+                    refill = True
                     with listener.accept()[0] as s:
                         # Receive fds from client
                         fds = reduction.recvfds(s, MAXFDS_TO_SEND + 1)
@@ -262,7 +318,17 @@ def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
                                     len(fds)))
                         child_r, child_w, *fds = fds
                         s.close()
-                        pid = os.fork()
+                        sock = None
+                        while warm:
+                            # Use the oldest idle warm child, unless it died
+                            pid = next(iter(warm))
+                            sock = warm.pop(pid)
+                            if os.waitpid(pid, os.WNOHANG)[0] == 0:
+                                break
+                            sock.close()
+                            sock = None
+                        if sock is None:
+                            pid = os.fork()
                         if pid == 0:
                             # Child
                             code = 1
@@ -287,6 +353,16 @@ def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
                                 # client vanished
                                 pass
                             pid_to_fd[pid] = child_w
+                            if sock is not None:
+                                # Hand the fds over to the warm child once
+                                # its pid is sent: it may run at once
+                                try:
+                                    reduction.sendfds(sock, [child_r] + fds)
+                                except OSError:
+                                    # It died, its exit code is sent to the
+                                    # client when it is reaped
+                                    pass
+                                sock.close()
                             os.close(child_r)
                             for fd in fds:
                                 os.close(fd)
@@ -296,6 +372,51 @@ def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
                     raise
 
 
+def _fork_warm(listener, selector, unused_fds, socks, handlers):
+    '''Fork a warm child, which waits for the fds of a fork request.
+
+    Returns the pid of the child and the socket to send the fds to.
+    '''
+    parent_sock, child_sock = socket.socketpair()
+    try:
+        pid = os.fork()
+    except OSError:
+        parent_sock.close()
+        child_sock.close()
+        raise
+    if pid == 0:
+        # Child
+        code = 1
+        try:
+            listener.close()
+            selector.close()
+            parent_sock.close()
+            for sock in socks:
+                sock.close()
+            for fd in unused_fds:
+                os.close(fd)
+            # Stop notifying the forkserver of signals, but keep ignoring
+            # SIGINT while idle
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, handlers[signal.SIGCHLD])
+            try:
+                fds = reduction.recvfds(child_sock, MAXFDS_TO_SEND + 1)
+            except EOFError:
+                # The forkserver exited
+                code = 0
+            else:
+                child_sock.close()
+                child_r, *fds = fds
+                code = _serve_one(child_r, fds, [], handlers)
+        except Exception:
+            sys.excepthook(*sys.exc_info())
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+    child_sock.close()
+    return pid, parent_sock
+
+
 def _serve_one(child_r, fds, unused_fds, handlers):
     # close unnecessary stuff and reset signal handlers
     signal.set_wakeup_fd(-1)
@@ -346,3 +467,4 @@ ensure_running = _forkserver.ensure_running
 get_inherited_fds = _forkserver.get_inherited_fds
 connect_to_new_process = _forkserver.connect_to_new_process
 set_forkserver_preload = _forkserver.set_forkserver_preload
+set_forkserver_warm_pool = _forkserver.set_forkserver_warm_pool
@@ -235,64 +235,19 @@ class Server(object):
 
         recv = conn.recv
         send = conn.send
-        id_to_obj = self.id_to_obj
 
         while not self.stop_event.is_set():
 
             try:
-                methodname = obj = None
                 request = recv()
-                ident, methodname, args, kwds = request
-                try:
-                    obj, exposed, gettypeid = id_to_obj[ident]
-                except KeyError as ke:
-                    try:
-                        obj, exposed, gettypeid = \
-                            self.id_to_local_proxy_obj[ident]
-                    except KeyError:
-                        raise ke
-
-                if methodname not in exposed:
-                    raise AttributeError(
-                        'method %r of %r object is not in exposed=%r' %
-                        (methodname, type(obj), exposed)
-                        )
-
-                function = getattr(obj, methodname)
-
-                try:
-                    res = function(*args, **kwds)
-                except Exception as e:
-                    msg = ('#ERROR', e)
-                else:
-                    typeid = gettypeid and gettypeid.get(methodname, None)
-                    if typeid:
-                        rident, rexposed = self.create(conn, typeid, res)
-                        token = Token(typeid, self.address, rident)
-                        msg = ('#PROXY', (rexposed, token))
-                    else:
-                        msg = ('#RETURN', res)
-
-            except AttributeError:
-                if methodname is None:
-                    msg = ('#TRACEBACK', format_exc())
-                else:
-                    try:
-                        fallback_func = self.fallback_mapping[methodname]
-                        result = fallback_func(
-                            self, conn, ident, obj, *args, **kwds
-                            )
-                        msg = ('#RETURN', result)
-                    except Exception:
-                        msg = ('#TRACEBACK', format_exc())
-
             except EOFError:
                 util.debug('got EOF -- exiting thread serving %r',
                            threading.current_thread().name)
                 sys.exit(0)
-
             except Exception:
                 msg = ('#TRACEBACK', format_exc())
+            else:
+                msg = self.serve_request(conn, request)
 
             try:
                 try:
@@ -307,6 +262,66 @@ class Server(object):
                 conn.close()
                 sys.exit(1)
 
+    def serve_request(self, conn, request):
+        '''
+        Call the method of a shared object requested by a proxy, or the
+        methods of a batch of requests, and return the message to send back
+        '''
+        methodname = obj = None
+        try:
+            ident, methodname, args, kwds = request
+            if ident is None and methodname == '#BATCH':
+                requests, = args
+                return ('#BATCH', [self.serve_request(conn, request)
+                                   for request in requests])
+            try:
+                obj, exposed, gettypeid = self.id_to_obj[ident]
+            except KeyError as ke:
+                try:
+                    obj, exposed, gettypeid = \
+                        self.id_to_local_proxy_obj[ident]
+                except KeyError:
+                    raise ke
+
+            if methodname not in exposed:
+                raise AttributeError(
+                    'method %r of %r object is not in exposed=%r' %
+                    (methodname, type(obj), exposed)
+                    )
+
+            function = getattr(obj, methodname)
+
+            try:
+                res = function(*args, **kwds)
+            except Exception as e:
+                msg = ('#ERROR', e)
+            else:
+                typeid = gettypeid and gettypeid.get(methodname, None)
+                if typeid:
+                    rident, rexposed = self.create(conn, typeid, res)
+                    token = Token(typeid, self.address, rident)
+                    msg = ('#PROXY', (rexposed, token))
+                else:
+                    msg = ('#RETURN', res)
+
+        except AttributeError:
+            if methodname is None:
+                msg = ('#TRACEBACK', format_exc())
+            else:
+                try:
+                    fallback_func = self.fallback_mapping[methodname]
+                    result = fallback_func(
+                        self, conn, ident, obj, *args, **kwds
+                        )
+                    msg = ('#RETURN', result)
+                except Exception:
+                    msg = ('#TRACEBACK', format_exc())
+
+        except Exception:
+            msg = ('#TRACEBACK', format_exc())
+
+        return msg
+
     def fallback_getvalue(self, conn, ident, obj):
         return obj
 
@@ -742,6 +757,9 @@ class BaseProxy(object):
     '''
     _address_to_local = {}
     _mutex = util.ForkAwareThreadLock()
+    # Methods whose calls may be queued by _batch(): their result is not
+    # needed by the caller
+    _batchable_ = ()
 
     def __init__(self, token, serializer, manager=None,
                  authkey=None, exposed=None, incref=True, manager_owned=False):
@@ -793,21 +811,33 @@ class BaseProxy(object):
         dispatch(conn, None, 'accept_connection', (name,))
         self._tls.connection = conn
 
-    def _callmethod(self, methodname, args=(), kwds={}):
-        '''
-        Try to call a method of the referent and return a copy of the result
-        '''
+    def _connection(self):
         try:
-            conn = self._tls.connection
+            return self._tls.connection
         except AttributeError:
             util.debug('thread %r does not own a connection',
                        threading.current_thread().name)
             self._connect()
-            conn = self._tls.connection
+            return self._tls.connection
 
+    def _callmethod(self, methodname, args=(), kwds={}):
+        '''
+        Try to call a method of the referent and return a copy of the result
+        '''
+        batch = getattr(self._tls, 'batch', None)
+        if batch is not None:
+            if methodname in self._batchable_:
+                batch._append(self, (self._id, methodname, args, kwds))
+                return None
+            # The result is needed: make the queued calls first
+            batch._flush()
+
+        conn = self._connection()
         conn.send((self._id, methodname, args, kwds))
         kind, result = conn.recv()
+        return self._convert_result(kind, result)
 
+    def _convert_result(self, kind, result):
         if kind == '#RETURN':
             return result
         elif kind == '#PROXY':
@@ -829,6 +859,14 @@ class BaseProxy(object):
         '''
         return self._callmethod('#GETVALUE')
 
+    def _batch(self, size=1000):
+        '''
+        Return a context manager queueing the calls of the batchable methods
+        made by the current thread through the proxies of the same manager,
+        and sending them in one message every size calls and at exit
+        '''
+        return _Batch(self, size)
+
     def _incref(self):
         if self._owned_by_manager:
             util.debug('owned_by_manager skipped INCREF of %r', self._token.id)
@@ -911,6 +949,64 @@ class BaseProxy(object):
         except Exception:
             return repr(self)[:-1] + "; '__str__()' failed>"
 
+#
+# Batch of method calls returned by `BaseProxy._batch()`
+#
+
+class _Batch(object):
+
+    def __init__(self, proxy, size):
+        if size < 1:
+            raise ValueError('size must be 1+, not {0!r}'.format(size))
+        self._proxy = proxy
+        self._size = size
+        self._proxies = []
+        self._requests = []
+        self._outer = None
+        self.results = []
+
+    def __enter__(self):
+        tls = self._proxy._tls
+        self._outer = getattr(tls, 'batch', None)
+        if self._outer is not None:
+            # Keep the calls in order
+            self._outer._flush()
+        tls.batch = self
+        return self.results
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._proxy._tls.batch = self._outer
+        self._flush()
+
+    def _append(self, proxy, request):
+        self._proxies.append(proxy)
+        self._requests.append(request)
+        if len(self._requests) >= self._size:
+            self._flush()
+
+    def _flush(self):
+        proxies, requests = self._proxies, self._requests
+        if not requests:
+            return
+        self._proxies = []
+        self._requests = []
+        conn = self._proxy._connection()
+        conn.send((None, '#BATCH', (requests,), {}))
+        kind, result = conn.recv()
+        if kind != '#BATCH':
+            raise convert_to_error(kind, result)
+        error = None
+        for proxy, (kind, result) in zip(proxies, result):
+            try:
+                result = proxy._convert_result(kind, result)
+            except Exception as e:
+                result = e
+                if error is None:
+                    error = e
+            self.results.append(result)
+        if error is not None:
+            raise error
+
 #
 # Function used for unpickling
 #
@@ -1105,6 +1201,7 @@ class BarrierProxy(BaseProxy):
 
 class NamespaceProxy(BaseProxy):
     _exposed_ = ('__getattribute__', '__setattr__', '__delattr__')
+    _batchable_ = ('__setattr__', '__delattr__')
     def __getattr__(self, key):
         if key[0] == '_':
             return object.__getattribute__(self, key)
@@ -1124,6 +1221,7 @@ class NamespaceProxy(BaseProxy):
 
 class ValueProxy(BaseProxy):
     _exposed_ = ('get', 'set')
+    _batchable_ = ('set',)
     def get(self):
         return self._callmethod('get')
     def set(self, value):
@@ -1140,6 +1238,8 @@ BaseListProxy = MakeProxyType('BaseListProxy', (
     'reverse', 'sort', '__imul__'
     ))
 class ListProxy(BaseListProxy):
+    _batchable_ = ('__delitem__', '__setitem__', 'append', 'extend',
+                   'insert', 'remove', 'reverse', 'sort', '__imul__')
     def __iadd__(self, value):
         self._callmethod('extend', (value,))
         return self
@@ -1148,11 +1248,16 @@ class ListProxy(BaseListProxy):
         return self
 
 
-DictProxy = MakeProxyType('DictProxy', (
+BaseDictProxy = MakeProxyType('BaseDictProxy', (
     '__contains__', '__delitem__', '__getitem__', '__iter__', '__len__',
     '__setitem__', 'clear', 'copy', 'get', 'items',
     'keys', 'pop', 'popitem', 'setdefault', 'update', 'values'
     ))
+class DictProxy(BaseDictProxy):
+    _batchable_ = ('__delitem__', '__setitem__', 'clear', 'update')
+    def __ior__(self, value):
+        self._callmethod('update', (value,))
+        return self
 DictProxy._method_to_typeid_ = {
     '__iter__': 'Iterator',
     }
@@ -1161,6 +1266,7 @@ DictProxy._method_to_typeid_ = {
 ArrayProxy = MakeProxyType('ArrayProxy', (
     '__len__', '__getitem__', '__setitem__'
     ))
+ArrayProxy._batchable_ = ('__setitem__',)
 
 
 BasePoolProxy = MakeProxyType('PoolProxy', (
@@ -1367,3 +1473,17 @@ if HAS_SHMEM:
                     sl.shm.unlink()
                     raise e
             return sl
+
+        def SharedArray(self, typecode, initializer=()):
+            """Returns a new SharedArray instance of the given typecode
+            populated with the values from initializer, or of the given
+            length if initializer is an integer, to be tracked by the
+            manager."""
+            with self._Client(self._address, authkey=self._authkey) as conn:
+                sa = shared_memory.SharedArray(typecode, initializer)
+                try:
+                    dispatch(conn, None, 'track_segment', (sa.shm.name,))
+                except BaseException as e:
+                    sa.shm.unlink()
+                    raise e
+            return sa
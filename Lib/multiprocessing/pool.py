@@ -391,18 +391,36 @@ class Pool(object):
         except Exception as e:
             yield (result_job, i+1, _helper_reraises_exception, (e,), {})
 
-    def imap(self, func, iterable, chunksize=1):
+    def _submit_tasks(self, result, tasks, buffersize):
+        '''Submits the tasks of imap and imap_unordered: all at once, or at
+        most buffersize at a time if buffersize is not None.'''
+        if buffersize is None:
+            self._taskqueue.put((tasks, result._set_length))
+        else:
+            result._set_tasks(tasks, self._taskqueue, buffersize)
+
+    @staticmethod
+    def _check_buffersize(buffersize):
+        if buffersize is not None:
+            if not isinstance(buffersize, int):
+                raise TypeError("buffersize must be an integer or None")
+            if buffersize < 1:
+                raise ValueError(
+                    "buffersize must be None or 1+, not {0!r}".format(
+                        buffersize))
+
+    def imap(self, func, iterable, chunksize=1, buffersize=None):
         '''
         Equivalent of `map()` -- can be MUCH slower than `Pool.map()`.
         '''
         self._check_running()
+        self._check_buffersize(buffersize)
         if chunksize == 1:
             result = IMapIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job, func, iterable),
-                    result._set_length
-                ))
+            self._submit_tasks(
+                result,
+                self._guarded_task_generation(result._job, func, iterable),
+                buffersize)
             return result
         else:
             if chunksize < 1:
@@ -411,27 +429,26 @@ class Pool(object):
                         chunksize))
             task_batches = Pool._get_tasks(func, iterable, chunksize)
             result = IMapIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job,
-                                                  mapstar,
-                                                  task_batches),
-                    result._set_length
-                ))
+            self._submit_tasks(
+                result,
+                self._guarded_task_generation(result._job,
+                                              mapstar,
+                                              task_batches),
+                buffersize)
             return (item for chunk in result for item in chunk)
 
-    def imap_unordered(self, func, iterable, chunksize=1):
+    def imap_unordered(self, func, iterable, chunksize=1, buffersize=None):
         '''
         Like `imap()` method but ordering of results is arbitrary.
         '''
         self._check_running()
+        self._check_buffersize(buffersize)
         if chunksize == 1:
             result = IMapUnorderedIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job, func, iterable),
-                    result._set_length
-                ))
+            self._submit_tasks(
+                result,
+                self._guarded_task_generation(result._job, func, iterable),
+                buffersize)
             return result
         else:
             if chunksize < 1:
@@ -439,13 +456,12 @@ class Pool(object):
                     "Chunksize must be 1+, not {0!r}".format(chunksize))
             task_batches = Pool._get_tasks(func, iterable, chunksize)
             result = IMapUnorderedIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job,
-                                                  mapstar,
-                                                  task_batches),
-                    result._set_length
-                ))
+            self._submit_tasks(
+                result,
+                self._guarded_task_generation(result._job,
+                                              mapstar,
+                                              task_batches),
+                buffersize)
             return (item for chunk in result for item in chunk)
 
     def apply_async(self, func, args=(), kwds={}, callback=None,
@@ -843,11 +859,34 @@ class IMapIterator(object):
         self._index = 0
         self._length = None
         self._unsorted = {}
+        self._tasks = None
         self._cache[self._job] = self
 
     def __iter__(self):
         return self
 
+    def _set_tasks(self, tasks, taskqueue, buffersize):
+        # Submit the tasks lazily: buffersize tasks now, then one more each
+        # time a result is returned by next().
+        self._tasks = tasks
+        self._taskqueue = taskqueue
+        self._submitted = 0
+        self._tasks_lock = threading.Lock()
+        self._submit(buffersize)
+
+    def _submit(self, count):
+        with self._tasks_lock:
+            if self._tasks is None:
+                return
+            batch = list(itertools.islice(self._tasks, count))
+            if batch:
+                self._taskqueue.put((batch, None))
+                self._submitted += len(batch)
+            if len(batch) < count:
+                # All the tasks are submitted.
+                self._tasks = None
+                self._set_length(self._submitted)
+
     def next(self, timeout=None):
         with self._cond:
             try:
@@ -865,6 +904,8 @@ class IMapIterator(object):
                         raise StopIteration from None
                     raise TimeoutError from None
 
+        if self._tasks is not None:
+            self._submit(1)
         success, value = item
         if success:
             return value
@@ -79,8 +79,9 @@ class Queue(object):
         self._joincancelled = False
         self._closed = False
         self._close = None
-        self._send_bytes = self._writer.send_bytes
-        self._recv_bytes = self._reader.recv_bytes
+        self._dumps = self._writer._dumps
+        self._send_pickled = self._writer._send_pickled
+        self._recv_pickled = self._reader._recv_pickled
         self._poll = self._reader.poll
 
     def put(self, obj, block=True, timeout=None):
@@ -100,7 +101,7 @@ class Queue(object):
             raise ValueError(f"Queue {self!r} is closed")
         if block and timeout is None:
             with self._rlock:
-                res = self._recv_bytes()
+                res = self._recv_pickled()
             self._sem.release()
         else:
             if block:
@@ -114,12 +115,12 @@ class Queue(object):
                         raise Empty
                 elif not self._poll():
                     raise Empty
-                res = self._recv_bytes()
+                res = self._recv_pickled()
                 self._sem.release()
             finally:
                 self._rlock.release()
         # unserialize the data after having released the lock
-        return _ForkingPickler.loads(res)
+        return self._reader._loads(*res)
 
     def qsize(self):
         # Raises NotImplementedError on Mac OSX because of broken sem_getvalue()
@@ -168,9 +169,10 @@ class Queue(object):
         self._buffer.clear()
         self._thread = threading.Thread(
             target=Queue._feed,
-            args=(self._buffer, self._notempty, self._send_bytes,
-                  self._wlock, self._writer.close, self._ignore_epipe,
-                  self._on_queue_feeder_error, self._sem),
+            args=(self._buffer, self._notempty, self._dumps,
+                  self._send_pickled, self._wlock, self._writer.close,
+                  self._ignore_epipe, self._on_queue_feeder_error,
+                  self._sem),
             name='QueueFeederThread'
         )
         self._thread.daemon = True
@@ -211,8 +213,8 @@ class Queue(object):
             notempty.notify()
 
     @staticmethod
-    def _feed(buffer, notempty, send_bytes, writelock, close, ignore_epipe,
-              onerror, queue_sem):
+    def _feed(buffer, notempty, dumps, send_pickled, writelock, close,
+              ignore_epipe, onerror, queue_sem):
         debug('starting thread to feed data to pipe')
         nacquire = notempty.acquire
         nrelease = notempty.release
@@ -242,15 +244,18 @@ class Queue(object):
                             return
 
                         # serialize the data before acquiring the lock
-                        obj = _ForkingPickler.dumps(obj)
+                        data, buffers = dumps(obj)
                         if wacquire is None:
-                            send_bytes(obj)
+                            send_pickled(data, buffers)
                         else:
                             wacquire()
                             try:
-                                send_bytes(obj)
+                                send_pickled(data, buffers)
                             finally:
                                 wrelease()
+                        # Don't keep the object alive while waiting for
+                        # the next one.
+                        del obj, data, buffers
                 except IndexError:
                     pass
             except Exception as e:
@@ -359,18 +364,18 @@ class SimpleQueue(object):
 
     def get(self):
         with self._rlock:
-            res = self._reader.recv_bytes()
+            res = self._reader._recv_pickled()
         # unserialize the data after having released the lock
-        return _ForkingPickler.loads(res)
+        return self._reader._loads(*res)
 
     def put(self, obj):
         # serialize the data before acquiring the lock
-        obj = _ForkingPickler.dumps(obj)
+        data, buffers = self._writer._dumps(obj)
         if self._wlock is None:
             # writes to a message oriented win32 pipe are atomic
-            self._writer.send_bytes(obj)
+            self._writer._send_pickled(data, buffers)
         else:
             with self._wlock:
-                self._writer.send_bytes(obj)
+                self._writer._send_pickled(data, buffers)
 
     __class_getitem__ = classmethod(types.GenericAlias)
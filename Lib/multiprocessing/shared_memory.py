@@ -5,15 +5,18 @@ documentation for details.
 """
 
 
-__all__ = [ 'SharedMemory', 'ShareableList' ]
+__all__ = [ 'SharedMemory', 'ShareableList', 'SharedArray', 'ShareableQueue' ]
 
 
 from functools import partial
+import array
 import mmap
 import os
 import errno
+import queue
 import struct
 import secrets
+import time
 import types
 
 if os.name == "nt":
@@ -242,6 +245,9 @@ class SharedMemory:
 
 _encoding = "utf8"
 
+# Let the other processes run, notably the other end of a ShareableQueue.
+_yield = getattr(os, 'sched_yield', partial(time.sleep, 0))
+
 class ShareableList:
     """Pattern for a mutable list-like object shareable via a shared
     memory block.  It differs from the built-in list type in that these
@@ -511,3 +517,372 @@ class ShareableList:
             raise ValueError(f"{value!r} not in this container")
 
     __class_getitem__ = classmethod(types.GenericAlias)
+
+
+class SharedArray:
+    """A fixed-length array of numeric values, like array.array, stored
+    in a shared memory block.
+
+    The values are stored contiguously as machine values of the type given
+    by typecode (any typecode of array.array but 'u').  The buf attribute
+    is a writable memoryview of the values, cast to typecode, through which
+    they are read and written without copying.  Indexing and slicing the
+    array return values and array.array objects respectively; assigning a
+    slice copies all of its values at once."""
+
+    # Header: the length and the typecode.  The values start on a 16 bytes
+    # boundary.
+    _header = struct.Struct("q8s")
+    _offset_data_start = 16
+    _buf = None
+
+    def __init__(self, typecode=None, initializer=(), *, name=None):
+        if name is not None and typecode is None:
+            self.shm = SharedMemory(name)
+            length, code = self._header.unpack_from(self.shm.buf, 0)
+            typecode = code.rstrip(b'\x00').decode(_encoding)
+        else:
+            if typecode not in array.typecodes or typecode == 'u':
+                raise ValueError(f"bad typecode {typecode!r} (must be one "
+                                 f"of {array.typecodes.replace('u', '')})")
+            itemsize = struct.calcsize(typecode)
+            values = None
+            if isinstance(initializer, int):
+                if initializer < 0:
+                    raise ValueError("negative array length")
+                length = initializer
+            else:
+                if not (isinstance(initializer, (bytes, bytearray, memoryview))
+                        or isinstance(initializer, array.array) and
+                        initializer.typecode == typecode):
+                    initializer = array.array(typecode, initializer)
+                values = memoryview(initializer).cast('B')
+                if len(values) % itemsize:
+                    raise ValueError("bytes length not a multiple of item "
+                                     "size")
+                length = len(values) // itemsize
+            # Some platforms require a size > 0.
+            size = self._offset_data_start + max(length * itemsize, 1)
+            self.shm = SharedMemory(name, create=True, size=size)
+            self._header.pack_into(self.shm.buf, 0, length,
+                                   typecode.encode(_encoding))
+            if values is not None:
+                start = self._offset_data_start
+                self.shm.buf[start:start + len(values)] = values
+        self._typecode = typecode
+        self._length = length
+        start = self._offset_data_start
+        self._buf = self.shm.buf[start:start + length *
+                                 struct.calcsize(typecode)].cast(typecode)
+
+    def __del__(self):
+        # Release the memoryview before the shared memory block is closed.
+        if self._buf is not None:
+            self._buf.release()
+
+    def __reduce__(self):
+        return partial(self.__class__, name=self.shm.name), ()
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}({self._typecode!r}, '
+                f'{self._buf.tolist()}, name={self.shm.name!r})')
+
+    @property
+    def buf(self):
+        "A memoryview of the values, cast to the typecode of the array."
+        return self._buf
+
+    @property
+    def typecode(self):
+        "The typecode of the array."
+        return self._typecode
+
+    @property
+    def itemsize(self):
+        "The length in bytes of one value."
+        return self._buf.itemsize
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            result = array.array(self._typecode)
+            with self._buf[index] as values:
+                result.frombytes(values.cast('B') if values.contiguous
+                                 else values.tobytes())
+            return result
+        return self._buf[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice) and not (
+                isinstance(value, memoryview) or
+                isinstance(value, array.array) and
+                value.typecode == self._typecode):
+            value = array.array(self._typecode, value)
+        self._buf[index] = value
+
+    def __iter__(self):
+        return iter(self._buf)
+
+    def tolist(self):
+        "Return the values of the array as a list."
+        return self._buf.tolist()
+
+    def tobytes(self):
+        "Return the machine values of the array as bytes."
+        return self._buf.tobytes()
+
+    def close(self):
+        """Close access to the shared memory block of the array.
+
+        The memoryviews derived from buf must be released first."""
+        self._buf.release()
+        self.shm.close()
+
+    def unlink(self):
+        "Request the destruction of the shared memory block of the array."
+        self.shm.unlink()
+
+    __class_getitem__ = classmethod(types.GenericAlias)
+
+
+class ShareableQueue:
+    """A bounded FIFO queue of messages stored in a ring buffer in a shared
+    memory block.
+
+    Messages are bytes-like objects, returned as bytes by get(), or, if a
+    struct format is given, records packed with that format and returned
+    as tuples.  Unlike multiprocessing.Queue, no feeder thread nor pipe is
+    involved: put() copies the message into the shared memory block and
+    get() copies it out.
+
+    The positions of the ring buffer are read and written while holding a
+    lock, so that any number of processes can put and get messages.  The
+    lock must be given to attach to an existing queue by name.  The default
+    multiprocessing.Lock() can only be shared by inheritance: a lock which
+    can be pickled, such as a SyncManager().Lock() proxy, lets the queue be
+    sent through a Queue or a Pool, or attached to by unrelated processes.
+    Blocking calls poll the positions, yielding the CPU and then sleeping a
+    little longer on each attempt."""
+
+    # Header: the capacity and the format on the first cache line, the
+    # read position and the number of messages read on the second, the
+    # write position and the number of messages written on the third.
+    # The positions are byte counts which only increase.
+    _header = struct.Struct("q56s")
+    _counters = struct.Struct("QQ")
+    _offset_read = 64
+    _offset_write = 128
+    _offset_data_start = 192
+    _length = struct.Struct("I")
+
+    # Polling: yield the CPU _spins times, then sleep from _min_delay to
+    # _max_delay seconds, doubling the delay on each attempt.
+    _spins = 20
+    _min_delay = 5e-5
+    _max_delay = 1e-3
+
+    def __init__(self, capacity=None, *, name=None, format=None, lock=None):
+        if name is not None and capacity is None:
+            if lock is None:
+                raise ValueError("'lock' is required to attach to a queue")
+            self.shm = SharedMemory(name)
+            capacity, fmt = self._header.unpack_from(self.shm.buf, 0)
+            format = fmt.rstrip(b'\x00').decode(_encoding) or None
+        else:
+            if capacity is None or capacity <= 0:
+                raise ValueError("'capacity' must be a positive integer")
+            fmt = b''
+            if format is not None:
+                record_size = struct.calcsize(format)
+                capacity -= capacity % record_size
+                if capacity == 0:
+                    raise ValueError("'capacity' is smaller than a record")
+                fmt = format.encode(_encoding)
+                if len(fmt) > 56:
+                    raise ValueError("'format' is too long")
+            self.shm = SharedMemory(name, create=True,
+                                    size=self._offset_data_start + capacity)
+            self._header.pack_into(self.shm.buf, 0, capacity, fmt)
+            if lock is None:
+                from . import context
+                lock = context._default_context.Lock()
+        self._capacity = capacity
+        self._format = format
+        self._struct = None if format is None else struct.Struct(format)
+        self._lock = lock
+
+    def __reduce__(self):
+        return partial(self.__class__, name=self.shm.name, lock=self._lock), ()
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}({self._capacity}, '
+                f'name={self.shm.name!r}, format={self._format!r})')
+
+    @property
+    def capacity(self):
+        "Size in bytes of the ring buffer."
+        return self._capacity
+
+    @property
+    def format(self):
+        "The struct format of the records, or None for byte messages."
+        return self._format
+
+    def _pause(self, attempt, deadline):
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        if attempt < self._spins:
+            _yield()
+        else:
+            time.sleep(min(self._min_delay * 2 ** min(attempt - self._spins,
+                                                      16),
+                           self._max_delay))
+        return True
+
+    def _acquire(self, block, deadline):
+        if not block:
+            return self._lock.acquire(False)
+        if deadline is None:
+            return self._lock.acquire()
+        return self._lock.acquire(True, max(deadline - time.monotonic(), 0))
+
+    def _write(self, buf, position, data):
+        # Copy data at the given position, wrapping around the end of the
+        # ring buffer.
+        start = position % self._capacity
+        first = min(len(data), self._capacity - start)
+        offset = self._offset_data_start
+        buf[offset + start:offset + start + first] = data[:first]
+        if first < len(data):
+            buf[offset:offset + len(data) - first] = data[first:]
+
+    def _read(self, buf, position, size):
+        start = position % self._capacity
+        first = min(size, self._capacity - start)
+        offset = self._offset_data_start
+        data = bytes(buf[offset + start:offset + start + first])
+        if first < size:
+            data += buf[offset:offset + size - first]
+        return data
+
+    def put(self, obj, block=True, timeout=None):
+        """Put a message into the queue.
+
+        If block is true and timeout is None, wait until there is room in
+        the ring buffer.  Otherwise, raise queue.Full if there is no room
+        before timeout seconds, or immediately if block is false."""
+        if self._struct is None:
+            data = memoryview(obj).cast('B')
+            size = self._length.size + len(data)
+        else:
+            size = self._struct.size
+        if size > self._capacity:
+            raise ValueError("message larger than the queue capacity")
+        deadline = None
+        if block and timeout is not None:
+            deadline = time.monotonic() + timeout
+        buf = self.shm.buf
+        attempt = 0
+        while True:
+            if not self._acquire(block, deadline):
+                raise queue.Full
+            try:
+                write, puts = self._counters.unpack_from(buf,
+                                                         self._offset_write)
+                read = self._counters.unpack_from(buf, self._offset_read)[0]
+                if write + size - read <= self._capacity:
+                    if self._struct is None:
+                        self._write(buf, write, self._length.pack(len(data)))
+                        self._write(buf, write + self._length.size, data)
+                    else:
+                        # The capacity is a multiple of the record size:
+                        # records do not wrap around.
+                        self._struct.pack_into(
+                            buf,
+                            self._offset_data_start + write % self._capacity,
+                            *obj)
+                    self._counters.pack_into(buf, self._offset_write,
+                                             write + size, puts + 1)
+                    return
+            finally:
+                self._lock.release()
+            # Wait for room without holding the lock.
+            if not block or not self._pause(attempt, deadline):
+                raise queue.Full
+            attempt += 1
+
+    def put_nowait(self, obj):
+        """Put a message into the queue without blocking.
+
+        Raise queue.Full if there is no room in the ring buffer."""
+        return self.put(obj, False)
+
+    def get(self, block=True, timeout=None):
+        """Remove and return a message from the queue.
+
+        If block is true and timeout is None, wait until a message is
+        available.  Otherwise, raise queue.Empty if no message is available
+        before timeout seconds, or immediately if block is false."""
+        deadline = None
+        if block and timeout is not None:
+            deadline = time.monotonic() + timeout
+        buf = self.shm.buf
+        attempt = 0
+        while True:
+            if not self._acquire(block, deadline):
+                raise queue.Empty
+            try:
+                read, gets = self._counters.unpack_from(buf,
+                                                        self._offset_read)
+                write = self._counters.unpack_from(buf, self._offset_write)[0]
+                if write != read:
+                    if self._struct is None:
+                        size, = self._length.unpack(
+                            self._read(buf, read, self._length.size))
+                        obj = self._read(buf, read + self._length.size, size)
+                        size += self._length.size
+                    else:
+                        obj = self._struct.unpack_from(
+                            buf,
+                            self._offset_data_start + read % self._capacity)
+                        size = self._struct.size
+                    self._counters.pack_into(buf, self._offset_read,
+                                             read + size, gets + 1)
+                    return obj
+            finally:
+                self._lock.release()
+            # Wait for a message without holding the lock.
+            if not block or not self._pause(attempt, deadline):
+                raise queue.Empty
+            attempt += 1
+
+    def get_nowait(self):
+        """Remove and return a message from the queue without blocking.
+
+        Raise queue.Empty if no message is available."""
+        return self.get(False)
+
+    def qsize(self):
+        "Return the approximate number of messages in the queue."
+        with self._lock:
+            gets = self._counters.unpack_from(self.shm.buf,
+                                              self._offset_read)[1]
+            puts = self._counters.unpack_from(self.shm.buf,
+                                              self._offset_write)[1]
+        return puts - gets
+
+    def empty(self):
+        "Return True if the queue is empty (not reliable)."
+        return self.qsize() == 0
+
+    def close(self):
+        "Close access to the shared memory block of the queue."
+        self.shm.close()
+
+    def unlink(self):
+        "Request the destruction of the shared memory block of the queue."
+        self.shm.unlink()
+
+    __class_getitem__ = classmethod(types.GenericAlias)
@@ -348,13 +348,17 @@ class _PollLikeSelector(_BaseSelectorImpl):
         super().__init__()
         self._selector = self._selector_cls()
 
-    def register(self, fileobj, events, data=None):
-        key = super().register(fileobj, events, data)
+    def _poller_events(self, fd, events):
         poller_events = 0
         if events & EVENT_READ:
             poller_events |= self._EVENT_READ
         if events & EVENT_WRITE:
             poller_events |= self._EVENT_WRITE
+        return poller_events
+
+    def register(self, fileobj, events, data=None):
+        key = super().register(fileobj, events, data)
+        poller_events = self._poller_events(key.fd, events)
         try:
             self._selector.register(key.fd, poller_events)
         except:
@@ -380,11 +384,7 @@ class _PollLikeSelector(_BaseSelectorImpl):
 
         changed = False
         if events != key.events:
-            selector_events = 0
-            if events & EVENT_READ:
-                selector_events |= self._EVENT_READ
-            if events & EVENT_WRITE:
-                selector_events |= self._EVENT_WRITE
+            selector_events = self._poller_events(key.fd, events)
             try:
                 self._selector.modify(key.fd, selector_events)
             except:
@@ -445,9 +445,60 @@ if hasattr(select, 'epoll'):
         _EVENT_READ = select.EPOLLIN
         _EVENT_WRITE = select.EPOLLOUT
 
+        def __init__(self):
+            super().__init__()
+            # File descriptors registered in edge-triggered mode.
+            self._edge_triggered = set()
+
         def fileno(self):
             return self._selector.fileno()
 
+        def _poller_events(self, fd, events):
+            poller_events = super()._poller_events(fd, events)
+            if fd in self._edge_triggered:
+                poller_events |= select.EPOLLET
+            return poller_events
+
+        def register(self, fileobj, events, data=None, *,
+                     edge_triggered=False):
+            """Register a file object.
+
+            If *edge_triggered* is true, the file object is registered in
+            edge-triggered mode: select() reports it when it becomes
+            ready, rather than as long as it is ready.  The mode is kept
+            by modify() until the file object is unregistered; modify()
+            always re-arms the file object, even if its events are
+            unchanged.
+            """
+            if not edge_triggered:
+                return super().register(fileobj, events, data)
+            fd = self._fileobj_lookup(fileobj)
+            if fd in self._fd_to_key:
+                raise KeyError(f"{fileobj!r} (FD {fd}) is already registered")
+            self._edge_triggered.add(fd)
+            try:
+                return super().register(fileobj, events, data)
+            except:
+                self._edge_triggered.discard(fd)
+                raise
+
+        def modify(self, fileobj, events, data=None):
+            try:
+                key = self._fd_to_key[self._fileobj_lookup(fileobj)]
+            except KeyError:
+                raise KeyError(f"{fileobj!r} is not registered") from None
+            if key.fd in self._edge_triggered and events == key.events:
+                # Re-arm the file descriptor, so that it is reported again
+                # if it is ready: the caller may wait for a new event.
+                self._selector.modify(key.fd,
+                                      self._poller_events(key.fd, events))
+            return super().modify(fileobj, events, data)
+
+        def unregister(self, fileobj):
+            key = super().unregister(fileobj)
+            self._edge_triggered.discard(key.fd)
+            return key
+
         def select(self, timeout=None):
             if timeout is None:
                 timeout = -1
@@ -482,6 +533,7 @@ if hasattr(select, 'epoll'):
 
         def close(self):
             self._selector.close()
+            self._edge_triggered.clear()
             super().close()
 
 
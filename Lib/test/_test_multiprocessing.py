@@ -1211,6 +1211,24 @@ class _TestQueue(BaseTestCase):
         self.assertTrue(not_serializable_obj.reduce_was_called)
         self.assertTrue(not_serializable_obj.on_queue_feeder_error_was_called)
 
+    def test_out_of_band_buffers(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        size = multiprocessing.connection.OUT_OF_BAND_THRESHOLD
+        obj = [ZeroCopyBuffer(bytearray(b'x' * size)),
+               ZeroCopyBuffer(bytearray(b'y' * (size - 1))), 'text']
+        for q in (self.Queue(), multiprocessing.SimpleQueue()):
+            q.put(obj)
+            q.put(True)
+            res = q.get()
+            self.assertEqual(res[0].data, obj[0].data)
+            self.assertEqual(res[1].data, obj[1].data)
+            self.assertEqual(res[2], 'text')
+            self.assertIs(q.get(), True)
+            if isinstance(q, multiprocessing.queues.Queue):
+                close_queue(q)
+
     def test_closed_queue_put_get_exceptions(self):
         for q in multiprocessing.Queue(), multiprocessing.JoinableQueue():
             q.close()
@@ -2280,6 +2298,67 @@ class _TestContainers(BaseTestCase):
         self.assertIsInstance(outer[0], list)  # Not a ListProxy
         self.assertEqual(outer[-1][-1]['feed'], 3)
 
+    def test_dict_ior(self):
+        d = self.dict(a=1)
+        d |= {'b': 2}
+        self.assertIsInstance(d, type(self.dict()))
+        self.assertEqual(sorted(d.items()), [('a', 1), ('b', 2)])
+
+    def test_batch(self):
+        d = self.dict()
+        l = self.list()
+        with d._batch(size=3) as results:
+            for i in range(10):
+                d[i] = i * i
+            self.assertEqual(len(results), 9)
+            # Calls through other proxies of the manager are batched too
+            l.append(1)
+            l.extend([2, 3])
+            self.assertEqual(len(results), 12)
+            l += [4]
+            # Calls returning a value send the queued calls first
+            self.assertEqual(d.get(9), 81)
+            self.assertIn(9, d)
+            self.assertEqual(len(d), 10)
+            self.assertEqual(len(results), 13)
+            with l._batch() as inner:
+                l.append(5)
+                self.assertEqual(l[-1], 5)
+                l.append(6)
+            self.assertEqual(len(l), 6)
+        self.assertEqual(results, [None] * 13)
+        self.assertEqual(inner, [None, None])
+        self.assertEqual(d.copy(), {i: i * i for i in range(10)})
+        self.assertEqual(l[:], [1, 2, 3, 4, 5, 6])
+
+        # A failed call does not stop the following ones
+        with self.assertRaises(KeyError):
+            with d._batch() as results:
+                del d['missing']
+                d[20] = 400
+                del d['missing2']
+        self.assertEqual(len(results), 3)
+        self.assertIsInstance(results[0], KeyError)
+        self.assertIsNone(results[1])
+        self.assertIsInstance(results[2], KeyError)
+        self.assertEqual(d[20], 400)
+
+        n = self.Namespace()
+        v = self.Value('i', 0)
+        e = self.Event()
+        with n._batch() as results:
+            n.x = 1
+            v.value = 2
+            self.assertEqual(n.x, 1)
+            self.assertEqual(v.value, 2)
+            # Other proxy types are not batched
+            e.set()
+            self.assertEqual(len(results), 2)
+        self.assertEqual(results, [None, None])
+        self.assertTrue(e.is_set())
+
+        self.assertRaises(ValueError, d._batch, 0)
+
     def test_namespace(self):
         n = self.Namespace()
         n.name = 'Bob'
@@ -2480,6 +2559,64 @@ class _TestPool(BaseTestCase):
             self.assertEqual(next(it), i*i)
         self.assertRaises(SayWhenError, it.__next__)
 
+    def test_imap_buffersize(self):
+        if self.TYPE == 'manager':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        consumed = []
+        def counting_generator():
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+
+        # The iterable is consumed as the results are returned: at most
+        # buffersize tasks are submitted ahead.
+        it = self.pool.imap(sqr, counting_generator(), buffersize=4)
+        for i in range(10):
+            self.assertEqual(next(it), i*i)
+        self.assertEqual(len(consumed), 14)
+
+        # With chunksize, buffersize is a number of chunks.
+        consumed.clear()
+        it = self.pool.imap(sqr, counting_generator(), chunksize=3,
+                            buffersize=2)
+        for i in range(10):
+            self.assertEqual(next(it), i*i)
+        self.assertEqual(len(consumed), 18)
+
+        consumed.clear()
+        it = self.pool.imap_unordered(sqr, counting_generator(),
+                                      buffersize=3)
+        results = {next(it) for i in range(10)}
+        self.assertEqual(len(results), 10)
+        self.assertLessEqual(results, {i*i for i in range(13)})
+        self.assertEqual(len(consumed), 13)
+
+        for chunksize in (1, 3):
+            for buffersize in (1, 5, 100):
+                with self.subTest(chunksize=chunksize, buffersize=buffersize):
+                    it = self.pool.imap(sqr, range(20), chunksize,
+                                        buffersize=buffersize)
+                    self.assertEqual(list(it), list(map(sqr, range(20))))
+                    it = self.pool.imap_unordered(sqr, range(20), chunksize,
+                                                  buffersize=buffersize)
+                    self.assertEqual(sorted(it), list(map(sqr, range(20))))
+        self.assertEqual(list(self.pool.imap(sqr, [], buffersize=2)), [])
+        it = self.pool.imap(sqr, range(5), buffersize=2)
+        self.assertEqual(next(it), 0)
+        self.assertEqual(it.next(timeout=support.SHORT_TIMEOUT), 1)
+
+        it = self.pool.imap(sqr, exception_throwing_generator(10, 3), 1,
+                            buffersize=2)
+        for i in range(3):
+            self.assertEqual(next(it), i*i)
+        self.assertRaises(SayWhenError, it.__next__)
+
+        with self.assertRaises(ValueError):
+            self.pool.imap(sqr, range(5), buffersize=0)
+        with self.assertRaises(TypeError):
+            self.pool.imap_unordered(sqr, range(5), buffersize=1.0)
+
     def test_imap_unordered(self):
         it = self.pool.imap_unordered(sqr, list(range(10)))
         self.assertEqual(sorted(it), list(map(sqr, list(range(10)))))
@@ -3006,6 +3143,18 @@ class _TestManagerRestart(BaseTestCase):
 
 SENTINEL = latin('')
 
+class ZeroCopyBuffer(object):
+    """Object pickled with an out-of-band buffer with protocol 5."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            return type(self), (pickle.PickleBuffer(self.data),)
+        return type(self), (bytes(self.data),)
+
+
 class _TestConnection(BaseTestCase):
 
     ALLOWED_TYPES = ('processes', 'threads')
@@ -3161,6 +3310,117 @@ class _TestConnection(BaseTestCase):
 
         self.assertRaises(ValueError, a.send_bytes, msg, 4, -1)
 
+    def test_recv_bytes_into_large(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        a, b = self.Pipe()
+        msg = os.urandom(100000)
+        buffer = bytearray(len(msg) + 10)
+        a.send_bytes(msg)
+        self.assertEqual(b.recv_bytes_into(buffer, 10), len(msg))
+        self.assertEqual(buffer[:10], bytes(10))
+        self.assertEqual(buffer[10:], msg)
+
+        a.send_bytes(msg)
+        with self.assertRaises(multiprocessing.BufferTooShort) as cm:
+            b.recv_bytes_into(buffer, 11)
+        self.assertEqual(cm.exception.args, (msg,))
+
+    @classmethod
+    def _echo_objects(cls, conn):
+        for obj in iter(conn.recv, None):
+            conn.send(obj)
+        conn.close()
+
+    def test_send_out_of_band(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        conn, child_conn = self.Pipe()
+        p = self.Process(target=self._echo_objects, args=(child_conn,))
+        p.daemon = True
+        p.start()
+
+        size = multiprocessing.connection.OUT_OF_BAND_THRESHOLD
+        big = bytearray(os.urandom(size * 4))
+        small = bytearray(b'abc')
+        obj = [ZeroCopyBuffer(big), ZeroCopyBuffer(small), 'text']
+        conn.send(obj)
+        res = conn.recv()
+        self.assertIsInstance(res[0], ZeroCopyBuffer)
+        self.assertEqual(res[0].data, big)
+        self.assertEqual(res[1].data, small)
+        self.assertEqual(res[2], 'text')
+
+        # More buffers than can be written by a single system call
+        obj = [ZeroCopyBuffer(big[:size]) for i in range(1100)]
+        conn.send(obj)
+        res = conn.recv()
+        self.assertEqual(len(res), len(obj))
+        self.assertTrue(all(x.data == big[:size] for x in res))
+
+        conn.send(None)
+        p.join()
+        conn.close()
+
+    @unittest.skipIf(sys.platform == 'win32', 'requires Unix connections')
+    def test_out_of_band_message(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        a, b = self.Pipe()
+        size = multiprocessing.connection.OUT_OF_BAND_THRESHOLD
+        obj = [ZeroCopyBuffer(bytearray(size)),
+               ZeroCopyBuffer(bytearray(size - 1))]
+        data, buffers = a._dumps(obj)
+        self.assertEqual([len(buf) for buf in buffers], [size])
+
+        # Only sent out-of-band by Pipe() connections
+        c = multiprocessing.connection.Connection(os.dup(a.fileno()))
+        self.addCleanup(c.close)
+        self.assertEqual(c._dumps(obj)[1], [])
+
+        # Out-of-band messages are not bytes messages.
+        a.send(obj)
+        self.assertRaises(OSError, b.recv_bytes)
+
+    @unittest.skipIf(sys.platform == 'win32', 'requires Unix connections')
+    def test_send_out_of_band_bytes(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        a, b = self.Pipe()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        size = multiprocessing.connection.OUT_OF_BAND_THRESHOLD
+        data, buffers = a._dumps(b'x' * 2**20)
+        self.assertLess(len(data), size)
+        self.assertEqual([len(buf) for buf in buffers], [2**20])
+
+        big = os.urandom(size)
+        array_view = memoryview(array.array('i', range(size)))
+        obj = (big, bytearray(big), memoryview(big), array_view,
+               b'small', [bytearray(big)] * 2)
+        data, buffers = a._dumps(obj)
+        self.assertLess(len(data), size)
+        self.assertEqual(len(buffers), 5)
+
+        a.send(obj)
+        res = b.recv()
+        self.assertIs(type(res[0]), bytes)
+        self.assertEqual(res[0], big)
+        self.assertIs(type(res[1]), bytearray)
+        self.assertEqual(res[1], big)
+        self.assertIsInstance(res[2], memoryview)
+        self.assertTrue(res[2].readonly)
+        self.assertEqual(res[2], big)
+        self.assertEqual(res[3].format, 'i')
+        self.assertEqual(res[3].tolist(), list(range(size)))
+        self.assertEqual(res[4], b'small')
+        self.assertIs(res[5][0], res[5][1])
+        self.assertEqual(res[5][0], big)
+
     @classmethod
     def _is_fd_assigned(cls, fd):
         try:
@@ -3952,11 +4212,16 @@ class _TestSharedMemory(BaseTestCase):
         with multiprocessing.managers.SharedMemoryManager() as smm2:
             sl = smm2.ShareableList("howdy")
             shm = smm2.SharedMemory(size=128)
+            sa = smm2.SharedArray('d', 16)
             held_name = sl.shm.name
+            held_array_name = sa.shm.name
+            sa.close()
         if sys.platform != "win32":
             with self.assertRaises(FileNotFoundError):
                 # No longer there to be attached to again.
                 absent_sl = shared_memory.ShareableList(name=held_name)
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedArray(name=held_array_name)
 
 
     def test_shared_memory_ShareableList_basics(self):
@@ -4067,6 +4332,266 @@ class _TestSharedMemory(BaseTestCase):
         deserialized_sl.shm.close()
         sl.shm.close()
 
+    def test_shared_memory_SharedArray_basics(self):
+        sa = shared_memory.SharedArray('d', range(10))
+        self.addCleanup(sa.unlink)
+        self.assertEqual(sa.typecode, 'd')
+        self.assertEqual(sa.itemsize, 8)
+        self.assertEqual(len(sa), 10)
+        self.assertEqual(sa.buf.format, 'd')
+        self.assertEqual(sa[3], 3.0)
+        self.assertEqual(sa[-1], 9.0)
+        self.assertEqual(list(sa), [float(i) for i in range(10)])
+        self.assertIn('SharedArray', repr(sa))
+
+        # Slices are read and written at once.
+        self.assertEqual(sa[2:5], array.array('d', [2.0, 3.0, 4.0]))
+        self.assertEqual(sa[2:8:2], array.array('d', [2.0, 4.0, 6.0]))
+        self.assertEqual(sa[5:5], array.array('d'))
+        sa[1:4] = [7, 8, 9]
+        sa[::2] = array.array('d', [0] * 5)
+        sa[0] = 1.5
+        self.assertEqual(sa.tolist(),
+                         [1.5, 7.0, 0.0, 9.0, 0.0, 5.0, 0.0, 7.0, 0.0, 9.0])
+        self.assertEqual(sa.tobytes(), array.array('d', sa.tolist()).tobytes())
+        with self.assertRaises(ValueError):
+            sa[0:2] = [1.0]
+        with self.assertRaises(IndexError):
+            sa[10]
+
+        # The values are written through the memoryview.
+        sa.buf[9] = 42.0
+        self.assertEqual(sa[9], 42.0)
+
+        # Attach to the array by name, or by unpickling it.
+        attached = shared_memory.SharedArray(name=sa.shm.name)
+        self.assertEqual(attached.typecode, 'd')
+        self.assertEqual(attached.tolist(), sa.tolist())
+        unpickled = pickle.loads(pickle.dumps(sa))
+        unpickled[5] = -1.0
+        self.assertEqual(attached[5], -1.0)
+        self.assertLess(len(pickle.dumps(sa)), 200)
+        unpickled.close()
+        attached.close()
+        sa.close()
+
+    def test_shared_memory_SharedArray_initializers(self):
+        sa = shared_memory.SharedArray('q', 1000)
+        self.addCleanup(sa.unlink)
+        self.assertEqual(len(sa), 1000)
+        self.assertEqual(sum(sa), 0)
+        sa.close()
+
+        sa = shared_memory.SharedArray('i', array.array('l', [1, -2, 3]))
+        self.addCleanup(sa.unlink)
+        self.assertEqual(sa.tolist(), [1, -2, 3])
+        sa.close()
+
+        sa = shared_memory.SharedArray('H', b'\x01\x00\x02\x00')
+        self.addCleanup(sa.unlink)
+        self.assertEqual(sa.tolist(), [1, 2] if sys.byteorder == 'little'
+                                      else [256, 512])
+        sa.close()
+
+        sa = shared_memory.SharedArray('b')
+        self.addCleanup(sa.unlink)
+        self.assertEqual(len(sa), 0)
+        sa.close()
+
+        for typecode, initializer in [('u', ()), ('x', ()), ('d', b'abc'),
+                                      ('d', -1)]:
+            with self.subTest(typecode=typecode, initializer=initializer):
+                with self.assertRaises(ValueError):
+                    shared_memory.SharedArray(typecode, initializer)
+
+    @classmethod
+    def _fill_array(cls, sa, start, stop):
+        sa[start:stop] = range(start, stop)
+        sa.close()
+
+    def test_shared_memory_SharedArray_across_processes(self):
+        sa = shared_memory.SharedArray('l', 1000)
+        self.addCleanup(sa.unlink)
+        procs = [self.Process(target=self._fill_array, args=(sa, i, i + 500))
+                 for i in (0, 500)]
+        for p in procs:
+            p.daemon = True
+            p.start()
+        for p in procs:
+            p.join()
+        self.assertEqual(sa.tolist(), list(range(1000)))
+        sa.close()
+
+    def test_shared_memory_ShareableQueue_basics(self):
+        lock = self.Lock()
+        sq = shared_memory.ShareableQueue(100, lock=lock)
+        self.addCleanup(sq.unlink)
+        self.assertEqual(sq.capacity, 100)
+        self.assertIsNone(sq.format)
+        self.assertTrue(sq.empty())
+        self.assertRaises(pyqueue.Empty, sq.get_nowait)
+        self.assertRaises(pyqueue.Empty, sq.get, timeout=0.01)
+
+        sq.put(b'abc')
+        sq.put(bytearray(b'de'))
+        sq.put(memoryview(b''))
+        self.assertEqual(sq.qsize(), 3)
+        self.assertEqual(sq.get(), b'abc')
+        self.assertEqual(sq.get(), b'de')
+        self.assertEqual(sq.get(), b'')
+        self.assertTrue(sq.empty())
+
+        # Messages wrap around the end of the ring buffer.
+        for i in range(100):
+            message = bytes([i]) * (i % 45)
+            sq.put(message)
+            self.assertEqual(sq.get(), message)
+
+        # Each message takes 4 more bytes.
+        sq.put(b'x' * 46)
+        sq.put(b'y' * 46)
+        self.assertRaises(pyqueue.Full, sq.put_nowait, b'z')
+        self.assertRaises(pyqueue.Full, sq.put, b'z', timeout=0.01)
+        self.assertEqual(sq.get(), b'x' * 46)
+        sq.put(b'z')
+        self.assertRaises(ValueError, sq.put, b'x' * 97)
+        self.assertEqual(sq.qsize(), 2)
+
+        # Attach to the queue by name.
+        attached = shared_memory.ShareableQueue(name=sq.shm.name, lock=lock)
+        self.assertEqual(attached.capacity, 100)
+        self.assertEqual(attached.get(), b'y' * 46)
+        self.assertEqual(sq.get(), b'z')
+        attached.close()
+        sq.close()
+
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableQueue(0)
+        # The lock of the queue is needed to attach to it.
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableQueue(name=sq.shm.name)
+
+    @classmethod
+    def _put_received_queue(cls, queue, message):
+        sq = queue.get()
+        sq.put(message)
+        sq.close()
+
+    @classmethod
+    def _put_message(cls, sq, message):
+        sq.put(message)
+        sq.close()
+
+    def test_shared_memory_ShareableQueue_picklable_lock(self):
+        # A multiprocessing.Lock is only shared by inheritance.
+        sq = shared_memory.ShareableQueue(100)
+        self.addCleanup(sq.unlink)
+        with self.assertRaises(RuntimeError):
+            pickle.dumps(sq)
+        sq.close()
+
+        manager = multiprocessing.Manager()
+        try:
+            sq = shared_memory.ShareableQueue(100, lock=manager.Lock())
+            self.addCleanup(sq.unlink)
+
+            queue = self.Queue()
+            p = self.Process(target=self._put_received_queue,
+                             args=(queue, b'queue'))
+            p.daemon = True
+            p.start()
+            queue.put(sq)
+            self.assertEqual(sq.get(timeout=support.SHORT_TIMEOUT), b'queue')
+            p.join()
+            close_queue(queue)
+
+            pool = self.Pool(1)
+            try:
+                pool.apply(self._put_message, (sq, b'pool'))
+            finally:
+                pool.close()
+                pool.join()
+            self.assertEqual(sq.get(timeout=support.SHORT_TIMEOUT), b'pool')
+            sq.close()
+        finally:
+            manager.shutdown()
+
+    def test_shared_memory_ShareableQueue_threading_lock(self):
+        sq = shared_memory.ShareableQueue(10, lock=threading.Lock())
+        self.addCleanup(sq.unlink)
+        sq.put(b'x' * 6)
+        self.assertRaises(pyqueue.Full, sq.put, b'y', False, 1.0)
+        self.assertRaises(pyqueue.Full, sq.put, b'y', True, 0.01)
+        self.assertEqual(sq.get(False, 1.0), b'x' * 6)
+        self.assertRaises(pyqueue.Empty, sq.get, False, 1.0)
+        self.assertEqual(sq.qsize(), 0)
+        sq.close()
+
+    def test_shared_memory_ShareableQueue_records(self):
+        sq = shared_memory.ShareableQueue(100, format='qd')
+        self.addCleanup(sq.unlink)
+        # The capacity is a multiple of the record size.
+        self.assertEqual(sq.capacity, 96)
+        self.assertEqual(sq.format, 'qd')
+        for i in range(20):
+            sq.put((i, i / 2))
+            self.assertEqual(sq.get(), (i, i / 2))
+        self.assertRaises(struct.error, sq.put, (1,))
+        for i in range(6):
+            sq.put((i, i / 2))
+        self.assertRaises(pyqueue.Full, sq.put_nowait, (6, 3.0))
+
+        attached = shared_memory.ShareableQueue(name=sq.shm.name,
+                                                lock=sq._lock)
+        self.assertEqual(attached.format, 'qd')
+        self.assertEqual([attached.get() for i in range(6)],
+                         [(i, i / 2) for i in range(6)])
+        attached.close()
+        sq.close()
+
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableQueue(8, format='qd')
+
+    @classmethod
+    def _put_messages(cls, sq, start, count):
+        for i in range(start, start + count):
+            sq.put(b'%d:' % i * (i % 10 + 1))
+        sq.close()
+
+    def test_shared_memory_ShareableQueue_across_processes(self):
+        sq = shared_memory.ShareableQueue(1000)
+        self.addCleanup(sq.unlink)
+        p = self.Process(target=self._put_messages, args=(sq, 0, 2000))
+        p.daemon = True
+        p.start()
+        for i in range(2000):
+            self.assertEqual(sq.get(timeout=support.SHORT_TIMEOUT),
+                             b'%d:' % i * (i % 10 + 1))
+        p.join()
+        sq.close()
+
+    def test_shared_memory_ShareableQueue_producers(self):
+        sq = shared_memory.ShareableQueue(1000, lock=self.Lock())
+        self.addCleanup(sq.unlink)
+        procs = [self.Process(target=self._put_messages,
+                              args=(sq, start, 500))
+                 for start in (0, 1000, 2000)]
+        for p in procs:
+            p.daemon = True
+            p.start()
+        messages = [sq.get(timeout=support.SHORT_TIMEOUT)
+                    for _ in range(1500)]
+        for p in procs:
+            p.join()
+        numbers = [int(m.split(b':')[0]) for m in messages]
+        self.assertEqual(messages,
+                         [b'%d:' % i * (i % 10 + 1) for i in numbers])
+        # The messages of each producer are in order.
+        for start in (0, 1000, 2000):
+            self.assertEqual([i for i in numbers if start <= i < start + 500],
+                             list(range(start, start + 500)))
+        sq.close()
+
     def test_shared_memory_cleaned_after_process_termination(self):
         cmd = '''if 1:
             import os, time, sys
@@ -5038,6 +5563,127 @@ class TestStartMethod(unittest.TestCase):
             print(err)
             self.fail("failed spawning forkserver or grandchild")
 
+    def test_forkserver_warm_pool(self):
+        if multiprocessing.get_start_method() != 'forkserver':
+            self.skipTest("test only relevant for 'forkserver' method")
+        self.assertRaises(ValueError,
+                          multiprocessing.set_forkserver_warm_pool, -1)
+        self.assertRaises(TypeError,
+                          multiprocessing.set_forkserver_warm_pool, 1.5)
+        code = """if 1:
+            import multiprocessing, os, sys, time
+            from multiprocessing import forkserver
+
+            import_pid = os.getpid()
+
+            def f(q, i):
+                q.put((i, os.getppid(), import_pid))
+                sys.exit(i % 3)
+
+            if __name__ == '__main__':
+                ctx = multiprocessing.get_context('forkserver')
+                ctx.set_forkserver_warm_pool(2)
+                q = ctx.Queue()
+                procs = [ctx.Process(target=f, args=(q, i))
+                         for i in range(10)]
+                for p in procs:
+                    p.start()
+                    time.sleep(0.01)
+                results = sorted(q.get() for p in procs)
+                for p in procs:
+                    p.join()
+                assert [r[0] for r in results] == list(range(10))
+                assert ([p.exitcode for p in procs] ==
+                        [i % 3 for i in range(10)])
+                # The children are forked by the forkserver, which imported
+                # the main module.
+                forkserver_pid = forkserver._forkserver._forkserver_pid
+                assert {r[1] for r in results} == {forkserver_pid}
+                assert {r[2] for r in results} == {forkserver_pid}
+                print('ok')
+        """
+        with test.support.temp_dir() as script_dir:
+            # The functions of the __main__ module must be importable.
+            script = test.support.script_helper.make_script(
+                script_dir, 'warm_pool', code)
+            rc, out, err = test.support.script_helper.assert_python_ok(script)
+        self.assertEqual(out.decode().rstrip(), 'ok')
+        self.assertEqual(err.decode(), '')
+
+    def test_forkserver_warm_pool_fork_error(self):
+        if multiprocessing.get_start_method() != 'forkserver':
+            self.skipTest("test only relevant for 'forkserver' method")
+        code = """if 1:
+            import errno, multiprocessing, time
+
+            if __name__ == '__mp_main__':
+                # Preloaded in the forkserver: forking warm children fails
+                from multiprocessing import forkserver
+                attempts = 0
+                def _fork_warm(*args):
+                    global attempts
+                    attempts += 1
+                    raise OSError(errno.EAGAIN, 'fork failed')
+                forkserver._fork_warm = _fork_warm
+
+            def f(q):
+                q.put(attempts)
+
+            if __name__ == '__main__':
+                ctx = multiprocessing.get_context('forkserver')
+                ctx.set_forkserver_warm_pool(2)
+                q = ctx.Queue()
+                for _ in range(3):
+                    p = ctx.Process(target=f, args=(q,))
+                    p.start()
+                    attempts = q.get()
+                    p.join()
+                    assert p.exitcode == 0
+                    time.sleep(0.1)
+                # The forkserver kept serving, and retried once per request
+                assert 1 <= attempts <= 3, attempts
+                print('ok')
+        """
+        with test.support.temp_dir() as script_dir:
+            script = test.support.script_helper.make_script(
+                script_dir, 'warm_pool_error', code)
+            rc, out, err = test.support.script_helper.assert_python_ok(script)
+        self.assertEqual(out.decode().rstrip(), 'ok')
+        self.assertIn('failed to fork a warm child', err.decode())
+
+    def test_forkserver_preload_main_error(self):
+        if multiprocessing.get_start_method() != 'forkserver':
+            self.skipTest("test only relevant for 'forkserver' method")
+        code = """if 1:
+            import multiprocessing, os
+
+            if __name__ == '__mp_main__' and 'PRELOADED' not in os.environ:
+                # Only fail in the forkserver, not in its children
+                os.environ['PRELOADED'] = '1'
+                raise RuntimeError('preload error')
+
+            def f(q):
+                q.put(os.getpid())
+
+            if __name__ == '__main__':
+                ctx = multiprocessing.get_context('forkserver')
+                q = ctx.Queue()
+                for _ in range(2):
+                    p = ctx.Process(target=f, args=(q,))
+                    p.start()
+                    assert q.get() == p.pid
+                    p.join()
+                    assert p.exitcode == 0
+                print('ok')
+        """
+        with test.support.temp_dir() as script_dir:
+            script = test.support.script_helper.make_script(
+                script_dir, 'preload_error', code)
+            rc, out, err = test.support.script_helper.assert_python_ok(script)
+        self.assertEqual(out.decode().rstrip(), 'ok')
+        # The error is reported once, by the forkserver
+        self.assertEqual(err.decode().count('RuntimeError: preload error'), 1)
+
 
 @unittest.skipIf(sys.platform == "win32",
                  "test semantics don't make sense on Windows")
@@ -2,6 +2,7 @@
 
 import concurrent.futures
 import errno
+import functools
 import math
 import os
 import socket
@@ -395,6 +396,162 @@ class BaseEventLoopTests(test_utils.TestCase):
         self.assertTrue(processed)
         self.assertEqual([handle], list(self.loop._ready))
 
+    def test_set_timer_wheel(self):
+        self.assertIsNone(self.loop.get_timer_wheel())
+        h1 = self.loop.call_later(10, lambda: None)
+        h2 = self.loop.call_later(20, lambda: None)
+        h2.cancel()
+
+        self.loop.set_timer_wheel(0.01)
+        self.assertEqual(self.loop.get_timer_wheel(), 0.01)
+        self.assertFalse(self.loop._scheduled)
+        self.assertEqual(self.loop._timer_cancelled_count, 0)
+        self.assertEqual(self.loop._timer_wheel.handles(), [h1])
+        self.assertTrue(h1._scheduled)
+        self.assertFalse(h2._scheduled)
+
+        h3 = self.loop.call_later(5, lambda: None)
+        self.assertFalse(self.loop._scheduled)
+        self.assertEqual(len(self.loop._timer_wheel), 2)
+        h3.cancel()
+        self.assertFalse(h3._scheduled)
+        self.assertEqual(len(self.loop._timer_wheel), 1)
+
+        self.loop.set_timer_wheel(None)
+        self.assertIsNone(self.loop.get_timer_wheel())
+        self.assertEqual(self.loop._scheduled, [h1])
+        self.assertTrue(h1._scheduled)
+
+    def test__run_once_timer_wheel(self):
+        self.loop._process_events = mock.Mock()
+        self.loop.set_timer_wheel(0.01)
+        calls = []
+
+        def cb(arg):
+            calls.append(arg)
+
+        self.loop.call_later(0.05, cb, 'late')
+        self.loop.call_later(-1, cb, 'now')
+        self.loop.call_later(0.02, cb, 'soon')
+        self.loop.call_later(0.03, cb, 'cancelled').cancel()
+        while len(self.loop._timer_wheel):
+            self.loop._run_once()
+            # The selector is never asked to sleep longer than needed.
+            timeout = self.loop._selector.select.call_args[0][0]
+            self.assertLessEqual(timeout, 0.06)
+        self.loop._run_once()
+        self.assertEqual(calls, ['now', 'soon', 'late'])
+
+    def test__run_once_timer_wheel_empty(self):
+        self.loop._process_events = mock.Mock()
+        self.loop.set_timer_wheel(0.01)
+        self.loop._run_once()
+        self.loop._selector.select.assert_called_with(None)
+
+    def test_close_timer_wheel(self):
+        self.loop.set_timer_wheel(0.01)
+        self.loop.call_later(10, lambda: None)
+        self.loop.close()
+        self.assertEqual(len(self.loop._timer_wheel), 0)
+        self.assertRaises(RuntimeError, self.loop.set_timer_wheel, None)
+
+    def test_stats_disabled(self):
+        self.assertIsNone(self.loop.get_stats())
+        self.loop._process_events = mock.Mock()
+        self.loop._run_once()
+        self.assertIsNone(self.loop.get_stats())
+
+    def test_stats(self):
+        self.loop._process_events = mock.Mock()
+        self.loop.set_stats_enabled(True)
+        stats = self.loop.get_stats()
+        self.assertEqual(stats['iterations'], 0)
+        self.assertEqual(stats['callbacks'], 0)
+        self.assertEqual(stats['callback_durations'], {})
+
+        def cb():
+            pass
+
+        class Callable:
+            def __call__(self):
+                pass
+
+        self.loop.call_soon(cb)
+        self.loop.call_soon(functools.partial(cb))
+        self.loop.call_soon(Callable())
+        self.loop.call_soon(cb).cancel()
+        self.loop.call_later(10, cb)
+        self.loop.call_later(20, cb).cancel()
+        self.loop._run_once()
+
+        stats = self.loop.get_stats()
+        self.assertEqual(stats['iterations'], 1)
+        self.assertEqual(stats['callbacks'], 3)
+        self.assertEqual(stats['ready_queue_depth'], 4)
+        self.assertEqual(stats['ready_queue_max_depth'], 4)
+        self.assertEqual(stats['timers'], 1)
+        self.assertEqual(stats['cancelled_timers'], 1)
+        self.assertGreaterEqual(stats['select_time'], 0)
+        self.assertGreaterEqual(stats['callback_time'], 0)
+        buckets = stats['callback_duration_buckets']
+        durations = stats['callback_durations']
+        self.assertEqual(
+            set(durations),
+            {cb.__qualname__, Callable.__qualname__})
+        self.assertEqual(len(durations[cb.__qualname__]), len(buckets) + 1)
+        self.assertEqual(sum(durations[cb.__qualname__]), 2)
+        self.assertEqual(sum(durations[Callable.__qualname__]), 1)
+
+        # The snapshot is not updated by the loop.
+        self.loop._run_once()
+        self.assertEqual(stats['iterations'], 1)
+        stats = self.loop.get_stats()
+        self.assertEqual(stats['iterations'], 2)
+        self.assertEqual(stats['ready_queue_depth'], 0)
+        self.assertEqual(stats['ready_queue_max_depth'], 4)
+
+        # Enabling stats again resets the counters.
+        self.loop.set_stats_enabled(True)
+        self.assertEqual(self.loop.get_stats()['iterations'], 0)
+        self.loop.set_stats_enabled(False)
+        self.assertIsNone(self.loop.get_stats())
+
+    def test_stats_histogram_buckets(self):
+        stats = base_events._LoopStats()
+        callback = mock.Mock(__qualname__='callback')
+        buckets = base_events._CALLBACK_DURATION_BUCKETS
+        for duration in (0, buckets[0], buckets[1] * 2, buckets[-1] + 1):
+            stats.add_callback(callback, duration)
+        self.assertEqual(stats.callbacks, 4)
+        self.assertEqual(stats.histograms['callback'],
+                         [2, 0, 1] + [0] * (len(buckets) - 3) + [1])
+
+    def test_stats_task_name(self):
+        async def coro():
+            await asyncio.sleep(0)
+
+        self.loop._process_events = mock.Mock()
+        self.loop.set_stats_enabled(True)
+        self.loop.run_until_complete(coro())
+        durations = self.loop.get_stats()['callback_durations']
+        self.assertEqual(sum(durations[coro.__qualname__]), 2)
+
+    @mock.patch('asyncio.base_events.logger')
+    def test_stats_slow_callback_debug(self, m_logger):
+        def slow():
+            time.sleep(0.05)
+
+        self.loop._process_events = mock.Mock()
+        self.loop.set_debug(True)
+        self.loop.slow_callback_duration = 0.01
+        self.loop.set_stats_enabled(True)
+        self.loop.call_soon(slow)
+        self.loop._run_once()
+        m_logger.warning.assert_called_with(
+            'Executing %s took %.3f seconds', mock.ANY, mock.ANY)
+        durations = self.loop.get_stats()['callback_durations']
+        self.assertEqual(sum(durations[slow.__qualname__]), 1)
+
     def test__run_once_cancelled_event_cleanup(self):
         self.loop._process_events = mock.Mock()
 
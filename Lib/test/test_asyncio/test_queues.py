@@ -702,6 +702,156 @@ class _QueueJoinTestMixin:
         self.assertEqual(q._format(), 'maxsize=0 tasks=2')
 
 
+class _QueueManyTestMixin:
+
+    q_class = None
+    # Order in which the items 1, 3, 2 are retrieved.
+    order = None
+
+    def make_queue(self, maxsize=0):
+        with self.assertWarns(DeprecationWarning):
+            return self.q_class(maxsize, loop=self.loop)
+
+    def test_put_many_nowait(self):
+        q = self.make_queue()
+        q.put_many_nowait(iter([1, 3, 2]))
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual(q._unfinished_tasks, 3)
+        self.assertEqual([q.get_nowait() for _ in range(3)], self.order)
+        q.put_many_nowait([])
+        self.assertTrue(q.empty())
+
+    def test_put_many_nowait_full(self):
+        q = self.make_queue(maxsize=3)
+        q.put_nowait(1)
+        q.put_many_nowait([2, 3])
+        self.assertRaises(asyncio.QueueFull, q.put_many_nowait, [4])
+        q.get_nowait()
+        self.assertRaises(asyncio.QueueFull, q.put_many_nowait, [4, 5])
+        # Nothing was added.
+        self.assertEqual(q.qsize(), 2)
+        self.assertEqual(q._unfinished_tasks, 3)
+
+    def test_get_many_nowait(self):
+        q = self.make_queue()
+        self.assertRaises(asyncio.QueueEmpty, q.get_many_nowait)
+        q.put_many_nowait([1, 3, 2])
+        self.assertEqual(q.get_many_nowait(2), self.order[:2])
+        self.assertEqual(q.get_many_nowait(5), self.order[2:])
+        q.put_many_nowait([1, 3, 2])
+        self.assertEqual(q.get_many_nowait(), self.order)
+        self.assertRaises(ValueError, q.get_many_nowait, 0)
+
+    def test_get_many_wakes_putters(self):
+        q = self.make_queue(maxsize=2)
+        q.put_many_nowait([1, 2])
+
+        async def test():
+            putters = [self.loop.create_task(q.put(item))
+                       for item in (3, 4, 5)]
+            await asyncio.sleep(0)
+            self.assertEqual(len(q._putters), 3)
+            q.get_many_nowait()
+            await asyncio.sleep(0)
+            self.assertEqual(sum(t.done() for t in putters), 2)
+            self.assertEqual(q.qsize(), 2)
+            q.get_nowait()
+            await asyncio.gather(*putters)
+
+        self.loop.run_until_complete(test())
+
+    def test_put_many_wakes_getters(self):
+        q = self.make_queue()
+
+        async def test():
+            getters = [self.loop.create_task(q.get()) for _ in range(3)]
+            await asyncio.sleep(0)
+            q.put_many_nowait([1, 3])
+            await asyncio.sleep(0)
+            self.assertEqual(sorted(t.result() for t in getters[:2]), [1, 3])
+            self.assertFalse(getters[2].done())
+            self.assertEqual(len(q._getters), 1)
+            q.put_nowait(2)
+            self.assertEqual(await getters[2], 2)
+
+        self.loop.run_until_complete(test())
+
+    def test_put_many_blocking(self):
+        q = self.make_queue(maxsize=2)
+
+        async def test():
+            put_task = self.loop.create_task(q.put_many(range(5)))
+            await asyncio.sleep(0)
+            self.assertFalse(put_task.done())
+            self.assertEqual(q.qsize(), 2)
+            got = []
+            while not put_task.done() or not q.empty():
+                got.extend(await q.get_many())
+            await put_task
+            self.assertEqual(sorted(got), list(range(5)))
+            self.assertEqual(q._unfinished_tasks, 5)
+
+        self.loop.run_until_complete(test())
+
+    def test_put_many_cancelled(self):
+        q = self.make_queue(maxsize=2)
+
+        async def test():
+            put_task = self.loop.create_task(q.put_many([1, 2, 3]))
+            await asyncio.sleep(0)
+            put_task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await put_task
+            self.assertFalse(q._putters)
+            # The items added before the cancellation stay in the queue.
+            self.assertEqual(sorted(q.get_many_nowait()), [1, 2])
+
+        self.loop.run_until_complete(test())
+
+    def test_get_many_blocking(self):
+        q = self.make_queue()
+
+        async def test():
+            get_task = self.loop.create_task(q.get_many(2))
+            await asyncio.sleep(0)
+            self.assertFalse(get_task.done())
+            q.put_many_nowait([1, 3, 2])
+            self.assertEqual(await get_task, self.order[:2])
+            self.assertEqual(q.qsize(), 1)
+            with self.assertRaises(ValueError):
+                await q.get_many(0)
+
+        self.loop.run_until_complete(test())
+
+    def test_get_many_cancelled(self):
+        q = self.make_queue()
+
+        async def test():
+            get_task = self.loop.create_task(q.get_many())
+            await asyncio.sleep(0)
+            get_task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await get_task
+            self.assertFalse(q._getters)
+
+        self.loop.run_until_complete(test())
+
+
+class QueueManyTests(_QueueManyTestMixin, _QueueTestBase):
+    q_class = asyncio.Queue
+    order = [1, 3, 2]
+
+
+class LifoQueueManyTests(_QueueManyTestMixin, _QueueTestBase):
+    q_class = asyncio.LifoQueue
+    order = [2, 3, 1]
+
+
+class PriorityQueueManyTests(_QueueManyTestMixin, _QueueTestBase):
+    q_class = asyncio.PriorityQueue
+    order = [1, 2, 3]
+
+
 class QueueJoinTests(_QueueJoinTestMixin, _QueueTestBase):
     q_class = asyncio.Queue
 
@@ -0,0 +1,184 @@
+"""Tests for resolvercache.py"""
+
+import socket
+import unittest
+
+import asyncio
+from asyncio import resolvercache
+from test.test_asyncio import utils as test_utils
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+INFOS = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.1', 80))]
+
+
+class ResolverCacheTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+        self.clock = 0.0
+        self.loop.time = lambda: self.clock
+        self.calls = []
+        self.results = {}
+        self.loop.getaddrinfo = self.getaddrinfo
+
+    async def getaddrinfo(self, host, port, *, family=0, type=0, proto=0,
+                          flags=0):
+        self.calls.append(host)
+        await asyncio.sleep(0)
+        result = self.results.get(host, INFOS)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def resolve(self, cache, host):
+        return self.loop.run_until_complete(cache.resolve(
+            self.loop, host, 80, 0, socket.SOCK_STREAM, 0, 0))
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, resolvercache.ResolverCache, 0)
+        self.assertRaises(ValueError, resolvercache.ResolverCache, 1, -1)
+        self.assertRaises(ValueError, resolvercache.ResolverCache, 1, 0, 0)
+
+    def test_hit_and_expiry(self):
+        cache = resolvercache.ResolverCache(10)
+        self.assertEqual(self.resolve(cache, 'example.com'), INFOS)
+        self.clock = 9.9
+        infos = self.resolve(cache, 'example.com')
+        self.assertEqual(infos, INFOS)
+        # The caller gets its own list.
+        infos.clear()
+        self.assertEqual(self.calls, ['example.com'])
+
+        self.clock = 10.0
+        self.assertEqual(self.resolve(cache, 'example.com'), INFOS)
+        self.assertEqual(self.calls, ['example.com', 'example.com'])
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['entries'], 1)
+
+    def test_key(self):
+        cache = resolvercache.ResolverCache(10)
+        self.resolve(cache, 'example.com')
+        self.loop.run_until_complete(cache.resolve(
+            self.loop, 'example.com', 443, 0, socket.SOCK_STREAM, 0, 0))
+        self.loop.run_until_complete(cache.resolve(
+            self.loop, 'example.com', 80, 0, socket.SOCK_DGRAM, 0, 0))
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(len(cache), 3)
+
+    def test_negative_caching(self):
+        self.results['bad.example'] = socket.gaierror(
+            socket.EAI_NONAME, 'Name or service not known')
+        cache = resolvercache.ResolverCache(10, negative_ttl=1)
+        for _ in range(2):
+            with self.assertRaises(socket.gaierror):
+                self.resolve(cache, 'bad.example')
+        self.assertEqual(self.calls, ['bad.example'])
+        self.assertEqual(cache.stats()['negative_hits'], 1)
+
+        self.clock = 1.0
+        with self.assertRaises(socket.gaierror):
+            self.resolve(cache, 'bad.example')
+        self.assertEqual(len(self.calls), 2)
+
+    def test_no_negative_caching(self):
+        self.results['bad.example'] = socket.gaierror(
+            socket.EAI_NONAME, 'Name or service not known')
+        cache = resolvercache.ResolverCache(10)
+        for _ in range(2):
+            with self.assertRaises(socket.gaierror):
+                self.resolve(cache, 'bad.example')
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_other_errors_not_cached(self):
+        self.results['bad.example'] = ValueError()
+        cache = resolvercache.ResolverCache(10, negative_ttl=10)
+        with self.assertRaises(ValueError):
+            self.resolve(cache, 'bad.example')
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        cache = resolvercache.ResolverCache(10, max_entries=2)
+        self.resolve(cache, 'a.example')
+        self.resolve(cache, 'b.example')
+        self.resolve(cache, 'a.example')
+        self.resolve(cache, 'c.example')
+        # b.example was the least recently used entry.
+        self.assertEqual(list(cache._entries),
+                         [('a.example', 80, 0, socket.SOCK_STREAM, 0, 0),
+                          ('c.example', 80, 0, socket.SOCK_STREAM, 0, 0)])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_coalesced(self):
+        cache = resolvercache.ResolverCache(10)
+
+        async def main():
+            return await asyncio.gather(
+                *[cache.resolve(self.loop, 'example.com', 80, 0,
+                                socket.SOCK_STREAM, 0, 0)
+                  for _ in range(3)])
+
+        self.assertEqual(self.loop.run_until_complete(main()), [INFOS] * 3)
+        self.assertEqual(self.calls, ['example.com'])
+        self.assertEqual(cache.stats()['coalesced'], 2)
+
+    def test_cancelled_caller(self):
+        cache = resolvercache.ResolverCache(10)
+
+        async def main():
+            task = self.loop.create_task(cache.resolve(
+                self.loop, 'example.com', 80, 0, socket.SOCK_STREAM, 0, 0))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The resolution completes and fills the cache.
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        self.loop.run_until_complete(main())
+        self.assertEqual(len(cache), 1)
+        self.assertFalse(cache._pending)
+
+    def test_loop_create_connection(self):
+        self.loop.set_resolver_cache(10)
+        connected = []
+
+        async def sock_connect(sock, address):
+            connected.append(address)
+            raise OSError('refused')
+
+        self.loop.sock_connect = sock_connect
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                self.loop.run_until_complete(self.loop.create_connection(
+                    asyncio.Protocol, 'example.com', 80))
+        self.assertEqual(connected, [('10.0.0.1', 80)] * 2)
+        self.assertEqual(self.calls, ['example.com'])
+        stats = self.loop.get_resolver_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        # IP addresses do not go through the cache.
+        with self.assertRaises(OSError):
+            self.loop.run_until_complete(self.loop.create_connection(
+                asyncio.Protocol, '10.0.0.2', 80))
+        self.assertEqual(self.loop.get_resolver_cache_stats()['entries'], 1)
+
+        self.loop.set_resolver_cache(None)
+        self.assertIsNone(self.loop.get_resolver_cache_stats())
+        with self.assertRaises(OSError):
+            self.loop.run_until_complete(self.loop.create_connection(
+                asyncio.Protocol, 'example.com', 80))
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 """Tests for selector_events.py"""
 
+import collections
 import selectors
 import socket
 import unittest
@@ -10,10 +11,13 @@ except ImportError:
     ssl = None
 
 import asyncio
+from asyncio import selector_events
 from asyncio.selector_events import BaseSelectorEventLoop
 from asyncio.selector_events import _SelectorTransport
 from asyncio.selector_events import _SelectorSocketTransport
+from asyncio.selector_events import _SelectorEdgeTriggeredSocketTransport
 from asyncio.selector_events import _SelectorDatagramTransport
+from test import support
 from test.test_asyncio import utils as test_utils
 
 
@@ -509,9 +513,13 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         self.sock = mock.Mock(socket.socket)
         self.sock_fd = self.sock.fileno.return_value = 7
 
-    def socket_transport(self, waiter=None):
+    def socket_transport(self, waiter=None, sendmsg=False):
         transport = _SelectorSocketTransport(self.loop, self.sock,
                                              self.protocol, waiter=waiter)
+        if sendmsg:
+            transport._write_ready = transport._write_sendmsg
+        else:
+            transport._write_ready = transport._write_send
         self.addCleanup(close_transport, transport)
         return transport
 
@@ -680,17 +688,17 @@ class SelectorSocketTransportTests(test_utils.TestCase):
 
     def test_write_no_data(self):
         transport = self.socket_transport()
-        transport._buffer.extend(b'data')
+        transport._buffer.append(b'data')
         transport.write(b'')
         self.assertFalse(self.sock.send.called)
-        self.assertEqual(list_to_buffer([b'data']), transport._buffer)
+        self.assertEqual(collections.deque([b'data']), transport._buffer)
 
     def test_write_buffer(self):
         transport = self.socket_transport()
-        transport._buffer.extend(b'data1')
+        transport._buffer.append(b'data1')
         transport.write(b'data2')
         self.assertFalse(self.sock.send.called)
-        self.assertEqual(list_to_buffer([b'data1', b'data2']),
+        self.assertEqual(collections.deque([b'data1', b'data2']),
                          transport._buffer)
 
     def test_write_partial(self):
@@ -701,7 +709,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         transport.write(data)
 
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'ta']), transport._buffer)
+        self.assertEqual(collections.deque([b'ta']), transport._buffer)
 
     def test_write_partial_bytearray(self):
         data = bytearray(b'data')
@@ -711,7 +719,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         transport.write(data)
 
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'ta']), transport._buffer)
+        self.assertEqual(collections.deque([b'ta']), transport._buffer)
         self.assertEqual(data, bytearray(b'data'))  # Hasn't been mutated.
 
     def test_write_partial_memoryview(self):
@@ -722,7 +730,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         transport.write(data)
 
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'ta']), transport._buffer)
+        self.assertEqual(collections.deque([b'ta']), transport._buffer)
 
     def test_write_partial_none(self):
         data = b'data'
@@ -733,7 +741,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         transport.write(data)
 
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'data']), transport._buffer)
+        self.assertEqual(collections.deque([b'data']), transport._buffer)
 
     def test_write_tryagain(self):
         self.sock.send.side_effect = BlockingIOError
@@ -743,7 +751,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         transport.write(data)
 
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'data']), transport._buffer)
+        self.assertEqual(collections.deque([b'data']), transport._buffer)
 
     @mock.patch('asyncio.selector_events.logger')
     def test_write_exception(self, m_log):
@@ -784,7 +792,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         self.sock.send.return_value = len(data)
 
         transport = self.socket_transport()
-        transport._buffer.extend(data)
+        transport._buffer.append(data)
         self.loop._add_writer(7, transport._write_ready)
         transport._write_ready()
         self.assertTrue(self.sock.send.called)
@@ -796,7 +804,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
 
         transport = self.socket_transport()
         transport._closing = True
-        transport._buffer.extend(data)
+        transport._buffer.append(data)
         self.loop._add_writer(7, transport._write_ready)
         transport._write_ready()
         self.assertTrue(self.sock.send.called)
@@ -814,40 +822,41 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         self.sock.send.return_value = 2
 
         transport = self.socket_transport()
-        transport._buffer.extend(data)
+        transport._buffer.append(data)
         self.loop._add_writer(7, transport._write_ready)
         transport._write_ready()
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'ta']), transport._buffer)
+        self.assertEqual(collections.deque([b'ta']), transport._buffer)
 
     def test_write_ready_partial_none(self):
         data = b'data'
         self.sock.send.return_value = 0
 
         transport = self.socket_transport()
-        transport._buffer.extend(data)
+        transport._buffer.append(data)
         self.loop._add_writer(7, transport._write_ready)
         transport._write_ready()
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'data']), transport._buffer)
+        self.assertEqual(collections.deque([b'data']), transport._buffer)
 
     def test_write_ready_tryagain(self):
         self.sock.send.side_effect = BlockingIOError
 
         transport = self.socket_transport()
-        transport._buffer = list_to_buffer([b'data1', b'data2'])
+        transport._buffer = collections.deque([b'data1', b'data2'])
         self.loop._add_writer(7, transport._write_ready)
         transport._write_ready()
 
         self.loop.assert_writer(7, transport._write_ready)
-        self.assertEqual(list_to_buffer([b'data1data2']), transport._buffer)
+        self.assertEqual(collections.deque([b'data1data2']),
+                         transport._buffer)
 
     def test_write_ready_exception(self):
         err = self.sock.send.side_effect = OSError()
 
         transport = self.socket_transport()
         transport._fatal_error = mock.Mock()
-        transport._buffer.extend(b'data')
+        transport._buffer.append(b'data')
         transport._write_ready()
         transport._fatal_error.assert_called_with(
                                    err,
@@ -867,7 +876,7 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         self.sock.send.side_effect = BlockingIOError
         tr.write(b'data')
         tr.write_eof()
-        self.assertEqual(tr._buffer, list_to_buffer([b'data']))
+        self.assertEqual(tr._buffer, collections.deque([b'data']))
         self.assertTrue(tr._eof)
         self.assertFalse(self.sock.shutdown.called)
         self.sock.send.side_effect = lambda _: 4
@@ -890,6 +899,334 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         transport.close()
         remove_writer.assert_called_with(self.sock_fd)
 
+    def test_write_partial_bytearray_buffered(self):
+        data = bytearray(b'data')
+        self.sock.send.return_value = 2
+
+        transport = self.socket_transport()
+        transport.write(data)
+        data[:] = b'xxxx'
+        self.assertEqual(collections.deque([b'ta']), transport._buffer)
+
+    def test_write_buffer_keeps_bytes_reference(self):
+        data = b'data'
+        self.sock.send.side_effect = BlockingIOError
+        transport = self.socket_transport()
+        transport.write(b'data1')
+        transport.write(data)
+        self.assertIs(transport._buffer[1], data)
+        self.assertEqual(transport.get_write_buffer_size(), 9)
+
+    def test_write_buffer_size(self):
+        self.sock.send.return_value = 2
+        self.sock.sendmsg.return_value = 5
+        transport = self.socket_transport()
+        transport.write(b'data')
+        self.assertEqual(transport.get_write_buffer_size(), 2)
+        transport.write(bytearray(b'data'))
+        transport.writelines([b'head', memoryview(b'tail')])
+        self.assertEqual(transport.get_write_buffer_size(), 14)
+        transport._write_ready()
+        self.assertEqual(transport.get_write_buffer_size(),
+                         sum(map(len, transport._buffer)))
+        transport.abort()
+        self.assertEqual(transport.get_write_buffer_size(), 0)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_write_sendmsg_full(self):
+        self.sock.sendmsg.return_value = 9
+
+        transport = self.socket_transport(sendmsg=True)
+        transport._buffer.extend([b'data1', b'data'])
+        self.loop._add_writer(7, transport._write_ready)
+        transport._write_ready()
+        self.assertTrue(self.sock.sendmsg.called)
+        self.assertFalse(self.sock.send.called)
+        self.assertFalse(self.loop.writers)
+        self.assertFalse(transport._buffer)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_write_sendmsg_partial(self):
+        self.sock.sendmsg.return_value = 7
+
+        transport = self.socket_transport(sendmsg=True)
+        transport._buffer.extend([b'data1', b'data2', b'data3'])
+        self.loop._add_writer(7, transport._write_ready)
+        transport._write_ready()
+        self.loop.assert_writer(7, transport._write_ready)
+        self.assertEqual(collections.deque([b'ta2', b'data3']),
+                         transport._buffer)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_write_sendmsg_iov_max(self):
+        self.sock.sendmsg.return_value = 0
+
+        transport = self.socket_transport(sendmsg=True)
+        transport._buffer.extend([b'x'] * (selector_events.SC_IOV_MAX + 10))
+        transport._write_ready()
+        buffers = list(self.sock.sendmsg.call_args[0][0])
+        self.assertEqual(len(buffers), selector_events.SC_IOV_MAX)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_writelines_sendmsg(self):
+        self.sock.sendmsg.return_value = 12
+
+        transport = self.socket_transport(sendmsg=True)
+        transport.writelines([b'head', bytearray(b'body'),
+                              memoryview(b'tail')])
+        self.assertEqual(self.sock.sendmsg.call_count, 1)
+        self.assertFalse(self.sock.send.called)
+        self.assertFalse(self.loop.writers)
+        self.assertFalse(transport._buffer)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_writelines_sendmsg_partial(self):
+        self.sock.sendmsg.return_value = 6
+        head = b'head'
+        body = bytearray(b'body')
+        tail = b'tail'
+
+        transport = self.socket_transport(sendmsg=True)
+        transport.writelines([head, body, tail])
+        self.loop.assert_writer(7, transport._write_ready)
+        self.assertEqual(collections.deque([b'dy', b'tail']),
+                         transport._buffer)
+        # Mutable data is copied, bytes are kept by reference.
+        body[:] = b'xxxx'
+        self.assertEqual(collections.deque([b'dy', b'tail']),
+                         transport._buffer)
+        self.assertIs(transport._buffer[1].obj, tail)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_writelines_sendmsg_buffer_not_empty(self):
+        transport = self.socket_transport(sendmsg=True)
+        transport._buffer.append(b'data1')
+        transport.writelines([b'data2', bytearray(b'data3')])
+        self.assertFalse(self.sock.sendmsg.called)
+        self.assertEqual(collections.deque([b'data1', b'data2', b'data3']),
+                         transport._buffer)
+
+    def test_writelines_str(self):
+        transport = self.socket_transport()
+        self.assertRaises(TypeError, transport.writelines, [b'data', 'str'])
+
+    def test_writelines_after_write_eof(self):
+        transport = self.socket_transport()
+        transport.write_eof()
+        self.assertRaises(RuntimeError, transport.writelines, [b'data'])
+
+
+class SelectorEdgeTriggeredSocketTransportTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = self.new_test_loop()
+        self.loop._add_edge_triggered = mock.Mock()
+        self.loop._unregister_fd = mock.Mock()
+        self.loop._add_writer = mock.Mock()
+        self.loop._remove_writer = mock.Mock()
+        self.protocol = test_utils.make_test_protocol(asyncio.Protocol)
+        self.sock = mock.Mock(socket.socket)
+        self.sock_fd = self.sock.fileno.return_value = 7
+
+    def socket_transport(self):
+        transport = _SelectorEdgeTriggeredSocketTransport(
+            self.loop, self.sock, self.protocol)
+        transport._write_buffered = transport._write_send
+        self.addCleanup(close_transport, transport)
+        return transport
+
+    def test_register(self):
+        tr = self.socket_transport()
+        test_utils.run_briefly(self.loop)
+        self.loop._add_edge_triggered.assert_called_once_with(
+            7, tr._read_ready, tr._write_ready)
+
+    def test_write_partial(self):
+        self.sock.send.return_value = 2
+        tr = self.socket_transport()
+        tr.write(b'data')
+        self.assertEqual(collections.deque([b'ta']), tr._buffer)
+
+        self.sock.send.return_value = 2
+        tr._write_ready()
+        self.assertFalse(tr._buffer)
+        # The registration of the socket doesn't change.
+        self.assertFalse(self.loop._add_writer.called)
+        self.assertFalse(self.loop._remove_writer.called)
+
+    def test_write_ready_empty_buffer(self):
+        tr = self.socket_transport()
+        tr._write_ready()
+        self.assertFalse(self.sock.send.called)
+
+    def test_write_until_eagain(self):
+        self.sock.send.side_effect = [2, 1, BlockingIOError]
+        tr = self.socket_transport()
+        tr._buffer.append(b'data')
+        tr._write_ready()
+        self.assertEqual(collections.deque([b'a']), tr._buffer)
+        self.assertEqual(self.sock.send.call_count, 3)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_write_sendmsg_iov_max(self):
+        iov_max = selector_events.SC_IOV_MAX
+        self.sock.sendmsg.side_effect = [iov_max, iov_max, BlockingIOError]
+        tr = self.socket_transport()
+        tr._write_buffered = tr._write_sendmsg
+        tr._buffer.extend([b'x'] * (iov_max * 2 + 10))
+        tr._write_ready()
+        self.assertEqual(len(tr._buffer), 10)
+        self.assertEqual(self.sock.sendmsg.call_count, 3)
+
+    @unittest.skipUnless(selector_events._HAS_SENDMSG, 'no sendmsg')
+    def test_writelines_iov_max(self):
+        self.sock.sendmsg.side_effect = lambda buffers: len(list(buffers))
+        tr = self.socket_transport()
+        tr._write_buffered = tr._write_sendmsg
+        tr.writelines([b'x'] * (selector_events.SC_IOV_MAX * 2 + 10))
+        self.assertFalse(tr._buffer)
+        self.assertEqual(self.sock.sendmsg.call_count, 3)
+
+    def test_read_until_eagain(self):
+        self.sock.recv.side_effect = [b'data', BlockingIOError]
+        tr = self.socket_transport()
+        tr._read_ready()
+        self.protocol.data_received.assert_called_once_with(b'data')
+        self.assertEqual(self.sock.recv.call_count, 2)
+
+    def test_read_eof_after_data(self):
+        self.sock.recv.side_effect = [b'data', b'']
+        self.protocol.eof_received.return_value = False
+        tr = self.socket_transport()
+        tr._read_ready()
+        self.protocol.data_received.assert_called_once_with(b'data')
+        self.protocol.eof_received.assert_called_once_with()
+        self.assertTrue(tr.is_closing())
+        self.loop._unregister_fd.assert_called_once_with(7)
+
+    def test_read_full_buffer(self):
+        self.sock.recv.side_effect = [b'data', b'xy', BlockingIOError]
+        tr = self.socket_transport()
+        tr.max_size = 4
+        tr._read_ready()
+        self.protocol.data_received.assert_called_once_with(b'data')
+
+        # Other callbacks run before the next read.
+        test_utils.run_briefly(self.loop)
+        self.protocol.data_received.assert_called_with(b'xy')
+        self.assertEqual(self.sock.recv.call_count, 3)
+
+    def test_pause_resume_reading(self):
+        self.sock.recv.side_effect = [b'data', BlockingIOError]
+        tr = self.socket_transport()
+        test_utils.run_briefly(self.loop)
+
+        tr.pause_reading()
+        self.assertFalse(tr.is_reading())
+        tr._read_ready()
+        self.assertFalse(self.sock.recv.called)
+
+        tr.resume_reading()
+        self.assertTrue(tr.is_reading())
+        test_utils.run_briefly(self.loop)
+        self.protocol.data_received.assert_called_once_with(b'data')
+        self.loop._add_edge_triggered.assert_called_once_with(
+            7, tr._read_ready, tr._write_ready)
+
+    def test_close(self):
+        tr = self.socket_transport()
+        tr.close()
+        self.loop._unregister_fd.assert_called_with(7)
+        test_utils.run_briefly(self.loop)
+        self.protocol.connection_lost.assert_called_once_with(None)
+
+    def test_close_write_pending(self):
+        self.sock.send.return_value = 2
+        tr = self.socket_transport()
+        tr.write(b'data')
+        tr.close()
+        self.assertFalse(self.loop._unregister_fd.called)
+
+        tr._write_ready()
+        self.loop._unregister_fd.assert_called_once_with(7)
+        self.protocol.connection_lost.assert_called_once_with(None)
+
+
+@unittest.skipUnless(hasattr(selectors, 'EpollSelector'),
+                     'Test needs selectors.EpollSelector')
+class EdgeTriggeredLoopTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.SelectorEventLoop(selectors.EpollSelector())
+        self.set_event_loop(self.loop)
+
+    def test_set_edge_triggered(self):
+        self.assertFalse(self.loop.get_edge_triggered())
+        self.loop.set_edge_triggered(True)
+        self.assertTrue(self.loop.get_edge_triggered())
+        self.loop.set_edge_triggered(False)
+        self.assertFalse(self.loop.get_edge_triggered())
+
+        loop = asyncio.SelectorEventLoop(selectors.SelectSelector())
+        self.addCleanup(loop.close)
+        with self.assertRaises(RuntimeError):
+            loop.set_edge_triggered(True)
+        loop.set_edge_triggered(False)
+
+    def test_streams(self):
+        self.loop.set_edge_triggered(True)
+        payload = b'x' * (4 * 1024 * 1024)
+
+        async def handle(reader, writer):
+            data = await reader.readexactly(len(payload))
+            writer.write(data)
+            await writer.drain()
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(handle, '127.0.0.1', 0)
+            addr = server.sockets[0].getsockname()
+            # A small limit pauses reading often.
+            reader, writer = await asyncio.open_connection(*addr,
+                                                           limit=1024)
+            self.assertIsInstance(writer.transport,
+                                  _SelectorEdgeTriggeredSocketTransport)
+            writer.write(payload)
+            data = await reader.read()
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return data
+
+        self.assertEqual(self.loop.run_until_complete(main()), payload)
+
+    def test_writelines_many_buffers(self):
+        # writelines() and the write callback send more buffers than a
+        # single sendmsg() call accepts.
+        self.loop.set_edge_triggered(True)
+        count = 100_000
+
+        async def handle(reader, writer):
+            writer.writelines([b'x'] * count)
+            await writer.drain()
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(handle, '127.0.0.1', 0)
+            addr = server.sockets[0].getsockname()
+            reader, writer = await asyncio.open_connection(*addr)
+            data = await reader.read()
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return data
+
+        data = self.loop.run_until_complete(
+            asyncio.wait_for(main(), support.SHORT_TIMEOUT))
+        self.assertEqual(len(data), count)
+
 
 class SelectorSocketTransportBufferedProtocolTests(test_utils.TestCase):
 
@@ -156,6 +156,153 @@ class SslProtoHandshakeTests(test_utils.TestCase):
         self.assertIsNone(transp.write(b'data'))
 
 
+    def test_get_buffer(self):
+        ssl_proto = self.ssl_protocol()
+        self.assertIsInstance(ssl_proto, asyncio.BufferedProtocol)
+        buf = ssl_proto.get_buffer(-1)
+        self.assertEqual(len(buf), ssl_proto.max_size)
+        # The buffer is reused.
+        self.assertIs(ssl_proto.get_buffer(100), buf)
+
+    def test_buffer_updated(self):
+        ssl_proto = self.ssl_protocol()
+        self.connection_made(ssl_proto)
+        sslpipe = ssl_proto._sslpipe
+        sslpipe.feed_ssldata.return_value = ([], [])
+        buf = ssl_proto.get_buffer(-1)
+        buf[:4] = b'data'
+        ssl_proto.buffer_updated(4)
+        data = sslpipe.feed_ssldata.call_args[0][0]
+        self.assertEqual(bytes(data), b'data')
+
+    def test_buffer_updated_app_protocol_error(self):
+        proto = mock.Mock(asyncio.BufferedProtocol)
+        ssl_proto = self.ssl_protocol(proto=proto)
+        transport = self.connection_made(ssl_proto)
+        exc = ZeroDivisionError()
+        error = sslproto._AppProtocolError(exc)
+        error.ssldata = [b'record']
+        ssl_proto._sslpipe.feed_ssldata.side_effect = error
+        contexts = []
+        self.loop.set_exception_handler(
+            lambda loop, context: contexts.append(context))
+        buf = ssl_proto.get_buffer(-1)
+        buf[:4] = b'data'
+        ssl_proto.buffer_updated(4)
+        # The pending records are sent before the connection is closed.
+        transport.write.assert_called_once_with(b'record')
+        transport._force_close.assert_called_once_with(exc)
+        self.assertEqual(len(contexts), 1)
+        self.assertEqual(contexts[0]['message'],
+                         'application protocol failed to receive SSL data')
+        self.assertIs(contexts[0]['exception'], exc)
+
+    def test_write_backlog_batched(self):
+        ssl_proto = self.ssl_protocol()
+        transport = self.connection_made(ssl_proto)
+        sslpipe = ssl_proto._sslpipe
+        sslpipe.feed_appdata.side_effect = (
+            lambda data, offset: ([b'record:' + data], len(data)))
+        # Data written while the handshake is in progress is encrypted
+        # later, in one batch.
+        ssl_proto._write_backlog.extend([(b'a', 0), (b'b', 0)])
+        ssl_proto._write_buffer_size += 2
+        ssl_proto._app_transport.write(b'c')
+        transport.writelines.assert_called_once_with(
+            [b'record:a', b'record:b', b'record:c'])
+        self.assertEqual(ssl_proto._write_buffer_size, 0)
+
+        ssl_proto._app_transport.write(b'd')
+        transport.write.assert_called_once_with(b'record:d')
+
+
+@unittest.skipIf(ssl is None, 'No ssl module')
+class SSLPipeTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = sslproto._SSLPipe(
+            test_utils.simple_client_sslcontext(), False)
+        self.server = sslproto._SSLPipe(
+            test_utils.simple_server_sslcontext(), True)
+        ssldata = self.client.do_handshake()
+        self.server.do_handshake()
+        while not (self.client.wrapped and self.server.wrapped):
+            ssldata = self.exchange(self.server, ssldata)
+            ssldata = self.exchange(self.client, ssldata)
+
+    def exchange(self, pipe, ssldata):
+        out, appdata = pipe.feed_ssldata(memoryview(b''.join(ssldata)))
+        self.assertEqual(appdata, [])
+        return out
+
+    def encrypt(self, pipe, data):
+        ssldata, offset = pipe.feed_appdata(data)
+        self.assertEqual(offset, len(data))
+        return b''.join(ssldata)
+
+    def test_records_joined(self):
+        records = b''.join(self.encrypt(self.client, b'x' * 1000)
+                           for _ in range(10))
+        ssldata, appdata = self.server.feed_ssldata(records)
+        self.assertEqual(appdata, [b'x' * 10000])
+
+    def test_read_buffer_full(self):
+        size = self.server.max_size
+        data = bytes(range(256)) * (size // 256 + 8)
+        ssldata, appdata = self.server.feed_ssldata(
+            self.encrypt(self.client, data))
+        self.assertEqual(appdata, [data[:size], data[size:]])
+
+    def test_read_into_buffered_protocol(self):
+        received = bytearray()
+        buf = bytearray(300)
+
+        class Proto(asyncio.BufferedProtocol):
+            def get_buffer(self, sizehint):
+                return buf
+
+            def buffer_updated(self, nbytes):
+                received.extend(buf[:nbytes])
+
+        data = b'y' * 1000
+        ssldata, appdata = self.server.feed_ssldata(
+            self.encrypt(self.client, data), app_protocol=Proto())
+        self.assertEqual(appdata, [])
+        self.assertEqual(received, data)
+
+        close_notify = b''.join(self.client.shutdown())
+        ssldata, appdata = self.server.feed_ssldata(
+            close_notify, app_protocol=Proto())
+        self.assertEqual(appdata, [b''])
+
+    def test_read_into_empty_buffer(self):
+        proto = mock.Mock(asyncio.BufferedProtocol)
+        proto.get_buffer.return_value = bytearray()
+        with self.assertRaises(sslproto._AppProtocolError) as cm:
+            self.server.feed_ssldata(self.encrypt(self.client, b'data'),
+                                     app_protocol=proto)
+        self.assertIsInstance(cm.exception.exc, RuntimeError)
+
+    def test_read_into_buffer_updated_error(self):
+        proto = mock.Mock(asyncio.BufferedProtocol)
+        proto.get_buffer.return_value = bytearray(100)
+        proto.buffer_updated.side_effect = ZeroDivisionError
+        records = self.encrypt(self.client, b'data')
+        # Records produced by the same call are returned with the error.
+        self.server._outgoing.write(b'pending')
+        with self.assertRaises(sslproto._AppProtocolError) as cm:
+            self.server.feed_ssldata(records, app_protocol=proto)
+        self.assertIsInstance(cm.exception.exc, ZeroDivisionError)
+        self.assertEqual(cm.exception.ssldata, [b'pending'])
+        proto.buffer_updated.assert_called_once_with(4)
+
+    def test_close_notify(self):
+        records = self.encrypt(self.client, b'data')
+        records += b''.join(self.client.shutdown())
+        ssldata, appdata = self.server.feed_ssldata(records)
+        self.assertEqual(appdata, [b'data', b''])
+
+
 ##############################################################################
 # Start TLS Tests
 ##############################################################################
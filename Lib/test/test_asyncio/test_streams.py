@@ -988,5 +988,161 @@ os.close(fd)
         self.assertEqual(messages, [])
 
 
+class BufferedStreamReaderTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+
+    def tearDown(self):
+        test_utils.run_briefly(self.loop)
+        self.loop.close()
+        gc.collect()
+        super().tearDown()
+
+    def feed_buffered(self, stream, data):
+        # Emulate a transport receiving data with recv_into().
+        buf = stream._get_buffer(-1)
+        buf[:len(data)] = data
+        stream._buffer_updated(len(data))
+
+    def test_readexactly_zero_copy(self):
+        stream = asyncio.BufferedStreamReader(loop=self.loop)
+        self.feed_buffered(stream, b'header')
+        self.feed_buffered(stream, b'body')
+        self.assertEqual(len(stream._buffer._segments), 1)
+
+        header = self.loop.run_until_complete(stream.readexactly(6))
+        body = self.loop.run_until_complete(stream.readexactly(4))
+        self.assertIsInstance(header, memoryview)
+        self.assertTrue(header.readonly)
+        self.assertEqual(header, b'header')
+        self.assertEqual(body, b'body')
+        # Both results are views on the same receive chunk.
+        self.assertIs(header.obj, body.obj)
+        self.assertEqual(len(stream._buffer), 0)
+
+        # Received data doesn't overwrite data returned earlier.
+        self.feed_buffered(stream, b'trailer')
+        self.assertEqual(header, b'header')
+        data = self.loop.run_until_complete(stream.readexactly(7))
+        self.assertEqual(data, b'trailer')
+
+    def test_readexactly_across_chunks(self):
+        stream = asyncio.BufferedStreamReader(limit=4, loop=self.loop)
+        stream.feed_data(b'abcdef')
+        stream.feed_data(b'ghijkl')
+        self.assertEqual(len(stream._buffer._segments), 2)
+
+        data = self.loop.run_until_complete(stream.readexactly(9))
+        self.assertEqual(data, b'abcdefghi')
+        self.assertEqual(stream._buffer._peek(0, 10), b'jkl')
+
+    def test_readexactly_eof(self):
+        stream = asyncio.BufferedStreamReader(loop=self.loop)
+        stream.feed_data(b'abc')
+        stream.feed_eof()
+        with self.assertRaises(asyncio.IncompleteReadError) as cm:
+            self.loop.run_until_complete(stream.readexactly(5))
+        self.assertEqual(cm.exception.partial, b'abc')
+        self.assertTrue(stream.at_eof())
+
+    def test_read(self):
+        stream = asyncio.BufferedStreamReader(loop=self.loop)
+        stream.feed_data(b'chunk1')
+        stream.feed_data(b'chunk2')
+        stream.feed_eof()
+        data = self.loop.run_until_complete(stream.read(4))
+        self.assertEqual(data, b'chun')
+        data = self.loop.run_until_complete(stream.read())
+        self.assertEqual(data, b'k1chunk2')
+        data = self.loop.run_until_complete(stream.read(4))
+        self.assertEqual(data, b'')
+
+    def test_readuntil_separator_across_chunks(self):
+        stream = asyncio.BufferedStreamReader(loop=self.loop)
+        stream._buffer._chunk_size = 4
+        stream.feed_data(b'QWEaa')
+        stream.feed_data(b'XYaa')
+        stream.feed_data(b'a')
+        stream.feed_data(b'rest\r')
+        stream.feed_data(b'\nmore')
+        self.assertEqual(len(stream._buffer._segments), 5)
+
+        data = self.loop.run_until_complete(stream.readuntil(b'aaa'))
+        self.assertEqual(data, b'QWEaaXYaaa')
+        data = self.loop.run_until_complete(stream.readuntil(b'\r\n'))
+        self.assertEqual(data, b'rest\r\n')
+        self.assertEqual(stream._buffer._peek(0, 10), b'more')
+
+    def test_readline(self):
+        stream = asyncio.BufferedStreamReader(loop=self.loop)
+        stream.feed_data(b'line1\nline2\nli')
+        lines = []
+
+        async def reader():
+            async for line in stream:
+                lines.append(bytes(line))
+
+        def cb():
+            stream.feed_data(b'ne3\n')
+            stream.feed_eof()
+        self.loop.call_soon(cb)
+        self.loop.run_until_complete(reader())
+        self.assertEqual(lines, [b'line1\n', b'line2\n', b'line3\n'])
+
+    def test_readline_limit(self):
+        stream = asyncio.BufferedStreamReader(limit=3, loop=self.loop)
+        stream.feed_data(b'li')
+        stream.feed_data(b'ne1\nl2\n')
+        self.assertRaises(
+            ValueError, self.loop.run_until_complete, stream.readline())
+        data = self.loop.run_until_complete(stream.readline())
+        self.assertEqual(data, b'l2\n')
+
+    def test_protocol_requires_buffered_reader(self):
+        with self.assertRaises(TypeError):
+            asyncio.BufferedStreamReaderProtocol(
+                asyncio.StreamReader(loop=self.loop), loop=self.loop)
+
+    def test_pause_reading(self):
+        transport = mock.Mock()
+        stream = asyncio.BufferedStreamReader(limit=1, loop=self.loop)
+        stream.set_transport(transport)
+        self.feed_buffered(stream, b'12')
+        self.assertFalse(transport.pause_reading.called)
+        self.feed_buffered(stream, b'3')
+        self.assertTrue(transport.pause_reading.called)
+        self.loop.run_until_complete(stream.readexactly(3))
+        self.assertTrue(transport.resume_reading.called)
+
+    def test_socket_transport(self):
+        rsock, wsock = socket.socketpair()
+        self.addCleanup(wsock.close)
+        reader = asyncio.BufferedStreamReader(loop=self.loop)
+        protocol = asyncio.BufferedStreamReaderProtocol(reader,
+                                                        loop=self.loop)
+        transport, _ = self.loop.run_until_complete(
+            self.loop.create_connection(lambda: protocol, sock=rsock))
+
+        payload = os.urandom(100000)
+        wsock.sendall(payload)
+        wsock.shutdown(socket.SHUT_WR)
+
+        async def read_frames():
+            frames = []
+            while True:
+                try:
+                    frames.append(bytes(await reader.readexactly(1000)))
+                except asyncio.IncompleteReadError as exc:
+                    self.assertEqual(exc.partial, b'')
+                    return b''.join(frames)
+
+        data = self.loop.run_until_complete(read_frames())
+        self.assertEqual(data, payload)
+        transport.close()
+
+
 if __name__ == '__main__':
     unittest.main()
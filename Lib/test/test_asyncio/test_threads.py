@@ -0,0 +1,256 @@
+"""Tests for asyncio/threads.py"""
+
+import asyncio
+import threading
+import unittest
+
+from contextvars import ContextVar
+from unittest import mock
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+class ToThreadTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(
+            self.loop.shutdown_default_executor())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        self.loop = None
+
+    def test_to_thread(self):
+        async def main():
+            return await asyncio.to_thread(sum, [40, 2])
+
+        result = self.loop.run_until_complete(main())
+        self.assertEqual(result, 42)
+
+    def test_to_thread_exception(self):
+        def raise_runtime():
+            raise RuntimeError("test")
+
+        async def main():
+            await asyncio.to_thread(raise_runtime)
+
+        with self.assertRaisesRegex(RuntimeError, "test"):
+            self.loop.run_until_complete(main())
+
+    def test_to_thread_once(self):
+        func = mock.Mock()
+
+        async def main():
+            await asyncio.to_thread(func)
+
+        self.loop.run_until_complete(main())
+        func.assert_called_once()
+
+    def test_to_thread_concurrent(self):
+        func = mock.Mock()
+
+        async def main():
+            futs = []
+            for _ in range(10):
+                fut = asyncio.to_thread(func)
+                futs.append(fut)
+            await asyncio.gather(*futs)
+
+        self.loop.run_until_complete(main())
+        self.assertEqual(func.call_count, 10)
+
+    def test_to_thread_args_kwargs(self):
+        # Unlike run_in_executor(), to_thread() should directly accept kwargs.
+        func = mock.Mock()
+
+        async def main():
+            await asyncio.to_thread(func, 'test', something=True)
+
+        self.loop.run_until_complete(main())
+        func.assert_called_once_with('test', something=True)
+
+    def test_to_thread_contextvars(self):
+        test_ctx = ContextVar('test_ctx')
+
+        def get_ctx():
+            return test_ctx.get()
+
+        async def main():
+            test_ctx.set('parrot')
+            return await asyncio.to_thread(get_ctx)
+
+        result = self.loop.run_until_complete(main())
+        self.assertEqual(result, 'parrot')
+
+
+class ThreadLaneTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.lane = asyncio.ThreadLane('test', max_workers=2)
+
+    def tearDown(self):
+        self.lane.shutdown()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        self.loop = None
+
+    def test_repr(self):
+        self.assertEqual(self.lane.name, 'test')
+        self.assertEqual(self.lane.max_workers, 2)
+        self.assertEqual(repr(self.lane), "<ThreadLane 'test' max_workers=2>")
+
+    def test_run(self):
+        async def main():
+            return await self.lane.run(sum, [40, 2])
+
+        self.assertEqual(self.loop.run_until_complete(main()), 42)
+
+    def test_run_args_kwargs(self):
+        func = mock.Mock()
+
+        async def main():
+            await self.lane.run(func, 'test', something=True)
+
+        self.loop.run_until_complete(main())
+        func.assert_called_once_with('test', something=True)
+
+    def test_run_thread_name(self):
+        async def main():
+            return await self.lane.run(threading.current_thread)
+
+        thread = self.loop.run_until_complete(main())
+        self.assertIsNot(thread, threading.current_thread())
+        self.assertTrue(thread.name.startswith('asyncio-test'))
+
+    def test_run_exception(self):
+        def raise_runtime():
+            raise RuntimeError("test")
+
+        async def main():
+            await self.lane.run(raise_runtime)
+
+        with self.assertRaisesRegex(RuntimeError, "test"):
+            self.loop.run_until_complete(main())
+
+    def test_run_stop_iteration(self):
+        def raise_stop():
+            raise StopIteration
+
+        async def main():
+            await self.lane.run(raise_stop)
+
+        with self.assertRaises(RuntimeError) as cm:
+            self.loop.run_until_complete(main())
+        self.assertIsInstance(cm.exception.__cause__, StopIteration)
+
+    def test_run_contextvars(self):
+        test_ctx = ContextVar('test_ctx')
+
+        def get_ctx():
+            test_ctx.set('changed')
+            return 'parrot'
+
+        async def main():
+            test_ctx.set('parrot')
+            result = await self.lane.run(test_ctx.get)
+            # The function runs in a copy of the context.
+            await self.lane.run(get_ctx)
+            return result, test_ctx.get()
+
+        result = self.loop.run_until_complete(main())
+        self.assertEqual(result, ('parrot', 'parrot'))
+
+    def test_max_workers(self):
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+        release = threading.Event()
+
+        def func():
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            release.wait(5)
+            with lock:
+                running -= 1
+
+        async def main():
+            tasks = [self.loop.create_task(self.lane.run(func))
+                     for _ in range(5)]
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.gather(*tasks)
+
+        self.loop.run_until_complete(main())
+        self.assertEqual(max_running, 2)
+
+    def test_cancel_before_start(self):
+        release = threading.Event()
+        func = mock.Mock()
+
+        def block():
+            release.wait(5)
+
+        async def main():
+            blockers = [self.loop.create_task(self.lane.run(block))
+                        for _ in range(2)]
+            task = self.loop.create_task(self.lane.run(func))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            release.set()
+            await asyncio.gather(*blockers)
+
+        self.loop.run_until_complete(main())
+        self.lane.shutdown()
+        func.assert_not_called()
+
+    def test_cancel_while_running(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+            return 'result'
+
+        async def main():
+            task = self.loop.create_task(self.lane.run(block))
+            await self.loop.run_in_executor(None, started.wait)
+            task.cancel()
+            release.set()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.loop.run_until_complete(main())
+        self.lane.shutdown()
+        # The result delivered after the cancellation is ignored.
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.run_until_complete(self.loop.shutdown_default_executor())
+
+    def test_shared_between_loops(self):
+        async def main():
+            return await self.lane.run(threading.get_ident)
+
+        self.loop.run_until_complete(main())
+        self.assertIsInstance(asyncio.run(main()), int)
+
+    def test_shutdown(self):
+        self.lane.shutdown()
+
+        async def main():
+            await self.lane.run(mock.Mock())
+
+        with self.assertRaises(RuntimeError):
+            self.loop.run_until_complete(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
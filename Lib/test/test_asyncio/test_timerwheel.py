@@ -0,0 +1,126 @@
+"""Tests for timerwheel.py"""
+
+import random
+import unittest
+from unittest import mock
+
+import asyncio
+from asyncio import timerwheel
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+class TimerWheelTests(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = mock.Mock()
+
+    def make_handle(self, when):
+        return asyncio.TimerHandle(when, lambda: None, (), self.loop, None)
+
+    def expire(self, wheel, now):
+        ready = []
+        wheel.expire(now, ready)
+        return ready
+
+    def test_invalid_resolution(self):
+        self.assertRaises(ValueError, timerwheel.TimerWheel, 0, 0.0)
+        self.assertRaises(ValueError, timerwheel.TimerWheel, -1, 0.0)
+
+    def test_expire_order(self):
+        wheel = timerwheel.TimerWheel(0.01, 100.0)
+        whens = [100.5, 100.05, 100.0, 99.0, 100.051, 100.3]
+        handles = [self.make_handle(when) for when in whens]
+        for handle in handles:
+            wheel.add(handle)
+        self.assertEqual(len(wheel), len(handles))
+
+        ready = self.expire(wheel, 100.0)
+        self.assertEqual([h.when() for h in ready], [99.0, 100.0])
+        ready = self.expire(wheel, 100.06)
+        self.assertEqual([h.when() for h in ready], [100.05, 100.051])
+        ready = self.expire(wheel, 101.0)
+        self.assertEqual([h.when() for h in ready], [100.3, 100.5])
+        self.assertEqual(len(wheel), 0)
+
+    def test_never_early(self):
+        wheel = timerwheel.TimerWheel(0.1, 0.0)
+        handle = self.make_handle(1.05)
+        wheel.add(handle)
+        self.assertEqual(self.expire(wheel, 1.05), [])
+        self.assertEqual(self.expire(wheel, 1.1), [handle])
+
+    def test_remove(self):
+        wheel = timerwheel.TimerWheel(1, 0.0)
+        near = self.make_handle(5)
+        far = self.make_handle(100000)
+        wheel.add(near)
+        wheel.add(far)
+        wheel.remove(near)
+        wheel.remove(far)
+        wheel.remove(far)
+        self.assertEqual(len(wheel), 0)
+        self.assertIsNone(wheel.next_expiry())
+        self.assertEqual(self.expire(wheel, 200000), [])
+
+    def test_cascade(self):
+        wheel = timerwheel.TimerWheel(1, 0.0)
+        # One timer for each level of the wheel, and one beyond the range
+        # of the wheel.
+        whens = [10, 1000, 70000, 20000000, 2 ** 33]
+        handles = [self.make_handle(when) for when in whens]
+        for handle in reversed(handles):
+            wheel.add(handle)
+        for handle in handles:
+            self.assertEqual(self.expire(wheel, handle.when() - 1), [])
+            self.assertEqual(self.expire(wheel, handle.when()), [handle])
+        self.assertEqual(len(wheel), 0)
+
+    def test_next_expiry(self):
+        wheel = timerwheel.TimerWheel(1, 0.0)
+        self.assertIsNone(wheel.next_expiry())
+        wheel.add(self.make_handle(10))
+        self.assertEqual(wheel.next_expiry(), 10)
+        wheel.add(self.make_handle(5000))
+        self.assertEqual(wheel.next_expiry(), 10)
+        self.expire(wheel, 10)
+        # Nothing in the first level: wake up at the next cascade.
+        self.assertEqual(wheel.next_expiry(), 256)
+
+    def test_random(self):
+        rnd = random.Random(42)
+        wheel = timerwheel.TimerWheel(0.001, 0.0)
+        handles = [self.make_handle(rnd.uniform(0, 500)) for _ in range(2000)]
+        for handle in handles:
+            wheel.add(handle)
+        removed = set(rnd.sample(range(len(handles)), 500))
+        for i in removed:
+            wheel.remove(handles[i])
+
+        expired = []
+        now = 0.0
+        while len(wheel):
+            now += rnd.uniform(0, 2)
+            for handle in self.expire(wheel, now):
+                self.assertLessEqual(handle.when(), now)
+                expired.append(handle)
+        expected = [h for i, h in enumerate(handles) if i not in removed]
+        self.assertEqual(sorted(map(id, expired)), sorted(map(id, expected)))
+        self.assertEqual([h.when() for h in expired],
+                         sorted(h.when() for h in expected))
+
+    def test_clear(self):
+        wheel = timerwheel.TimerWheel(1, 0.0)
+        handles = [self.make_handle(when) for when in (1, 300, 70000)]
+        for handle in handles:
+            wheel.add(handle)
+        self.assertCountEqual(map(id, wheel.handles()), map(id, handles))
+        wheel.clear()
+        self.assertEqual(len(wheel), 0)
+        self.assertEqual(wheel.handles(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
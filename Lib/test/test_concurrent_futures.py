@@ -7,11 +7,13 @@ support.import_module('multiprocessing.synchronize')
 
 from test.support.script_helper import assert_python_ok
 
+import array
 import contextlib
 import itertools
 import logging
 from logging.handlers import QueueHandler
 import os
+import pickle
 import queue
 import sys
 import threading
@@ -24,11 +26,19 @@ from concurrent import futures
 from concurrent.futures._base import (
     PENDING, RUNNING, CANCELLED, CANCELLED_AND_NOTIFIED, FINISHED, Future,
     BrokenExecutor)
-from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures.process import BrokenProcessPool, _SharedMemoryResult
 from multiprocessing import get_context
 
 import multiprocessing.process
 import multiprocessing.util
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+requires_posix_shared_memory = unittest.skipUnless(
+    shared_memory is not None and shared_memory._USE_POSIX,
+    "requires POSIX shared memory")
 
 
 def create_future(state=PENDING, exception=None, result=None):
@@ -59,6 +69,11 @@ def sleep_and_raise(t):
     time.sleep(t)
     raise Exception('this is an exception')
 
+def sleep_and_return(t):
+    time.sleep(t)
+    return t
+
+
 def sleep_and_print(t, msg):
     time.sleep(t)
     print(msg)
@@ -98,6 +113,20 @@ def make_dummy_object(_):
     return MyObject()
 
 
+def make_large_results(size):
+    return (bytes(range(256)) * (size // 256), bytearray(size),
+            array.array('d', [1.5]) * (size // 8), b'small')
+
+
+class BufferObject(object):
+    """Object providing its buffer to pickle protocol 5."""
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        return BufferObject, (pickle.PickleBuffer(self.data),)
+
+
 class BaseTestCase(unittest.TestCase):
     def setUp(self):
         self._thread_key = support.threading_setup()
@@ -153,6 +182,10 @@ class ThreadPoolMixin(ExecutorMixin):
     executor_type = futures.ThreadPoolExecutor
 
 
+class ThreadPoolWorkStealingMixin(ThreadPoolMixin):
+    executor_kwargs = {'work_stealing': True}
+
+
 class ProcessPoolForkMixin(ExecutorMixin):
     executor_type = futures.ProcessPoolExecutor
     ctx = "fork"
@@ -547,6 +580,8 @@ class ProcessPoolShutdownTest(ExecutorShutdownTest):
         assert all([r == abs(v) for r, v in zip(res, range(-5, 5))])
 
 
+create_executor_tests(ExecutorShutdownTest,
+                      executor_mixins=(ThreadPoolWorkStealingMixin,))
 create_executor_tests(ProcessPoolShutdownTest,
                       executor_mixins=(ProcessPoolForkMixin,
                                        ProcessPoolForkserverMixin,
@@ -807,6 +842,72 @@ class ExecutorTest:
 
         self.assertEqual([None, None], results)
 
+    def test_map_buffersize(self):
+        consumed = []
+
+        def args():
+            for i in range(20):
+                consumed.append(i)
+                yield i
+
+        results = self.executor.map(pow, args(), itertools.repeat(2),
+                                    buffersize=3)
+        self.assertEqual(len(consumed), 3)
+        self.assertEqual(next(results), 0)
+        self.assertEqual(len(consumed), 4)
+        self.assertEqual(list(results), [i ** 2 for i in range(1, 20)])
+
+        results = self.executor.map(pow, itertools.count(),
+                                    itertools.repeat(2),
+                                    chunksize=3, buffersize=2)
+        self.assertEqual(list(itertools.islice(results, 10)),
+                         [i ** 2 for i in range(10)])
+        results.close()
+
+    def test_map_buffersize_unreferenced_executor(self):
+        # The iterator keeps the executor alive until all the calls are
+        # submitted.
+        if hasattr(self, "ctx"):
+            executor = self.executor_type(2, mp_context=self.get_context())
+        else:
+            executor = self.executor_type(2)
+        results = executor.map(pow, range(100), itertools.repeat(2),
+                               buffersize=2)
+        manager_thread = getattr(executor, '_executor_manager_thread', None)
+        del executor
+        support.gc_collect()
+        self.assertEqual(list(results), [i ** 2 for i in range(100)])
+        del results
+        support.gc_collect()
+        if manager_thread is not None:
+            manager_thread.join()
+
+    def test_map_buffersize_invalid(self):
+        with self.assertRaises(TypeError):
+            self.executor.map(str, range(3), buffersize=1.5)
+        with self.assertRaises(ValueError):
+            self.executor.map(str, range(3), buffersize=0)
+
+    def test_map_unordered(self):
+        for buffersize in (None, 2):
+            results = self.executor.map(sleep_and_return, [0.3, 0, 0.1, 0],
+                                        ordered=False, buffersize=buffersize)
+            results = list(results)
+            self.assertEqual(sorted(results), [0, 0, 0.1, 0.3])
+            self.assertNotEqual(results[0], 0.3)
+
+    def test_map_unordered_exception(self):
+        results = self.executor.map(divmod, [1, 1], [0, 1], ordered=False)
+        with self.assertRaises(ZeroDivisionError):
+            list(results)
+
+    def test_map_unordered_timeout(self):
+        results = self.executor.map(sleep_and_return, [0, 2], timeout=0.5,
+                                    ordered=False)
+        self.assertEqual(next(results), 0)
+        with self.assertRaises(futures.TimeoutError):
+            next(results)
+
     def test_shutdown_race_issue12456(self):
         # Issue #12456: race condition at shutdown where trying to post a
         # sentinel in the call queue blocks (the queue is full while processes
@@ -876,13 +977,119 @@ class ThreadPoolExecutorTest(ThreadPoolMixin, ExecutorTest, BaseTestCase):
         executor.shutdown(wait=True)
 
     def test_idle_thread_reuse(self):
-        executor = self.executor_type()
+        executor = self.executor_type(**self.executor_kwargs)
         executor.submit(mul, 21, 2).result()
         executor.submit(mul, 6, 7).result()
         executor.submit(mul, 3, 14).result()
         self.assertEqual(len(executor._threads), 1)
         executor.shutdown(wait=True)
 
+    def test_idle_timeout(self):
+        executor = self.executor_type(4, idle_timeout=0.1,
+                                      **self.executor_kwargs)
+        barrier = threading.Barrier(4)
+        fs = [executor.submit(barrier.wait) for _ in range(4)]
+        futures.wait(fs)
+        threads = list(executor._threads)
+        self.assertEqual(len(threads), 4)
+        for t in threads:
+            t.join(support.SHORT_TIMEOUT)
+            self.assertFalse(t.is_alive())
+        self.assertEqual(len(executor._threads), 0)
+        # New workers are started for the next calls.
+        self.assertEqual(list(executor.map(abs, range(-5, 5))),
+                         [5, 4, 3, 2, 1, 0, 1, 2, 3, 4])
+        self.assertEqual(executor.submit(mul, 6, 7).result(), 42)
+        executor.shutdown(wait=True)
+
+    def test_idle_timeout_busy(self):
+        # Workers kept busy do not time out.
+        executor = self.executor_type(2, idle_timeout=0.5,
+                                      **self.executor_kwargs)
+        for i in range(10):
+            self.assertEqual(executor.submit(mul, i, 2).result(), i * 2)
+            time.sleep(0.1)
+        self.assertEqual(len(executor._threads), 1)
+        executor.shutdown(wait=True)
+
+    def test_idle_timeout_invalid(self):
+        for idle_timeout in (0, -1):
+            with self.assertRaises(ValueError):
+                self.executor_type(idle_timeout=idle_timeout)
+        with self.assertRaises(TypeError):
+            self.executor_type(idle_timeout='1')
+
+
+class ThreadPoolWorkStealingExecutorTest(ThreadPoolWorkStealingMixin,
+                                         ThreadPoolExecutorTest):
+    def test_nested_submit(self):
+        # The calls submitted by a worker are queued in its own deque.
+        fs = []
+        def walk(depth):
+            if depth:
+                for _ in range(2):
+                    fs.append(self.executor.submit(walk, depth - 1))
+            return depth
+        fs.append(self.executor.submit(walk, 6))
+        i = 0
+        while i < len(fs):
+            fs[i].result()
+            i += 1
+        self.assertEqual(len(fs), 2 ** 7 - 1)
+        self.assertEqual(sum(f.result() for f in fs),
+                         sum(d * 2 ** (6 - d) for d in range(7)))
+
+    def test_work_stealing(self):
+        # A worker blocked on a call does not keep the calls queued in its
+        # deque from running.
+        executor = self.executor
+        event = threading.Event()
+        def spawn():
+            fs = [executor.submit(mul, i, 2) for i in range(20)]
+            futures.wait(fs)
+            event.set()
+            return [f.result() for f in fs]
+        self.assertEqual(executor.submit(spawn).result(),
+                         [i * 2 for i in range(20)])
+        self.assertTrue(event.is_set())
+
+    def test_cancel_futures_nested(self):
+        executor = self.executor_type(1, work_stealing=True)
+        submitted = threading.Event()
+        event = threading.Event()
+        def spawn():
+            fs = [executor.submit(mul, i, 2) for i in range(10)]
+            submitted.set()
+            event.wait()
+            return fs
+        f = executor.submit(spawn)
+        submitted.wait()
+        executor.shutdown(wait=False, cancel_futures=True)
+        event.set()
+        fs = f.result()
+        executor.shutdown(wait=True)
+        self.assertTrue(all(f.cancelled() for f in fs))
+
+
+class WorkStealingQueueTest(BaseTestCase):
+    def test_register_concurrently(self):
+        # Workers register and unregister their deques concurrently.
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, old_interval)
+        for _ in range(10):
+            work_queue = futures.thread._WorkStealingQueue()
+            barrier = threading.Barrier(8)
+            def worker():
+                barrier.wait()
+                for _ in range(100):
+                    work_queue.unregister(work_queue.register())
+                work_queue.register()
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            with support.start_threads(threads):
+                pass
+            self.assertEqual(len(work_queue._deques), 8)
+
 
 class ProcessPoolExecutorTest(ExecutorTest):
 
@@ -964,12 +1171,199 @@ class ProcessPoolExecutorTest(ExecutorTest):
         mgr.shutdown()
         mgr.join()
 
+    def test_map_adaptive_chunksize_unreferenced_executor(self):
+        # The iterator keeps the executor alive until all the calls are
+        # submitted.
+        executor = self.executor_type(2, mp_context=self.get_context())
+        results = executor.map(pow, range(1000), itertools.repeat(2),
+                               chunksize=None)
+        manager_thread = executor._executor_manager_thread
+        del executor
+        support.gc_collect()
+        self.assertEqual(list(results), [i ** 2 for i in range(1000)])
+        # The executor is collected once the iterator is exhausted.
+        del results
+        support.gc_collect()
+        manager_thread.join()
+
+    def test_map_adaptive_chunksize(self):
+        self.assertEqual(
+                list(self.executor.map(pow, range(100), range(100),
+                                       chunksize=None)),
+                list(map(pow, range(100), range(100))))
+        results = self.executor.map(pow, itertools.count(),
+                                    itertools.repeat(2),
+                                    chunksize=None)
+        self.assertEqual(list(itertools.islice(results, 1000)),
+                         [i ** 2 for i in range(1000)])
+        results.close()
+        results = self.executor.map(pow, range(100), range(100),
+                                    chunksize=None, ordered=False)
+        self.assertEqual(sorted(results),
+                         sorted(map(pow, range(100), range(100))))
+
+    def test_adaptive_chunks(self):
+        chunks = futures.process._AdaptiveChunks(range(100), range(100))
+        self.assertEqual(next(chunks), ((0, 0),))
+        # The size of the chunks at most doubles.
+        chunks.update(1, 0.0)
+        self.assertEqual(chunks.chunksize, 2)
+        chunks.update(2, 0.0)
+        self.assertEqual(next(chunks), ((1, 1), (2, 2), (3, 3), (4, 4)))
+        # It is updated from the average time of the calls.
+        chunks.update(4, futures.process.ADAPTIVE_CHUNK_TIME * 8)
+        self.assertEqual(chunks.chunksize, 1)
+        chunks.update(1, futures.process.ADAPTIVE_CHUNK_TIME / 3)
+        self.assertEqual(chunks.chunksize, 1)
+        chunks.update(1, 0.0)
+        self.assertEqual(chunks.chunksize, 2)
+        self.assertEqual(len(list(chunks)), 48)
+
+    @requires_posix_shared_memory
+    def test_shared_memory_threshold(self):
+        # not using self.executor as we need to control construction.
+        executor = self.executor_type(
+                2, mp_context=self.get_context(), shared_memory_threshold=1024)
+        expected = make_large_results(1024 * 1024)
+        self.assertEqual(executor.submit(make_large_results,
+                                         1024 * 1024).result(), expected)
+        results = list(executor.map(make_large_results, [512, 4096] * 4,
+                                    chunksize=3))
+        self.assertEqual(results, [make_large_results(512),
+                                   make_large_results(4096)] * 4)
+        self.assertEqual(list(executor.map(bytes, [2048] * 4, chunksize=2)),
+                         [bytes(2048)] * 4)
+        self.assertEqual(list(executor.map(bytes, [2048] * 4,
+                                           chunksize=None)),
+                         [bytes(2048)] * 4)
+        # Exceptions are sent as usual.
+        with self.assertRaises(ValueError):
+            executor.submit(make_large_results, -1).result()
+        executor.shutdown()
+
+    def test_shared_memory_threshold_invalid(self):
+        with self.assertRaises(TypeError):
+            self.executor_type(1, shared_memory_threshold=1.5)
+        with self.assertRaises(ValueError):
+            self.executor_type(1, shared_memory_threshold=0)
+
+    def test_max_tasks_per_child(self):
+        context = self.get_context()
+        if context.get_start_method(allow_none=False) == "fork":
+            with self.assertRaises(ValueError):
+                self.executor_type(1, mp_context=context,
+                                   max_tasks_per_child=3)
+            return
+        # not using self.executor as we need to control construction.
+        executor = self.executor_type(
+                1, mp_context=context, max_tasks_per_child=3)
+        original_pid = executor.submit(os.getpid).result()
+        # The worker is reused until it completed 3 tasks.
+        self.assertEqual(executor.submit(os.getpid).result(), original_pid)
+        self.assertEqual(executor.submit(os.getpid).result(), original_pid)
+
+        # Then it exits and a new worker replaces it.
+        new_pid = executor.submit(os.getpid).result()
+        self.assertNotEqual(new_pid, original_pid)
+        self.assertEqual(list(executor._processes), [new_pid])
+        executor.shutdown()
+
+    def test_max_tasks_per_child_defaults_to_spawn_context(self):
+        executor = self.executor_type(1, max_tasks_per_child=3)
+        self.assertEqual(executor._mp_context.get_start_method(), "spawn")
+
+    def test_max_tasks_per_child_invalid(self):
+        with self.assertRaises(TypeError):
+            self.executor_type(1, max_tasks_per_child=1.5)
+        with self.assertRaises(ValueError):
+            self.executor_type(1, max_tasks_per_child=0)
+
+    def test_max_tasks_early_shutdown(self):
+        context = self.get_context()
+        if context.get_start_method(allow_none=False) == "fork":
+            raise unittest.SkipTest("Incompatible with the fork start method.")
+        # not using self.executor as we need to control construction.
+        executor = self.executor_type(
+                3, mp_context=context, max_tasks_per_child=1)
+        futures = [executor.submit(mul, i, i) for i in range(6)]
+        manager_thread = executor._executor_manager_thread
+        processes = executor._processes
+        # Exited workers are still replaced while work is pending.
+        executor.shutdown(wait=False)
+        for i, future in enumerate(futures):
+            self.assertEqual(future.result(), mul(i, i))
+        support.join_thread(manager_thread, support.SHORT_TIMEOUT)
+        for p in processes.values():
+            self.assertFalse(p.is_alive())
+
 
 create_executor_tests(ProcessPoolExecutorTest,
                       executor_mixins=(ProcessPoolForkMixin,
                                        ProcessPoolForkserverMixin,
                                        ProcessPoolSpawnMixin))
 
+
+@requires_posix_shared_memory
+class SharedMemoryResultTest(BaseTestCase):
+    def assertDestroyed(self, blocks):
+        for name, _, _ in blocks:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name)
+
+    def roundtrip(self, obj, threshold=1024):
+        result = _SharedMemoryResult(obj, threshold)
+        result = pickle.loads(pickle.dumps(result))
+        blocks = list(result.blocks)
+        loaded = result.load()
+        self.assertDestroyed(blocks)
+        return loaded, blocks
+
+    def test_buffers(self):
+        obj = make_large_results(4096)
+        loaded, blocks = self.roundtrip(obj)
+        self.assertEqual(loaded, obj)
+        self.assertEqual([(size, copy) for _, size, copy in blocks],
+                         [(4096, False)] * 3)
+
+    def test_small_buffers(self):
+        obj = make_large_results(512)
+        loaded, blocks = self.roundtrip(obj)
+        self.assertEqual(loaded, obj)
+        self.assertEqual(blocks, [])
+
+    def test_map_chunk(self):
+        obj = [bytes(2048), b'small', bytes(4096)]
+        loaded, blocks = self.roundtrip(obj)
+        self.assertEqual(loaded, obj)
+        self.assertEqual(len(blocks), 2)
+
+    def test_timed_map_chunk(self):
+        # Results of a chunk of map(chunksize=None)
+        obj = (0.5, [bytes(2048), b'small', bytes(4096)])
+        loaded, blocks = self.roundtrip(obj)
+        self.assertEqual(loaded, obj)
+        self.assertEqual(len(blocks), 2)
+        # Only two levels of lists and tuples are searched for buffers
+        obj = [[[bytes(4096)]], (bytes(4096),)]
+        loaded, blocks = self.roundtrip(obj)
+        self.assertEqual(loaded, obj)
+        self.assertEqual(len(blocks), 1)
+
+    def test_pickle_buffer(self):
+        # Objects providing their own buffers are given a copy of the
+        # shared memory, which is destroyed.
+        loaded, blocks = self.roundtrip(BufferObject(bytearray(b'x' * 4096)))
+        self.assertEqual([copy for _, _, copy in blocks], [True])
+        self.assertEqual(bytes(loaded.data), b'x' * 4096)
+
+    def test_unlink(self):
+        result = _SharedMemoryResult([bytes(4096), bytes(4096)], 1024)
+        blocks = list(result.blocks)
+        self.assertEqual(len(blocks), 2)
+        result.unlink()
+        self.assertDestroyed(blocks)
+        self.assertEqual(result.blocks, [])
+
 def hide_process_stderr():
     import io
     sys.stderr = io.StringIO()
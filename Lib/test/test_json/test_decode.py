@@ -62,6 +62,28 @@ class TestDecode:
         self.check_keys_reuse(s, decoder.decode)
         self.assertFalse(decoder.memo)
 
+    def test_key_cache_size(self):
+        decoder = self.json.decoder.JSONDecoder(key_cache_size=3)
+        a = decoder.decode('{"a_key": 1, "b_key": [{"a_key": 2}]}')
+        b = decoder.decode('[{"b_key": 3, "a_key": 4}]')[0]
+        self.assertEqual(b, {"a_key": 4, "b_key": 3})
+        for x, y in zip(sorted(a), sorted(b)):
+            self.assertIs(x, y)
+        [c] = decoder.iterdecode(['[{"a_k', 'ey": 5}]'])
+        self.assertIs(next(iter(c)), next(iter(sorted(a))))
+        # The cache is emptied when it holds too many keys
+        decoder.decode('{"c_key": 6, "d_key": 7}')
+        d = decoder.decode('{"a_key": 8}')
+        self.assertEqual(d, {"a_key": 8})
+        self.assertIsNot(next(iter(d)), next(iter(sorted(a))))
+
+    def test_key_cache_size_default(self):
+        decoder = self.json.decoder.JSONDecoder()
+        self.assertEqual(decoder.key_cache_size, 0)
+        a = decoder.decode('{"a_key": 1}')
+        b = decoder.decode('{"a_key": 2}')
+        self.assertIsNot(next(iter(a)), next(iter(b)))
+
     def test_extra_data(self):
         s = '[1, 2, 3]5'
         msg = 'Extra data'
@@ -12,6 +12,28 @@ class TestDump:
     def test_dumps(self):
         self.assertEqual(self.dumps({}), '{}')
 
+    def test_dump_chunks(self):
+        obj = [{'key': i, 'values': [i] * 5} for i in range(5000)]
+        for indent in (None, 2):
+            with self.subTest(indent=indent):
+                chunks = []
+                class File:
+                    write = chunks.append
+                self.json.dump(obj, File, indent=indent)
+                # The document is written in several chunks
+                self.assertGreater(len(chunks), 1)
+                self.assertEqual(''.join(chunks),
+                                 self.dumps(obj, indent=indent))
+
+    def test_dump_overridden_iterencode(self):
+        class Encoder(self.json.JSONEncoder):
+            def iterencode(self, o, _one_shot=False):
+                yield from super().iterencode(o, _one_shot)
+                yield '\n'
+        sio = StringIO()
+        self.json.dump([1, 2], sio, cls=Encoder)
+        self.assertEqual(sio.getvalue(), '[1, 2]\n')
+
     def test_dump_skipkeys(self):
         v = {b'invalid_key': False, 'valid_key': True}
         with self.assertRaises(TypeError):
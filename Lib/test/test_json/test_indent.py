@@ -62,6 +62,20 @@ class TestIndent:
         # indent=None is more compact
         check(None, '{"3": 1}')
 
+    def test_indent_nested(self):
+        h = {'a': [1, [2, {'b': [], 'c': {}}], {'d': [3.5, None]}],
+             'e': {'f': {'g': [True, 'h']}}}
+        for indent in (0, 1, 4, '\t', ' \t'):
+            with self.subTest(indent=indent):
+                encoder = self.json.JSONEncoder(indent=indent, sort_keys=True)
+                # iterencode() streams from the pure Python encoder
+                expected = ''.join(encoder.iterencode(h))
+                self.assertEqual(encoder.encode(h), expected)
+                sio = StringIO()
+                self.json.dump(h, sio, indent=indent, sort_keys=True)
+                self.assertEqual(sio.getvalue(), expected)
+                self.assertEqual(self.loads(expected), h)
+
 
 class TestPyIndent(TestIndent, PyTest): pass
 class TestCIndent(TestIndent, CTest): pass
@@ -22,6 +22,30 @@ class TestDecode(CTest):
     def test_make_scanner(self):
         self.assertRaises(AttributeError, self.json.scanner.c_make_scanner, 1)
 
+    def test_make_scanner_bytes(self):
+        decoder = self.json.decoder.JSONDecoder()
+        scanner = self.json.scanner.c_make_scanner(decoder)
+        # Indices are byte offsets in bytes-like objects
+        self.assertEqual(scanner(b'["\xc3\xa9"] ', 0), (['\xe9'], 6))
+        self.assertEqual(scanner(memoryview(b' {"a": 1}'), 1), ({'a': 1}, 9))
+        self.assertEqual(scanner('["\xe9"] ', 0), (['\xe9'], 5))
+        self.assertRaises(TypeError, scanner, 1, 0)
+
+    def test_make_scanner_key_cache_size(self):
+        class Context:
+            strict = True
+            object_hook = object_pairs_hook = None
+            parse_float = float
+            parse_int = int
+            parse_constant = None
+        make_scanner = self.json.scanner.c_make_scanner
+        # key_cache_size is optional
+        self.assertEqual(make_scanner(Context()).key_cache_size, 0)
+        Context.key_cache_size = 10
+        self.assertEqual(make_scanner(Context()).key_cache_size, 10)
+        Context.key_cache_size = 'spam'
+        self.assertRaises(TypeError, make_scanner, Context())
+
     def test_bad_bool_args(self):
         def test(value):
             self.json.decoder.JSONDecoder(strict=BadBool()).decode(value)
@@ -38,6 +62,31 @@ class TestEncode(CTest):
             b"\xCD\x7D\x3D\x4E\x12\x4C\xF9\x79\xD7\x52\xBA\x82\xF2\x27\x4A\x7D\xA0\xCA\x75",
             None)
 
+    def test_make_encoder_indent(self):
+        c_make_encoder = self.json.encoder.c_make_encoder
+        self.assertRaises(TypeError, c_make_encoder, None, str,
+                          self.json.encoder.c_encode_basestring, 2,
+                          ': ', ', ', False, False, False)
+        enc = c_make_encoder(None, str, self.json.encoder.c_encode_basestring,
+                             '  ', ': ', ',', False, False, False)
+        self.assertEqual(''.join(enc([1, {'a': []}], 0)),
+                         '[\n  1,\n  {\n    "a": []\n  }\n]')
+        self.assertEqual(''.join(enc([1], 1)), '[\n    1\n  ]')
+
+    def test_encoder_write(self):
+        enc = self.json.encoder.c_make_encoder(
+            None, str, self.json.encoder.c_encode_basestring, None,
+            ': ', ', ', False, False, False)
+        chunks = []
+        self.assertIsNone(enc(list(range(10000)), 0, chunks.append))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), str(list(range(10000))))
+
+        def write(chunk):
+            1/0
+        with self.assertRaises(ZeroDivisionError):
+            enc(list(range(10000)), 0, write)
+
     def test_bad_str_encoder(self):
         # Issue #31505: There shouldn't be an assertion failure in case
         # c_make_encoder() receives a bad encoder() argument.
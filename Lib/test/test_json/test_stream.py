@@ -0,0 +1,120 @@
+from io import BytesIO, StringIO
+from test.test_json import PyTest, CTest
+
+
+def split(s, size):
+    return [s[i:i + size] for i in range(0, len(s), size)]
+
+
+class TestStream:
+    doc = {'meta': {'count': 5},
+           'data': [1, -2.5e-3, 'spam \\"\u20ac\U0001f600', [], {},
+                    {'a': [None, True, False]}, 12345678901234567890],
+           'end': 'eggs'}
+
+    def test_iterdecode(self):
+        s = self.dumps(self.doc, indent=1)
+        decoder = self.json.JSONDecoder()
+        for size in (1, 2, 3, 5, 16, len(s)):
+            with self.subTest(size=size):
+                chunks = split(s, size)
+                self.assertEqual(list(decoder.iterdecode(chunks)),
+                                 list(self.doc.items()))
+                self.assertEqual(list(decoder.iterdecode(chunks, ['data'])),
+                                 self.doc['data'])
+                self.assertEqual(
+                    list(decoder.iterdecode(chunks, ['data', 5])),
+                    [('a', [None, True, False])])
+                # No array or object at path
+                self.assertEqual(
+                    list(decoder.iterdecode(chunks, ['meta', 'count'])), [])
+                self.assertEqual(
+                    list(decoder.iterdecode(chunks, ['missing'])), [])
+
+    def test_iterdecode_scalar(self):
+        decoder = self.json.JSONDecoder()
+        self.assertEqual(list(decoder.iterdecode(['[]'])), [])
+        self.assertEqual(list(decoder.iterdecode(['{', '}'])), [])
+        self.assertEqual(list(decoder.iterdecode(['1', '23 '])), [])
+        self.assertEqual(list(decoder.iterdecode([' [1', '2.', '5e', '+1]'])),
+                         [12.5e1])
+
+    def test_iterdecode_errors(self):
+        decoder = self.json.JSONDecoder()
+        for s in ['', '[1, 2', '[1 2]', '[1, 2] x', '{"a" 1}', '{1: 2}',
+                  '[1,\n 2,\n "abc', '[1,\n\n  tru]', '[1, 2,]', '{"a": 1,}',
+                  '[\n"\\u12"]']:
+            with self.assertRaises(self.JSONDecodeError) as cm:
+                self.loads(s)
+            expected = cm.exception
+            for size in (1, 4, 100):
+                with self.subTest(s=s, size=size):
+                    with self.assertRaises(self.JSONDecodeError) as cm:
+                        list(decoder.iterdecode(split(s, size)))
+                    err = cm.exception
+                    self.assertEqual(str(err), str(expected))
+                    self.assertEqual(err.msg, expected.msg)
+                    self.assertEqual((err.pos, err.lineno, err.colno),
+                                     (expected.pos, expected.lineno,
+                                      expected.colno))
+
+    def test_iterload(self):
+        s = self.dumps(self.doc)
+        self.assertEqual(list(self.json.iterload(StringIO(s))),
+                         list(self.doc.items()))
+        self.assertEqual(list(self.json.iterload(StringIO(s),
+                                                 path=('data', 5, 'a'))),
+                         [None, True, False])
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-32-be'):
+            with self.subTest(encoding=encoding):
+                fp = BytesIO(s.encode(encoding))
+                self.assertEqual(list(self.json.iterload(fp, path=['data'])),
+                                 self.doc['data'])
+        items = self.json.iterload(StringIO('[1.5, {"a": 2}]'),
+                                   parse_float=str,
+                                   object_pairs_hook=lambda pairs: pairs)
+        self.assertEqual(list(items), ['1.5', [('a', 2)]])
+        with self.assertRaises(self.JSONDecodeError):
+            list(self.json.iterload(StringIO('\ufeff[]')))
+
+    def test_iterload_large(self):
+        data = [{'id': i, 'name': 'x' * (i % 100)} for i in range(20000)]
+        s = self.dumps(data)
+        self.assertGreater(len(s), 65536 * 8)
+        self.assertEqual(list(self.json.iterload(StringIO(s))), data)
+        # A value larger than the chunks
+        data = ['y' * 300000, 'z']
+        self.assertEqual(list(self.json.iterload(StringIO(self.dumps(data)))),
+                         data)
+
+    def test_lines(self):
+        objs = [{'a': 1}, [1, 'x\ny'], 'line\u2028separator', None, 2.5]
+        fp = StringIO()
+        self.json.dumplines(objs, fp)
+        s = fp.getvalue()
+        self.assertEqual(s.count('\n'), len(objs))
+        self.assertEqual(list(self.json.loadlines(StringIO(s))), objs)
+        fp = StringIO()
+        self.json.dumplines(objs, fp, sort_keys=True, separators=(',', ':'),
+                            ensure_ascii=False)
+        self.assertEqual(fp.getvalue().splitlines()[1], '[1,"x\\ny"]')
+        self.assertRaises(TypeError, self.json.dumplines, objs, StringIO(),
+                          indent=2)
+        # Blank lines are skipped, bytes are decoded
+        lines = [b'1\n', b'\n', b'  \r\n', '[2]\n'.encode('utf-8-sig'), b'3']
+        self.assertEqual(list(self.json.loadlines(lines)), [1, [2], 3])
+        self.assertEqual(list(self.json.loadlines(['{"a": 1.5}\n'],
+                                                  parse_float=str)),
+                         [{'a': '1.5'}])
+
+    def test_loadlines_errors(self):
+        with self.assertRaises(self.JSONDecodeError) as cm:
+            list(self.json.loadlines(StringIO('1\n[2]\n\n[3 4]\n5\n')))
+        err = cm.exception
+        self.assertEqual(err.msg, "Expecting ',' delimiter")
+        self.assertEqual((err.pos, err.lineno, err.colno), (10, 4, 4))
+        self.assertIn('line 4 column 4 (char 10)', str(err))
+
+
+class TestPyStream(TestStream, PyTest): pass
+class TestCStream(TestStream, CTest): pass
@@ -1,4 +1,7 @@
+import array
 import codecs
+import mmap
+import tempfile
 from collections import OrderedDict
 from test.test_json import PyTest, CTest
 
@@ -79,6 +82,60 @@ class TestUnicode:
         self.assertEqual(self.loads(b'\x007'), 7)
         self.assertEqual(self.loads(b'57'), 57)
 
+    def test_bytes_like_decode(self):
+        data = {"a\xb5": ["\u20ac\U0001d120", 1, 2.5, None, True]}
+        encoded = self.dumps(data).encode('utf-8')
+        for s in (bytearray(encoded), memoryview(encoded),
+                  memoryview(b'x' + encoded + b'x')[1:-1],
+                  array.array('b', encoded),
+                  memoryview(encoded.decode('utf-8').encode('utf-16'))):
+            with self.subTest(s=s):
+                self.assertEqual(self.loads(s), data)
+        with tempfile.TemporaryFile() as f:
+            f.write(encoded)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0) as m:
+                self.assertEqual(self.loads(m), data)
+        # Lone surrogates are accepted, as in str input
+        self.assertEqual(self.loads(b'["\xed\xa0\x80"]'), ['\ud800'])
+        self.assertRaises(UnicodeDecodeError, self.loads, b'{"\xff": 1}')
+        with self.assertRaisesRegex(TypeError, 'bytes-like object, not int'):
+            self.loads(1)
+
+    def test_bytes_decode_error_position(self):
+        # Positions are reported in characters of the decoded document
+        for doc in ('["\xe9\u20ac", x]', '["\xe9\u20ac"] 1',
+                    '{"\xe9\u20ac" 1}', '["\xe9\u20ac\\u12"]', '  '):
+            with self.subTest(doc=doc):
+                with self.assertRaises(self.JSONDecodeError) as cm:
+                    self.loads(doc)
+                expected = cm.exception
+                with self.assertRaises(self.JSONDecodeError) as cm:
+                    self.loads(doc.encode('utf-8'))
+                err = cm.exception
+                self.assertEqual(err.msg, expected.msg)
+                self.assertEqual(err.pos, expected.pos)
+                self.assertEqual(err.doc, doc)
+
+    def test_bytes_decode_subclass(self):
+        class Decoder(self.json.JSONDecoder):
+            def decode(self, s):
+                return ('decoded', super().decode(s))
+        self.assertEqual(self.loads(b'[1]', cls=Decoder), ('decoded', [1]))
+
+    def test_bytes_decode_duck_typed(self):
+        class Decoder:
+            def decode(self, s):
+                return ('decoded', s)
+        self.assertEqual(self.loads(b'[1]', cls=Decoder),
+                         ('decoded', '[1]'))
+        self.assertEqual(self.loads('\ufeff[1]'.encode('utf-8'),
+                                    cls=Decoder),
+                         ('decoded', '[1]'))
+        self.assertEqual(self.loads(memoryview(b'"\xc3\xa9"'),
+                                    cls=Decoder),
+                         ('decoded', '"\xe9"'))
+
     def test_object_pairs_hook_with_unicode(self):
         s = '{"xkd":1, "kcw":2, "art":3, "hxm":4, "qrt":5, "pad":6, "hoy":7}'
         p = [("xkd", 1), ("kcw", 2), ("art", 3), ("hxm", 4),
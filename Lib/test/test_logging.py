@@ -754,6 +754,17 @@ class StreamWithIntName(object):
     level = logging.NOTSET
     name = 2
 
+class CountingStream(io.StringIO):
+    writes = flushes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
 class StreamHandlerTest(BaseTest):
     def test_error_handling(self):
         h = TestStreamHandler(BadStream())
@@ -795,6 +806,44 @@ class StreamHandlerTest(BaseTest):
         h = logging.StreamHandler(StreamWithIntName())
         self.assertEqual(repr(h), '<StreamHandler 2 (NOTSET)>')
 
+    def test_emit_batch(self):
+        stream = CountingStream()
+        h = logging.StreamHandler(stream)
+        h.addFilter(lambda record: record.msg != 'skipped')
+        records = [logging.makeLogRecord({'msg': msg})
+                   for msg in ('one', 'skipped', 'two', 'three')]
+        self.assertEqual(h.handle_batch(records),
+                         [records[0], records[2], records[3]])
+        self.assertEqual(stream.getvalue(), 'one\ntwo\nthree\n')
+        self.assertEqual((stream.writes, stream.flushes), (1, 1))
+        self.assertEqual(h.handle_batch(records[1:2]), [])
+        self.assertEqual((stream.writes, stream.flushes), (1, 1))
+
+        # An overridden emit() is called for each record
+        class Handler(logging.StreamHandler):
+            def emit(self, record):
+                record.msg = record.msg.upper()
+                super().emit(record)
+        stream = CountingStream()
+        Handler(stream).handle_batch(records[2:])
+        self.assertEqual(stream.getvalue(), 'TWO\nTHREE\n')
+        self.assertEqual((stream.writes, stream.flushes), (2, 2))
+
+    def test_emit_batch_error_handling(self):
+        stream = CountingStream()
+        h = TestStreamHandler(stream)
+        good = logging.makeLogRecord({'msg': 'good'})
+        bad = logging.makeLogRecord({'msg': '%d', 'args': ('x',)})
+        h.emit_batch([good, bad, good])
+        self.assertIs(h.error_record, bad)
+        self.assertEqual(stream.getvalue(), 'good\ngood\n')
+
+        h = TestStreamHandler(BadStream())
+        h.emit_batch([good, bad])
+        self.assertIs(h.error_record, bad)
+        h.emit_batch([bad, good])
+        self.assertIs(h.error_record, good)
+
 # -- The following section could be moved into a server_helper.py module
 # -- if it proves to be of wider utility than just test_logging
 
@@ -3582,6 +3631,67 @@ class QueueHandlerTest(BaseTest):
         listener.stop()
         self.assertEqual(self.stream.getvalue().strip(), "que -> ERROR: error")
 
+    def test_queue_handler_dropped(self):
+        self.que_hdlr.queue = queue.Queue(2)
+        with support.swap_attr(logging, 'raiseExceptions', False):
+            for _ in range(5):
+                self.que_logger.warning(self.next_message())
+        self.assertEqual(self.que_hdlr.dropped, 3)
+        self.assertEqual(self.que_hdlr.queue.qsize(), 2)
+
+    @unittest.skipUnless(hasattr(logging.handlers, 'QueueListener'),
+                         'logging.handlers.QueueListener required for this test')
+    def test_queue_listener_batches(self):
+        stream = CountingStream()
+        handler = logging.StreamHandler(stream)
+        listener = logging.handlers.QueueListener(self.queue, handler,
+                                                  batch_size=10)
+        for i in range(25):
+            self.que_logger.warning(str(i))
+        listener.start()
+        listener.stop()
+        self.assertEqual(stream.getvalue(),
+                         ''.join('%d\n' % i for i in range(25)))
+        self.assertEqual(stream.writes, 3)
+        self.assertEqual((listener.handled, listener.batches), (25, 3))
+        # 15 records and the sentinel if it was enqueued in time
+        self.assertIn(listener.max_queue_depth, (15, 16))
+        self.assertEqual(listener.queue_depth(), 0)
+        self.assertEqual(self.queue.unfinished_tasks, 0)
+
+        # Now test with respect_handler_level set
+        handler = support.TestHandler(support.Matcher())
+        handler.setLevel(logging.CRITICAL)
+        listener = logging.handlers.QueueListener(self.queue, handler,
+                                                  respect_handler_level=True,
+                                                  batch_size=10)
+        self.que_logger.warning(self.next_message())
+        self.que_logger.critical(self.next_message())
+        listener.start()
+        listener.stop()
+        self.assertEqual([r['levelno'] for r in handler.buffer],
+                         [logging.CRITICAL])
+        handler.close()
+
+    @unittest.skipUnless(hasattr(logging.handlers, 'QueueListener'),
+                         'logging.handlers.QueueListener required for this test')
+    def test_queue_listener_batch_timeout(self):
+        stream = CountingStream()
+        handler = logging.StreamHandler(stream)
+        listener = logging.handlers.QueueListener(self.queue, handler,
+                                                  batch_size=100,
+                                                  batch_timeout=0.05)
+        listener.start()
+        try:
+            for i in range(5):
+                self.que_logger.warning(str(i))
+        finally:
+            listener.stop()
+        self.assertEqual(stream.getvalue(),
+                         ''.join('%d\n' % i for i in range(5)))
+        self.assertEqual(listener.handled, 5)
+        self.assertEqual(self.queue.unfinished_tasks, 0)
+
 if hasattr(logging.handlers, 'QueueListener'):
     import multiprocessing
     from unittest.mock import patch
@@ -4341,6 +4451,77 @@ class LogRecordTest(BaseTest):
             logging.logProcesses = log_processes
             logging.logMultiprocessing = log_multiprocessing
 
+    def test_lazy(self):
+        lazy = ('threadName', 'processName', 'process')
+        with support.swap_attr(logging, 'lazyRecords', True):
+            r = logging.makeLogRecord({})
+        for name in lazy:
+            self.assertNotIn(name, r.__dict__)
+        self.assertEqual(r.thread, threading.get_ident())
+        self.assertEqual(r.threadName, threading.current_thread().name)
+        self.assertEqual(r.processName, logging._processName())
+        self.assertEqual(r.process, os.getpid())
+        for name in lazy:
+            self.assertIn(name, r.__dict__)
+        self.assertRaises(AttributeError, getattr, r, 'spam')
+
+    def test_lazy_formatting(self):
+        for style, fmt in [('%', '%(threadName)s:%(message)s'),
+                           ('{', '{threadName}:{message}'),
+                           ('$', '${threadName}:$message')]:
+            with self.subTest(style=style):
+                with support.swap_attr(logging, 'lazyRecords', True):
+                    r = logging.makeLogRecord({'msg': 'spam'})
+                f = logging.Formatter(fmt, style=style)
+                self.assertEqual(f.format(r),
+                                 threading.current_thread().name + ':spam')
+                # Only the attributes used are computed
+                self.assertIn('threadName', r.__dict__)
+                self.assertNotIn('processName', r.__dict__)
+                self.assertNotIn('process', r.__dict__)
+
+    def test_lazy_copy(self):
+        with support.swap_attr(logging, 'lazyRecords', True):
+            r = logging.makeLogRecord({})
+        for r2 in (copy.copy(r), pickle.loads(pickle.dumps(r))):
+            self.assertEqual(r2.__dict__['threadName'],
+                             threading.current_thread().name)
+            self.assertEqual(r2.__dict__['process'], os.getpid())
+
+    def test_lazy_other_thread(self):
+        records = []
+        done = threading.Event()
+        def target():
+            with support.swap_attr(logging, 'lazyRecords', True):
+                records.append(logging.makeLogRecord({}))
+            done.wait()
+        t = threading.Thread(target=target, name='lazy-thread')
+        t.start()
+        try:
+            while not records:
+                time.sleep(0.01)
+            self.assertEqual(records[0].threadName, 'lazy-thread')
+        finally:
+            done.set()
+            t.join()
+
+    def test_lazy_extra(self):
+        logger = logging.getLogger('lazy')
+        with support.swap_attr(logging, 'lazyRecords', True):
+            self.assertRaises(KeyError, logger.makeRecord, 'lazy',
+                              logging.INFO, 'f', 1, 'msg', None, None,
+                              extra={'threadName': 'spam'})
+
+    def test_pathname(self):
+        r = logging.LogRecord('n', logging.INFO, '/spam/eggs.py', 1, 'msg',
+                              None, None)
+        self.assertEqual((r.filename, r.module), ('eggs.py', 'eggs'))
+        r = logging.LogRecord('n', logging.INFO, '/spam/eggs.py', 1, 'msg',
+                              None, None)
+        self.assertEqual((r.filename, r.module), ('eggs.py', 'eggs'))
+        r = logging.LogRecord('n', logging.INFO, None, 1, 'msg', None, None)
+        self.assertEqual((r.filename, r.module), (None, 'Unknown module'))
+
 class BasicConfigTest(unittest.TestCase):
 
     """Test suite for logging.basicConfig."""
@@ -5017,6 +5198,17 @@ class FileHandlerTest(BaseFileTest):
         self.assertTrue(os.path.exists(self.fn))
         fh.close()
 
+    def test_emit_batch(self):
+        os.unlink(self.fn)
+        fh = logging.FileHandler(self.fn, delay=True)
+        records = [logging.makeLogRecord({'msg': msg})
+                   for msg in ('one', 'two')]
+        fh.handle_batch(records)
+        self.assertIsNotNone(fh.stream)
+        fh.close()
+        with open(self.fn) as f:
+            self.assertEqual(f.read(), 'one\ntwo\n')
+
 class RotatingFileHandlerTest(BaseFileTest):
     def next_rec(self):
         return logging.LogRecord('n', logging.DEBUG, 'p', 1,
@@ -5316,7 +5508,7 @@ class NTEventLogHandlerTest(BaseTest):
 class MiscTestCase(unittest.TestCase):
     def test__all__(self):
         blacklist = {'logThreads', 'logMultiprocessing',
-                     'logProcesses', 'currentframe',
+                     'logProcesses', 'lazyRecords', 'currentframe',
                      'PercentStyle', 'StrFormatStyle', 'StringTemplateStyle',
                      'Filterer', 'PlaceHolder', 'Manager', 'RootLogger',
                      'root', 'threading'}
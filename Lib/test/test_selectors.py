@@ -524,6 +524,44 @@ class EpollSelectorTestCase(BaseSelectorTestCase, ScalableSelectorMixIn):
             with self.assertRaises(KeyError):
                 s.get_key(f)
 
+    def test_register_edge_triggered(self):
+        s = self.SELECTOR()
+        self.addCleanup(s.close)
+        rd, wr = self.make_socketpair()
+
+        def ready():
+            return {key.fileobj: events for key, events in s.select(0)}
+
+        s.register(rd, selectors.EVENT_READ, edge_triggered=True)
+        s.register(wr, selectors.EVENT_WRITE)
+        wr.send(b'x')
+        self.assertEqual(set(ready()), {rd, wr})
+        # The data hasn't been read, but rd didn't become ready again.
+        self.assertEqual(set(ready()), {wr})
+        wr.send(b'x')
+        self.assertEqual(set(ready()), {rd, wr})
+
+        # modify() keeps the edge-triggered mode.
+        s.modify(rd, selectors.EVENT_READ | selectors.EVENT_WRITE)
+        self.assertEqual(ready()[rd],
+                         selectors.EVENT_READ | selectors.EVENT_WRITE)
+        self.assertEqual(set(ready()), {wr})
+        # Even if the events are unchanged, modify() re-arms the file object.
+        s.modify(rd, selectors.EVENT_READ | selectors.EVENT_WRITE, 'data')
+        self.assertEqual(s.get_key(rd).data, 'data')
+        self.assertEqual(set(ready()), {rd, wr})
+        self.assertEqual(set(ready()), {wr})
+
+        with self.assertRaises(KeyError):
+            s.register(wr, selectors.EVENT_READ, edge_triggered=True)
+        self.assertNotIn(wr.fileno(), s._edge_triggered)
+
+        # unregister() forgets the mode.
+        s.unregister(rd)
+        s.register(rd, selectors.EVENT_READ)
+        self.assertEqual(set(ready()), {rd, wr})
+        self.assertEqual(set(ready()), {rd, wr})
+
 
 @unittest.skipUnless(hasattr(selectors, 'KqueueSelector'),
                      "Test needs selectors.KqueueSelector)")
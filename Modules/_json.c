@@ -35,8 +35,20 @@ typedef struct _PyScannerObject {
     PyObject *parse_int;
     PyObject *parse_constant;
     PyObject *memo;
+    Py_ssize_t key_cache_size;
 } PyScannerObject;
 
+/* The document being scanned: a str, or a bytes-like object holding UTF-8.
+   Since the syntax of JSON is ASCII, UTF-8 is read like a str of kind
+   PyUnicode_1BYTE_KIND and only the strings are decoded from UTF-8. */
+typedef struct {
+    PyObject *pystr;
+    const void *data;
+    int kind;
+    int utf8;
+    Py_ssize_t length;
+} ScanInput;
+
 static PyMemberDef scanner_members[] = {
     {"strict", T_BOOL, offsetof(PyScannerObject, strict), READONLY, "strict"},
     {"object_hook", T_OBJECT, offsetof(PyScannerObject, object_hook), READONLY, "object_hook"},
@@ -44,6 +56,7 @@ static PyMemberDef scanner_members[] = {
     {"parse_float", T_OBJECT, offsetof(PyScannerObject, parse_float), READONLY, "parse_float"},
     {"parse_int", T_OBJECT, offsetof(PyScannerObject, parse_int), READONLY, "parse_int"},
     {"parse_constant", T_OBJECT, offsetof(PyScannerObject, parse_constant), READONLY, "parse_constant"},
+    {"key_cache_size", T_PYSSIZET, offsetof(PyScannerObject, key_cache_size), READONLY, "key_cache_size"},
     {NULL}
 };
 
@@ -53,6 +66,7 @@ typedef struct _PyEncoderObject {
     PyObject *defaultfn;
     PyObject *encoder;
     PyObject *indent;
+    PyObject *indent_cache;
     PyObject *key_separator;
     PyObject *item_separator;
     char sort_keys;
@@ -81,7 +95,7 @@ static PyObject *
 py_encode_basestring_ascii(PyObject* Py_UNUSED(self), PyObject *pystr);
 void init_json(void);
 static PyObject *
-scan_once_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_t *next_idx_ptr);
+scan_once_unicode(PyScannerObject *s, ScanInput *in, Py_ssize_t idx, Py_ssize_t *next_idx_ptr);
 static PyObject *
 _build_rval_index_tuple(PyObject *rval, Py_ssize_t idx);
 static PyObject *
@@ -97,11 +111,11 @@ encoder_dealloc(PyObject *self);
 static int
 encoder_clear(PyEncoderObject *self);
 static int
-encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc, PyObject *seq, Py_ssize_t indent_level);
+encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc, PyObject *write, PyObject *seq, Py_ssize_t indent_level);
 static int
-encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc, PyObject *obj, Py_ssize_t indent_level);
+encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc, PyObject *write, PyObject *obj, Py_ssize_t indent_level);
 static int
-encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc, PyObject *dct, Py_ssize_t indent_level);
+encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc, PyObject *write, PyObject *dct, Py_ssize_t indent_level);
 static PyObject *
 _encoded_const(PyObject *obj);
 static void
@@ -335,6 +349,46 @@ raise_errmsg(const char *msg, PyObject *s, Py_ssize_t end)
     }
 }
 
+static void
+raise_errmsg_input(const char *msg, ScanInput *in, Py_ssize_t end)
+{
+    /* Raise JSONDecodeError for the index end of in.  For UTF-8, the
+       document and the index are those of the decoded str. */
+    PyObject *doc, *prefix;
+
+    if (!in->utf8) {
+        raise_errmsg(msg, in->pystr, end);
+        return;
+    }
+    if (end > in->length)
+        end = in->length;
+    doc = PyUnicode_DecodeUTF8((const char *)in->data, in->length, "replace");
+    if (doc == NULL)
+        return;
+    prefix = PyUnicode_DecodeUTF8((const char *)in->data, end, "replace");
+    if (prefix == NULL) {
+        Py_DECREF(doc);
+        return;
+    }
+    raise_errmsg(msg, doc, PyUnicode_GET_LENGTH(prefix));
+    Py_DECREF(prefix);
+    Py_DECREF(doc);
+}
+
+static int
+scan_input_init(ScanInput *in, PyObject *pystr)
+{
+    /* Fill in for the str pystr */
+    if (PyUnicode_READY(pystr) == -1)
+        return -1;
+    in->pystr = pystr;
+    in->data = PyUnicode_DATA(pystr);
+    in->kind = PyUnicode_KIND(pystr);
+    in->utf8 = 0;
+    in->length = PyUnicode_GET_LENGTH(pystr);
+    return 0;
+}
+
 static void
 raise_stop_iteration(Py_ssize_t idx)
 {
@@ -373,9 +427,22 @@ _build_rval_index_tuple(PyObject *rval, Py_ssize_t idx) {
 }
 
 static PyObject *
-scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next_end_ptr)
+decode_utf8_chunk(const void *buf, Py_ssize_t start, Py_ssize_t end,
+                  Py_UCS4 bits)
+{
+    /* Decode the UTF-8 bytes buf[start:end], bits is the bitwise or of
+    these bytes: ASCII chunks are copied without validation */
+    if (bits < 0x80) {
+        return _PyUnicode_FromASCII((const char *)buf + start, end - start);
+    }
+    return PyUnicode_DecodeUTF8((const char *)buf + start, end - start,
+                                "surrogatepass");
+}
+
+static PyObject *
+scanstring_unicode(ScanInput *in, Py_ssize_t end, int strict, Py_ssize_t *next_end_ptr)
 {
-    /* Read the JSON string from PyUnicode pystr.
+    /* Read the JSON string from in.
     end is the index of the first character after the quote.
     if strict is zero then literal control characters are allowed
     *next_end_ptr is a return-by-reference index of the character
@@ -389,17 +456,15 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
     Py_ssize_t next /* = begin */;
     const void *buf;
     int kind;
-
-    if (PyUnicode_READY(pystr) == -1)
-        return 0;
+    Py_UCS4 bits;
 
     _PyUnicodeWriter writer;
     _PyUnicodeWriter_Init(&writer);
     writer.overallocate = 1;
 
-    len = PyUnicode_GET_LENGTH(pystr);
-    buf = PyUnicode_DATA(pystr);
-    kind = PyUnicode_KIND(pystr);
+    len = in->length;
+    buf = in->data;
+    kind = in->kind;
 
     if (end < 0 || len < end) {
         PyErr_SetString(PyExc_ValueError, "end is out of bounds");
@@ -410,24 +475,30 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
         Py_UCS4 c;
         {
             // Use tight scope variable to help register allocation.
-            Py_UCS4 d = 0;
+            Py_UCS4 d = 0, b = 0;
             for (next = end; next < len; next++) {
                 d = PyUnicode_READ(kind, buf, next);
                 if (d == '"' || d == '\\') {
                     break;
                 }
                 if (d <= 0x1f && strict) {
-                    raise_errmsg("Invalid control character at", pystr, next);
+                    raise_errmsg_input("Invalid control character at", in, next);
                     goto bail;
                 }
+                b |= d;
             }
             c = d;
+            bits = b;
         }
 
         if (c == '"') {
             // Fast path for simple case.
             if (writer.buffer == NULL) {
-                PyObject *ret = PyUnicode_Substring(pystr, end, next);
+                PyObject *ret;
+                if (in->utf8)
+                    ret = decode_utf8_chunk(buf, end, next, bits);
+                else
+                    ret = PyUnicode_Substring(in->pystr, end, next);
                 if (ret == NULL) {
                     goto bail;
                 }
@@ -436,13 +507,25 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
             }
         }
         else if (c != '\\') {
-            raise_errmsg("Unterminated string starting at", pystr, begin);
+            raise_errmsg_input("Unterminated string starting at", in, begin);
             goto bail;
         }
 
         /* Pick up this chunk if it's not zero length */
         if (next != end) {
-            if (_PyUnicodeWriter_WriteSubstring(&writer, pystr, end, next) < 0) {
+            if (in->utf8) {
+                PyObject *chunk;
+                int rv;
+                chunk = decode_utf8_chunk(buf, end, next, bits);
+                if (chunk == NULL)
+                    goto bail;
+                rv = _PyUnicodeWriter_WriteStr(&writer, chunk);
+                Py_DECREF(chunk);
+                if (rv < 0)
+                    goto bail;
+            }
+            else if (_PyUnicodeWriter_WriteSubstring(&writer, in->pystr,
+                                                     end, next) < 0) {
                 goto bail;
             }
         }
@@ -452,7 +535,7 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
             break;
         }
         if (next == len) {
-            raise_errmsg("Unterminated string starting at", pystr, begin);
+            raise_errmsg_input("Unterminated string starting at", in, begin);
             goto bail;
         }
         c = PyUnicode_READ(kind, buf, next);
@@ -471,7 +554,7 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
                 default: c = 0;
             }
             if (c == 0) {
-                raise_errmsg("Invalid \\escape", pystr, end - 2);
+                raise_errmsg_input("Invalid \\escape", in, end - 2);
                 goto bail;
             }
         }
@@ -480,7 +563,7 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
             next++;
             end = next + 4;
             if (end >= len) {
-                raise_errmsg("Invalid \\uXXXX escape", pystr, next - 1);
+                raise_errmsg_input("Invalid \\uXXXX escape", in, next - 1);
                 goto bail;
             }
             /* Decode 4 hex digits */
@@ -498,7 +581,7 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
                     case 'F':
                         c |= (digit - 'A' + 10); break;
                     default:
-                        raise_errmsg("Invalid \\uXXXX escape", pystr, end - 5);
+                        raise_errmsg_input("Invalid \\uXXXX escape", in, end - 5);
                         goto bail;
                 }
             }
@@ -523,7 +606,7 @@ scanstring_unicode(PyObject *pystr, Py_ssize_t end, int strict, Py_ssize_t *next
                         case 'F':
                             c2 |= (digit - 'A' + 10); break;
                         default:
-                            raise_errmsg("Invalid \\uXXXX escape", pystr, end - 5);
+                            raise_errmsg_input("Invalid \\uXXXX escape", in, end - 5);
                             goto bail;
                     }
                 }
@@ -573,7 +656,10 @@ py_scanstring(PyObject* Py_UNUSED(self), PyObject *args)
         return NULL;
     }
     if (PyUnicode_Check(pystr)) {
-        rval = scanstring_unicode(pystr, end, strict, &next_end);
+        ScanInput in;
+        if (scan_input_init(&in, pystr) < 0)
+            return NULL;
+        rval = scanstring_unicode(&in, end, strict, &next_end);
     }
     else {
         PyErr_Format(PyExc_TypeError,
@@ -669,9 +755,9 @@ scanner_clear(PyScannerObject *self)
 }
 
 static PyObject *
-_parse_object_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_t *next_idx_ptr)
+_parse_object_unicode(PyScannerObject *s, ScanInput *in, Py_ssize_t idx, Py_ssize_t *next_idx_ptr)
 {
-    /* Read a JSON object from PyUnicode pystr.
+    /* Read a JSON object from in.
     idx is the index of the first character after the opening curly brace.
     *next_idx_ptr is a return-by-reference index to the first character after
         the closing curly brace.
@@ -687,12 +773,9 @@ _parse_object_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ss
     int has_pairs_hook = (s->object_pairs_hook != Py_None);
     Py_ssize_t next_idx;
 
-    if (PyUnicode_READY(pystr) == -1)
-        return NULL;
-
-    str = PyUnicode_DATA(pystr);
-    kind = PyUnicode_KIND(pystr);
-    end_idx = PyUnicode_GET_LENGTH(pystr) - 1;
+    str = in->data;
+    kind = in->kind;
+    end_idx = in->length - 1;
 
     if (has_pairs_hook)
         rval = PyList_New(0);
@@ -711,10 +794,10 @@ _parse_object_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ss
 
             /* read key */
             if (idx > end_idx || PyUnicode_READ(kind, str, idx) != '"') {
-                raise_errmsg("Expecting property name enclosed in double quotes", pystr, idx);
+                raise_errmsg_input("Expecting property name enclosed in double quotes", in, idx);
                 goto bail;
             }
-            key = scanstring_unicode(pystr, idx + 1, s->strict, &next_idx);
+            key = scanstring_unicode(in, idx + 1, s->strict, &next_idx);
             if (key == NULL)
                 goto bail;
             memokey = PyDict_SetDefault(s->memo, key, key);
@@ -729,14 +812,14 @@ _parse_object_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ss
             /* skip whitespace between key and : delimiter, read :, skip whitespace */
             while (idx <= end_idx && IS_WHITESPACE(PyUnicode_READ(kind, str, idx))) idx++;
             if (idx > end_idx || PyUnicode_READ(kind, str, idx) != ':') {
-                raise_errmsg("Expecting ':' delimiter", pystr, idx);
+                raise_errmsg_input("Expecting ':' delimiter", in, idx);
                 goto bail;
             }
             idx++;
             while (idx <= end_idx && IS_WHITESPACE(PyUnicode_READ(kind, str, idx))) idx++;
 
             /* read any JSON term */
-            val = scan_once_unicode(s, pystr, idx, &next_idx);
+            val = scan_once_unicode(s, in, idx, &next_idx);
             if (val == NULL)
                 goto bail;
 
@@ -767,7 +850,7 @@ _parse_object_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ss
             if (idx <= end_idx && PyUnicode_READ(kind, str, idx) == '}')
                 break;
             if (idx > end_idx || PyUnicode_READ(kind, str, idx) != ',') {
-                raise_errmsg("Expecting ',' delimiter", pystr, idx);
+                raise_errmsg_input("Expecting ',' delimiter", in, idx);
                 goto bail;
             }
             idx++;
@@ -800,8 +883,8 @@ bail:
 }
 
 static PyObject *
-_parse_array_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_t *next_idx_ptr) {
-    /* Read a JSON array from PyUnicode pystr.
+_parse_array_unicode(PyScannerObject *s, ScanInput *in, Py_ssize_t idx, Py_ssize_t *next_idx_ptr) {
+    /* Read a JSON array from in.
     idx is the index of the first character after the opening brace.
     *next_idx_ptr is a return-by-reference index to the first character after
         the closing brace.
@@ -815,16 +898,13 @@ _parse_array_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssi
     PyObject *rval;
     Py_ssize_t next_idx;
 
-    if (PyUnicode_READY(pystr) == -1)
-        return NULL;
-
     rval = PyList_New(0);
     if (rval == NULL)
         return NULL;
 
-    str = PyUnicode_DATA(pystr);
-    kind = PyUnicode_KIND(pystr);
-    end_idx = PyUnicode_GET_LENGTH(pystr) - 1;
+    str = in->data;
+    kind = in->kind;
+    end_idx = in->length - 1;
 
     /* skip whitespace after [ */
     while (idx <= end_idx && IS_WHITESPACE(PyUnicode_READ(kind, str, idx))) idx++;
@@ -834,7 +914,7 @@ _parse_array_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssi
         while (1) {
 
             /* read any JSON term  */
-            val = scan_once_unicode(s, pystr, idx, &next_idx);
+            val = scan_once_unicode(s, in, idx, &next_idx);
             if (val == NULL)
                 goto bail;
 
@@ -851,7 +931,7 @@ _parse_array_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssi
             if (idx <= end_idx && PyUnicode_READ(kind, str, idx) == ']')
                 break;
             if (idx > end_idx || PyUnicode_READ(kind, str, idx) != ',') {
-                raise_errmsg("Expecting ',' delimiter", pystr, idx);
+                raise_errmsg_input("Expecting ',' delimiter", in, idx);
                 goto bail;
             }
             idx++;
@@ -863,7 +943,7 @@ _parse_array_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssi
 
     /* verify that idx < end_idx, PyUnicode_READ(kind, str, idx) should be ']' */
     if (idx > end_idx || PyUnicode_READ(kind, str, idx) != ']') {
-        raise_errmsg("Expecting value", pystr, end_idx);
+        raise_errmsg_input("Expecting value", in, end_idx);
         goto bail;
     }
     *next_idx_ptr = idx + 1;
@@ -901,8 +981,8 @@ _parse_constant(PyScannerObject *s, const char *constant, Py_ssize_t idx, Py_ssi
 }
 
 static PyObject *
-_match_number_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t start, Py_ssize_t *next_idx_ptr) {
-    /* Read a JSON number from PyUnicode pystr.
+_match_number_unicode(PyScannerObject *s, ScanInput *in, Py_ssize_t start, Py_ssize_t *next_idx_ptr) {
+    /* Read a JSON number from in.
     idx is the index of the first character of the number
     *next_idx_ptr is a return-by-reference index to the first character after
         the number.
@@ -920,12 +1000,9 @@ _match_number_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t start, Py_
     PyObject *numstr = NULL;
     PyObject *custom_func;
 
-    if (PyUnicode_READY(pystr) == -1)
-        return NULL;
-
-    str = PyUnicode_DATA(pystr);
-    kind = PyUnicode_KIND(pystr);
-    end_idx = PyUnicode_GET_LENGTH(pystr) - 1;
+    str = in->data;
+    kind = in->kind;
+    end_idx = in->length - 1;
 
     /* read a sign if it's there, make sure it's not the end of the string */
     if (PyUnicode_READ(kind, str, idx) == '-') {
@@ -1018,9 +1095,9 @@ _match_number_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t start, Py_
 }
 
 static PyObject *
-scan_once_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_t *next_idx_ptr)
+scan_once_unicode(PyScannerObject *s, ScanInput *in, Py_ssize_t idx, Py_ssize_t *next_idx_ptr)
 {
-    /* Read one JSON term (of any kind) from PyUnicode pystr.
+    /* Read one JSON term (of any kind) from in.
     idx is the index of the first character of the term
     *next_idx_ptr is a return-by-reference index to the first character after
         the number.
@@ -1032,12 +1109,9 @@ scan_once_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_
     int kind;
     Py_ssize_t length;
 
-    if (PyUnicode_READY(pystr) == -1)
-        return NULL;
-
-    str = PyUnicode_DATA(pystr);
-    kind = PyUnicode_KIND(pystr);
-    length = PyUnicode_GET_LENGTH(pystr);
+    str = in->data;
+    kind = in->kind;
+    length = in->length;
 
     if (idx < 0) {
         PyErr_SetString(PyExc_ValueError, "idx cannot be negative");
@@ -1051,13 +1125,13 @@ scan_once_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_
     switch (PyUnicode_READ(kind, str, idx)) {
         case '"':
             /* string */
-            return scanstring_unicode(pystr, idx + 1, s->strict, next_idx_ptr);
+            return scanstring_unicode(in, idx + 1, s->strict, next_idx_ptr);
         case '{':
             /* object */
             if (Py_EnterRecursiveCall(" while decoding a JSON object "
                                       "from a unicode string"))
                 return NULL;
-            res = _parse_object_unicode(s, pystr, idx + 1, next_idx_ptr);
+            res = _parse_object_unicode(s, in, idx + 1, next_idx_ptr);
             Py_LeaveRecursiveCall();
             return res;
         case '[':
@@ -1065,7 +1139,7 @@ scan_once_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_
             if (Py_EnterRecursiveCall(" while decoding a JSON array "
                                       "from a unicode string"))
                 return NULL;
-            res = _parse_array_unicode(s, pystr, idx + 1, next_idx_ptr);
+            res = _parse_array_unicode(s, in, idx + 1, next_idx_ptr);
             Py_LeaveRecursiveCall();
             return res;
         case 'n':
@@ -1126,31 +1200,50 @@ scan_once_unicode(PyScannerObject *s, PyObject *pystr, Py_ssize_t idx, Py_ssize_
             break;
     }
     /* Didn't find a string, object, array, or named constant. Look for a number. */
-    return _match_number_unicode(s, pystr, idx, next_idx_ptr);
+    return _match_number_unicode(s, in, idx, next_idx_ptr);
 }
 
 static PyObject *
 scanner_call(PyScannerObject *self, PyObject *args, PyObject *kwds)
 {
-    /* Python callable interface to scan_once_{str,unicode} */
+    /* Python callable interface to scan_once_unicode */
     PyObject *pystr;
     PyObject *rval;
     Py_ssize_t idx;
     Py_ssize_t next_idx = -1;
+    ScanInput in;
     static char *kwlist[] = {"string", "idx", NULL};
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "On:scan_once", kwlist, &pystr, &idx))
         return NULL;
 
     if (PyUnicode_Check(pystr)) {
-        rval = scan_once_unicode(self, pystr, idx, &next_idx);
+        if (scan_input_init(&in, pystr) < 0)
+            return NULL;
+        rval = scan_once_unicode(self, &in, idx, &next_idx);
+    }
+    else if (PyObject_CheckBuffer(pystr)) {
+        /* UTF-8 is scanned in place */
+        Py_buffer view;
+        if (PyObject_GetBuffer(pystr, &view, PyBUF_SIMPLE) < 0)
+            return NULL;
+        in.pystr = pystr;
+        in.data = view.buf;
+        in.kind = PyUnicode_1BYTE_KIND;
+        in.utf8 = 1;
+        in.length = view.len;
+        rval = scan_once_unicode(self, &in, idx, &next_idx);
+        PyBuffer_Release(&view);
     }
     else {
         PyErr_Format(PyExc_TypeError,
-                 "first argument must be a string, not %.80s",
+                 "first argument must be a string or a bytes-like object, "
+                 "not %.80s",
                  Py_TYPE(pystr)->tp_name);
         return NULL;
     }
-    PyDict_Clear(self->memo);
+    /* Keep the keys for the next calls unless there are too many */
+    if (PyDict_GET_SIZE(self->memo) > self->key_cache_size)
+        PyDict_Clear(self->memo);
     if (rval == NULL)
         return NULL;
     return _build_rval_index_tuple(rval, next_idx);
@@ -1162,6 +1255,7 @@ scanner_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     PyScannerObject *s;
     PyObject *ctx;
     PyObject *strict;
+    PyObject *key_cache_size;
     static char *kwlist[] = {"context", NULL};
 
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "O:make_scanner", kwlist, &ctx))
@@ -1199,6 +1293,20 @@ scanner_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     s->parse_constant = PyObject_GetAttrString(ctx, "parse_constant");
     if (s->parse_constant == NULL)
         goto bail;
+    key_cache_size = PyObject_GetAttrString(ctx, "key_cache_size");
+    if (key_cache_size == NULL) {
+        /* Optional, the keys are not kept across calls */
+        if (!PyErr_ExceptionMatches(PyExc_AttributeError))
+            goto bail;
+        PyErr_Clear();
+    }
+    else {
+        s->key_cache_size = PyNumber_AsSsize_t(key_cache_size,
+                                               PyExc_OverflowError);
+        Py_DECREF(key_cache_size);
+        if (s->key_cache_size == -1 && PyErr_Occurred())
+            goto bail;
+    }
 
     return (PyObject *)s;
 
@@ -1250,6 +1358,12 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
                      "not %.200s", Py_TYPE(markers)->tp_name);
         return NULL;
     }
+    if (indent != Py_None && !PyUnicode_Check(indent)) {
+        PyErr_Format(PyExc_TypeError,
+                     "make_encoder() argument 4 must be str or None, "
+                     "not %.200s", Py_TYPE(indent)->tp_name);
+        return NULL;
+    }
 
     s = (PyEncoderObject *)type->tp_alloc(type, 0);
     if (s == NULL)
@@ -1259,6 +1373,7 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     s->defaultfn = defaultfn;
     s->encoder = encoder;
     s->indent = indent;
+    s->indent_cache = NULL;
     s->key_separator = key_separator;
     s->item_separator = item_separator;
     s->sort_keys = sort_keys;
@@ -1279,27 +1394,119 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     Py_INCREF(s->indent);
     Py_INCREF(s->key_separator);
     Py_INCREF(s->item_separator);
+    if (indent != Py_None) {
+        s->indent_cache = PyList_New(0);
+        if (s->indent_cache == NULL) {
+            Py_DECREF(s);
+            return NULL;
+        }
+    }
     return (PyObject *)s;
 }
 
+/* Number of accumulated strings above which they are joined and passed
+   to write() when encoding to a stream */
+#define WRITE_THRESHOLD 4096
+
+static int
+encoder_write(_PyAccu *acc, PyObject *write, Py_ssize_t threshold)
+{
+    /* Join the accumulated strings and pass them to write() if there are
+       more than threshold of them */
+    PyObject *chunk, *result;
+
+    if (PyList_GET_SIZE(acc->small) <= threshold)
+        return 0;
+    chunk = _PyAccu_Finish(acc);
+    if (chunk == NULL)
+        return -1;
+    if (_PyAccu_Init(acc)) {
+        Py_DECREF(chunk);
+        return -1;
+    }
+    result = PyObject_CallOneArg(write, chunk);
+    Py_DECREF(chunk);
+    if (result == NULL)
+        return -1;
+    Py_DECREF(result);
+    return 0;
+}
+
 static PyObject *
 encoder_call(PyEncoderObject *self, PyObject *args, PyObject *kwds)
 {
     /* Python callable interface to encode_listencode_obj */
-    static char *kwlist[] = {"obj", "_current_indent_level", NULL};
+    static char *kwlist[] = {"obj", "_current_indent_level", "write", NULL};
     PyObject *obj;
+    PyObject *write = Py_None;
     Py_ssize_t indent_level;
     _PyAccu acc;
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "On:_iterencode", kwlist,
-        &obj, &indent_level))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "On|O:_iterencode", kwlist,
+        &obj, &indent_level, &write))
         return NULL;
+    if (write == Py_None)
+        write = NULL;
     if (_PyAccu_Init(&acc))
         return NULL;
-    if (encoder_listencode_obj(self, &acc, obj, indent_level)) {
+    if (encoder_listencode_obj(self, &acc, write, obj, indent_level)) {
         _PyAccu_Destroy(&acc);
         return NULL;
     }
-    return _PyAccu_FinishAsList(&acc);
+    if (write == NULL)
+        return _PyAccu_FinishAsList(&acc);
+    if (encoder_write(&acc, write, 0)) {
+        _PyAccu_Destroy(&acc);
+        return NULL;
+    }
+    _PyAccu_Destroy(&acc);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+encoder_indent(PyEncoderObject *s, Py_ssize_t indent_level, int separator)
+{
+    /* Return a borrowed reference to '\n' + indent * indent_level, preceded
+       by the item separator if separator is true.  The strings are cached
+       in s->indent_cache by pairs, one pair per indentation level. */
+    static PyObject *newline = NULL;
+    PyObject *cache = s->indent_cache;
+
+    if (newline == NULL) {
+        newline = PyUnicode_InternFromString("\n");
+        if (newline == NULL)
+            return NULL;
+    }
+    if (indent_level < 0)
+        indent_level = 0;
+    while (PyList_GET_SIZE(cache) <= 2 * indent_level) {
+        Py_ssize_t size = PyList_GET_SIZE(cache);
+        PyObject *newline_indent, *item_separator;
+        int rv;
+
+        if (size == 0) {
+            newline_indent = newline;
+            Py_INCREF(newline_indent);
+        }
+        else {
+            newline_indent = PyUnicode_Concat(PyList_GET_ITEM(cache, size - 2),
+                                              s->indent);
+            if (newline_indent == NULL)
+                return NULL;
+        }
+        item_separator = PyUnicode_Concat(s->item_separator, newline_indent);
+        if (item_separator == NULL) {
+            Py_DECREF(newline_indent);
+            return NULL;
+        }
+        rv = PyList_Append(cache, newline_indent);
+        Py_DECREF(newline_indent);
+        if (rv == 0)
+            rv = PyList_Append(cache, item_separator);
+        Py_DECREF(item_separator);
+        if (rv)
+            return NULL;
+    }
+    return PyList_GET_ITEM(cache, 2 * indent_level + (separator != 0));
 }
 
 static PyObject *
@@ -1392,7 +1599,7 @@ _steal_accumulate(_PyAccu *acc, PyObject *stolen)
 }
 
 static int
-encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc, PyObject *write,
                        PyObject *obj, Py_ssize_t indent_level)
 {
     /* Encode Python object obj to a JSON term */
@@ -1427,14 +1634,14 @@ encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
     else if (PyList_Check(obj) || PyTuple_Check(obj)) {
         if (Py_EnterRecursiveCall(" while encoding a JSON object"))
             return -1;
-        rv = encoder_listencode_list(s, acc, obj, indent_level);
+        rv = encoder_listencode_list(s, acc, write, obj, indent_level);
         Py_LeaveRecursiveCall();
         return rv;
     }
     else if (PyDict_Check(obj)) {
         if (Py_EnterRecursiveCall(" while encoding a JSON object"))
             return -1;
-        rv = encoder_listencode_dict(s, acc, obj, indent_level);
+        rv = encoder_listencode_dict(s, acc, write, obj, indent_level);
         Py_LeaveRecursiveCall();
         return rv;
     }
@@ -1468,7 +1675,7 @@ encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
             Py_XDECREF(ident);
             return -1;
         }
-        rv = encoder_listencode_obj(s, acc, newobj, indent_level);
+        rv = encoder_listencode_obj(s, acc, write, newobj, indent_level);
         Py_LeaveRecursiveCall();
 
         Py_DECREF(newobj);
@@ -1488,7 +1695,7 @@ encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
 }
 
 static int
-encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc, PyObject *write,
                         PyObject *dct, Py_ssize_t indent_level)
 {
     /* Encode Python dict dct a JSON term */
@@ -1500,6 +1707,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
     PyObject *it = NULL;
     PyObject *items;
     PyObject *item = NULL;
+    PyObject *item_separator = s->item_separator;
     Py_ssize_t idx;
 
     if (open_dict == NULL || close_dict == NULL || empty_dict == NULL) {
@@ -1532,13 +1740,16 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         goto bail;
 
     if (s->indent != Py_None) {
-        /* TODO: DOES NOT RUN */
+        PyObject *newline_indent;
         indent_level += 1;
-        /*
-            newline_indent = '\n' + (' ' * (_indent * _current_indent_level))
-            separator = _item_separator + newline_indent
-            buf += newline_indent
-        */
+        newline_indent = encoder_indent(s, indent_level, 0);
+        if (newline_indent == NULL)
+            goto bail;
+        item_separator = encoder_indent(s, indent_level, 1);
+        if (item_separator == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
     }
 
     items = PyMapping_Items(dct);
@@ -1594,7 +1805,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         }
 
         if (idx) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (_PyAccu_Accumulate(acc, item_separator))
                 goto bail;
         }
 
@@ -1611,10 +1822,12 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
             goto bail;
 
         value = PyTuple_GET_ITEM(item, 1);
-        if (encoder_listencode_obj(s, acc, value, indent_level))
+        if (encoder_listencode_obj(s, acc, write, value, indent_level))
             goto bail;
         idx += 1;
-        Py_DECREF(item);
+        Py_CLEAR(item);
+        if (write != NULL && encoder_write(acc, write, WRITE_THRESHOLD))
+            goto bail;
     }
     if (PyErr_Occurred())
         goto bail;
@@ -1625,12 +1838,15 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
             goto bail;
         Py_CLEAR(ident);
     }
-    /* TODO DOES NOT RUN; dead code
     if (s->indent != Py_None) {
+        PyObject *newline_indent;
         indent_level -= 1;
-
-        yield '\n' + (' ' * (_indent * _current_indent_level))
-    }*/
+        newline_indent = encoder_indent(s, indent_level, 0);
+        if (newline_indent == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
+    }
     if (_PyAccu_Accumulate(acc, close_dict))
         goto bail;
     return 0;
@@ -1645,7 +1861,7 @@ bail:
 
 
 static int
-encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc, PyObject *write,
                         PyObject *seq, Py_ssize_t indent_level)
 {
     /* Encode Python list seq to a JSON term */
@@ -1654,6 +1870,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
     static PyObject *empty_array = NULL;
     PyObject *ident = NULL;
     PyObject *s_fast = NULL;
+    PyObject *item_separator = s->item_separator;
     Py_ssize_t i;
 
     if (open_array == NULL || close_array == NULL || empty_array == NULL) {
@@ -1691,21 +1908,26 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
     if (_PyAccu_Accumulate(acc, open_array))
         goto bail;
     if (s->indent != Py_None) {
-        /* TODO: DOES NOT RUN */
+        PyObject *newline_indent;
         indent_level += 1;
-        /*
-            newline_indent = '\n' + (' ' * (_indent * _current_indent_level))
-            separator = _item_separator + newline_indent
-            buf += newline_indent
-        */
+        newline_indent = encoder_indent(s, indent_level, 0);
+        if (newline_indent == NULL)
+            goto bail;
+        item_separator = encoder_indent(s, indent_level, 1);
+        if (item_separator == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
     }
     for (i = 0; i < PySequence_Fast_GET_SIZE(s_fast); i++) {
         PyObject *obj = PySequence_Fast_GET_ITEM(s_fast, i);
         if (i) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (_PyAccu_Accumulate(acc, item_separator))
                 goto bail;
         }
-        if (encoder_listencode_obj(s, acc, obj, indent_level))
+        if (encoder_listencode_obj(s, acc, write, obj, indent_level))
+            goto bail;
+        if (write != NULL && encoder_write(acc, write, WRITE_THRESHOLD))
             goto bail;
     }
     if (ident != NULL) {
@@ -1714,12 +1936,15 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
         Py_CLEAR(ident);
     }
 
-    /* TODO: DOES NOT RUN
     if (s->indent != Py_None) {
+        PyObject *newline_indent;
         indent_level -= 1;
-
-        yield '\n' + (' ' * (_indent * _current_indent_level))
-    }*/
+        newline_indent = encoder_indent(s, indent_level, 0);
+        if (newline_indent == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
+    }
     if (_PyAccu_Accumulate(acc, close_array))
         goto bail;
     Py_DECREF(s_fast);
@@ -1749,6 +1974,7 @@ encoder_traverse(PyEncoderObject *self, visitproc visit, void *arg)
     Py_VISIT(self->defaultfn);
     Py_VISIT(self->encoder);
     Py_VISIT(self->indent);
+    Py_VISIT(self->indent_cache);
     Py_VISIT(self->key_separator);
     Py_VISIT(self->item_separator);
     return 0;
@@ -1762,12 +1988,16 @@ encoder_clear(PyEncoderObject *self)
     Py_CLEAR(self->defaultfn);
     Py_CLEAR(self->encoder);
     Py_CLEAR(self->indent);
+    Py_CLEAR(self->indent_cache);
     Py_CLEAR(self->key_separator);
     Py_CLEAR(self->item_separator);
     return 0;
 }
 
-PyDoc_STRVAR(encoder_doc, "_iterencode(obj, _current_indent_level) -> iterable");
+PyDoc_STRVAR(encoder_doc,
+"_iterencode(obj, _current_indent_level, write=None) -> iterable\n\n"
+"If write is not None, pass the encoded chunks to write() while encoding\n"
+"and return None.");
 
 static PyType_Slot PyEncoderType_slots[] = {
     {Py_tp_doc, (void *)encoder_doc},